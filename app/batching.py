@@ -0,0 +1,112 @@
+import asyncio
+import inspect
+import time
+
+
+class MicroBatcher:
+    """
+    Server-side micro-batching for the single-record /predict path.
+
+    Concurrent callers enqueue their payload and await a future. A background
+    task flushes the queue to `score_fn` as one batch when either
+    `max_batch_size` records are waiting or the oldest record has waited
+    `max_wait_ms`. Each future is then resolved with its own result.
+
+    `score_fn(list_of_payloads) -> list_of_results` (plain or async) must
+    return results in the same order as its input.
+    """
+
+    def __init__(self, score_fn, max_batch_size=32, max_wait_ms=2.0,
+                 queue_depth=None, batch_size=None, wait_time=None):
+        self.score_fn = score_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+
+        # Optional prometheus metrics (Gauge / Histogram / Histogram)
+        self.queue_depth = queue_depth
+        self.batch_size = batch_size
+        self.wait_time = wait_time
+
+        self._queue = None
+        self._loop = None
+        self._task = None
+        self._flushes = set()  # keep references so running flushes aren't garbage collected
+
+    def _ensure_started(self):
+        # (Re)bind to the running loop - test clients may spin up a new loop per request
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+
+    async def submit(self, payload):
+        """
+        Enqueue one payload and wait for its result.
+        """
+        self._ensure_started()
+        future = self._loop.create_future()
+        await self._queue.put((payload, future, time.perf_counter()))
+        self._set_depth()
+        return await future
+
+    def _set_depth(self):
+        if self.queue_depth is not None:
+            self.queue_depth.set(self._queue.qsize())
+
+    async def _collect(self):
+        """
+        Blocks for the first item, then gathers more until the batch is full
+        or the first item's wait budget is spent.
+        """
+        batch = [await self._queue.get()]
+        deadline = batch[0][2] + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            # Take whatever is already queued without yielding
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            if len(batch) >= self.max_batch_size:
+                break
+
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            self._set_depth()
+            # Don't wait for the model: the next batch can form (and run) meanwhile
+            task = self._loop.create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch):
+        flushed_at = time.perf_counter()
+        if self.batch_size is not None:
+            self.batch_size.observe(len(batch))
+        if self.wait_time is not None:
+            for _, _, enqueued_at in batch:
+                self.wait_time.observe(flushed_at - enqueued_at)
+
+        payloads = [payload for payload, _, _ in batch]
+        try:
+            results = self.score_fn(payloads)
+            if inspect.isawaitable(results):
+                results = await results
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
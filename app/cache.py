@@ -0,0 +1,108 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+def row_key(values) -> bytes:
+    """
+    Stable 16-byte digest of an aligned feature row. The row holds only
+    float / str / None after alignment, whose repr is canonical
+    ("20", 20 and 20.0 all align to 20.0), so equal rows give equal keys
+    across requests and processes.
+    """
+    return hashlib.blake2b(repr(tuple(values)).encode(), digest_size=16).digest()
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU + TTL cache of prediction results.
+
+    Entries are keyed by (model name, model version, row key), so a result
+    can never be served for a model version other than the one that
+    computed it. invalidate(name) drops a model's entries when the
+    registry swaps in a new version, so their memory is freed right away
+    instead of waiting to age out.
+
+    `max_size` bounds the number of entries (0 disables the cache);
+    `ttl` is in seconds (0 = no expiry).
+    """
+
+    def __init__(self, max_size=10000, ttl=300.0,
+                 hits=None, misses=None, evictions=None, size=None):
+        self.max_size = max(0, int(max_size))
+        self.ttl = max(0.0, float(ttl))
+
+        # Optional prometheus metrics (Counter / Counter / Counter with a "reason" label / Gauge)
+        self.hits = hits
+        self.misses = misses
+        self.evictions = evictions
+        self.size = size
+
+        self._entries = OrderedDict()  # key -> (expires_at, result)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Cached result for `key` (a copy, callers may modify it), or None.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None and entry[0] <= now:
+                del self._entries[key]
+                self._evicted("ttl")
+                entry = None
+            if entry is None:
+                if self.misses is not None:
+                    self.misses.inc()
+                return None
+            self._entries.move_to_end(key)
+        if self.hits is not None:
+            self.hits.inc()
+        return dict(entry[1])
+
+    def put(self, key, result: dict):
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, dict(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evicted("size")
+            self._set_size()
+
+    def invalidate(self, name=None):
+        """
+        Drops every entry of model `name` (all entries when name is None).
+        """
+        with self._lock:
+            if name is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+            else:
+                stale = [k for k in self._entries if k[0] == name]
+                for k in stale:
+                    del self._entries[k]
+                dropped = len(stale)
+            if dropped and self.evictions is not None:
+                self.evictions.labels(reason="model_swap").inc(dropped)
+            self._set_size()
+
+    def _evicted(self, reason):
+        if self.evictions is not None:
+            self.evictions.labels(reason=reason).inc()
+        self._set_size()
+
+    def _set_size(self):
+        if self.size is not None:
+            self.size.set(len(self._entries))
@@ -0,0 +1,199 @@
+import math
+import threading
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from src.pipeline_transformers import MISSING_TOKEN, hash_bucket
+from src.preprocess import DATE_FORMAT
+
+
+@lru_cache(maxsize=4096)
+def _month_of(date_str: str) -> float:
+    """
+    Enrollment_Date -> Enrollment_Month, same parsing as clean_data: the
+    export's DATE_FORMAT, dayfirst inference for anything else.
+    Cached: the same few hundred dates come back over and over.
+    """
+    try:
+        return float(pd.to_datetime(date_str, format=DATE_FORMAT).month)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return float(pd.to_datetime(date_str, dayfirst=True).month)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _token(val) -> str:
+    return MISSING_TOKEN if val is None else str(val)
+
+
+def _to_float(val) -> float:
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class FeatureEncoder:
+    """
+    Precompiled payload -> float32 matrix encoder.
+
+    Built once at startup from the model's feature schema. Each payload is
+    written straight into a reusable per-thread float32 buffer (no DataFrame),
+    using the same casting rules as _align_payload_to_df: missing, "" or
+    non-numeric values become NaN, which XGBoost treats as missing.
+
+    With a fitted FeaturePipeline (src/pipeline_transformers.py) the encoder
+    also applies the training-time feature steps per record: category
+    lookup tables, the feature cross, the hashing trick and
+    Enrollment_Date -> Enrollment_Month.
+
+    The returned matrix is a view on the thread's buffer and is only valid
+    until the next encode call on the same thread, so encode and predict
+    must run back to back (see InferenceExecutor.predict_records).
+    """
+
+    def __init__(self, feature_names, numeric_cols, pipeline=None):
+        self.feature_names = [str(n) for n in feature_names]
+        self.n_features = len(self.feature_names)
+        self.pipeline = pipeline
+        self._compile(set(numeric_cols) | set(getattr(pipeline, "numeric_cols", ())))
+        self._local = threading.local()
+
+    def _compile(self, numeric_cols):
+        """
+        Turns the feature list into flat per-kind plans, resolved once.
+        """
+        p = self.pipeline
+        index = {name: j for j, name in enumerate(self.feature_names)}
+        vocabularies = p.vocabularies if p is not None else {}
+        cross_col = p.cross[2] if p is not None and p.cross else None
+        hashed = set(p.hashed_cols) if p is not None else set()
+        month_col = p.month_col if p is not None else None
+
+        numeric, categorical, cross, unknown = [], [], [], []
+        self._month = None
+        for j, name in enumerate(self.feature_names):
+            if name == cross_col:
+                cross.append((j, p.cross[0], p.cross[1], vocabularies[name]))
+            elif name in vocabularies:
+                categorical.append((j, name, vocabularies[name]))
+            elif name in hashed:
+                continue
+            elif name == month_col:
+                self._month = (j, p.date_col, name)
+            elif name in numeric_cols:
+                numeric.append((j, name))
+            else:
+                unknown.append(name)
+        if unknown:
+            raise ValueError(f"features without an encoding rule: {unknown}")
+
+        self._numeric = tuple(numeric)
+        self._categorical = tuple(categorical)
+        self._cross = tuple(cross)
+        self._hash = ()
+        if hashed:
+            # bucket i -> output column, so one lookup per record fills the block
+            unset = np.nan if getattr(p, "sparse_hashing", False) else 0.0
+            self._hash = tuple(
+                (col, p.n_features, np.array([index[f"hashed_{col}_{i}"] for i in range(p.n_features)]), unset)
+                for col in p.hash_columns
+            )
+
+    @classmethod
+    def from_model(cls, model, numeric_cols, pipeline=None):
+        """
+        Returns an encoder for XGBoost models whose features can all be
+        encoded, otherwise None (the caller keeps the pandas path).
+        """
+        if model is None or not hasattr(model, "get_booster"):
+            return None
+        names = getattr(model, "feature_names_in_", None)
+        if names is None:
+            try:
+                names = model.get_booster().feature_names
+            except Exception:
+                names = None
+        if names is None or len(names) == 0:
+            return None
+        try:
+            return cls(names, numeric_cols, pipeline=pipeline)
+        except ValueError:
+            return None
+
+    def _buffer(self, n_rows: int) -> np.ndarray:
+        buf = getattr(self._local, "buf", None)
+        if buf is None or buf.shape[0] < n_rows:
+            buf = np.empty((max(n_rows, 1), self.n_features), dtype=np.float32)
+            self._local.buf = buf
+        return buf[:n_rows]
+
+    def _encode_into(self, payload: dict, out: np.ndarray):
+        get = payload.get
+        for j, key in self._numeric:
+            val = get(key)
+            if val is None or val == "":
+                out[j] = math.nan
+                continue
+            try:
+                out[j] = float(val)
+            except (TypeError, ValueError):
+                out[j] = math.nan
+
+        for j, key, vocab in self._categorical:
+            out[j] = vocab.get(_token(get(key)), math.nan)
+
+        for j, key1, key2, vocab in self._cross:
+            a, b = get(key1), get(key2)
+            token = MISSING_TOKEN if a is None or b is None else f"{a}_{b}"
+            out[j] = vocab.get(token, math.nan)
+
+        if self._month is not None:
+            j, date_key, month_key = self._month
+            date = get(date_key)
+            if date is not None:
+                out[j] = _month_of(str(date))
+            else:
+                out[j] = _to_float(get(month_key))
+
+        for key, n_features, cols, unset in self._hash:
+            out[cols] = unset
+            bucket, sign = hash_bucket(_token(get(key)), n_features)
+            out[cols[bucket]] = sign
+
+    def encode(self, records: list) -> np.ndarray:
+        """
+        Encodes a list of payload dicts into an (n, n_features) float32 matrix.
+        """
+        X = self._buffer(len(records))
+        for i, payload in enumerate(records):
+            self._encode_into(payload, X[i])
+        return X
+
+
+def booster_predict(model, X: np.ndarray):
+    """
+    XGBoost native path: Booster.inplace_predict on a float32 matrix,
+    skipping DataFrame/DMatrix conversion. Mirrors XGBClassifier.predict
+    (prob > 0.5) and predict_proba for binary models.
+    Returns (predictions, probabilities) like predict_frame.
+    """
+    booster = model.get_booster()
+    iteration_range = (0, 0)
+    try:
+        iteration_range = (0, model.best_iteration + 1)
+    except AttributeError:
+        pass
+
+    out = booster.inplace_predict(X, iteration_range=iteration_range, validate_features=False)
+
+    classes = getattr(model, "classes_", None)
+    if classes is None:
+        return np.asarray(out), None
+    if out.ndim == 1:
+        return np.asarray(classes)[(out > 0.5).astype(int)], out
+    return np.asarray(classes)[out.argmax(axis=1)], out[:, -1]
@@ -0,0 +1,218 @@
+"""
+Model inference off the event loop.
+
+`InferenceExecutor` runs model calls in a bounded thread or process pool so
+a slow prediction never blocks /health, /metrics or other requests on the
+uvicorn event loop.
+
+Thread vs process pool and XGBoost's own threads
+------------------------------------------------
+XGBoost (and sklearn forests) release the GIL while predicting and use
+their own OpenMP / joblib threads (`n_jobs` / `nthread`). With W pool
+workers each model call may use `model_threads` threads, so the pod can
+run W * model_threads busy threads. Keep that product at or below the
+CPU limit of the container. By default `model_threads` is set to
+cpu_count // W so the pool never oversubscribes the cores.
+
+- "thread"  : shares the already-loaded model, no copies, cheap hand-off.
+              The right default for XGBoost / RandomForest.
+- "process" : each worker loads its own copy of the model (W x model
+              memory, reloaded when the registry swaps versions) and
+              frames are pickled to the worker.
+              Only useful for models that hold the GIL while predicting.
+- "inline"  : old behaviour, the model runs on the event loop.
+"""
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import joblib
+import numpy as np
+
+from app.encoder import FeatureEncoder, booster_predict
+from src.model_io import load_model
+
+
+class ExecutorSaturated(RuntimeError):
+    """Raised when the inference queue is full (admission control)."""
+
+
+def predict_frame(model, df):
+    """
+    One model call for the whole frame.
+    Returns (predictions, probabilities) - probabilities is None when the
+    model has no predict_proba (e.g. the reframed regressor).
+    """
+    if hasattr(model, "predict_proba"):
+        proba = np.asarray(model.predict_proba(df))
+        classes = getattr(model, "classes_", np.arange(proba.shape[1]))
+        preds = np.asarray(classes)[proba.argmax(axis=1)]
+        return preds, proba[:, -1]
+    return np.asarray(model.predict(df)), None
+
+
+def predict_records(model, encoder, records):
+    """
+    Fast path: encode payloads into the thread's float32 buffer and score
+    them with Booster.inplace_predict in one go (same thread, so the
+    buffer can't be overwritten in between).
+    """
+    return booster_predict(model, encoder.encode(records))
+
+
+def default_model_threads(workers: int) -> int:
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def limit_model_threads(model, n_threads: int):
+    """
+    Caps the model's own thread pool (XGBoost nthread / sklearn n_jobs).
+    """
+    if model is None or not n_threads:
+        return model
+    try:
+        if "n_jobs" in model.get_params():
+            model.set_params(n_jobs=n_threads)
+    except Exception:
+        pass
+    return model
+
+
+# ----------------------------
+# Process-pool worker state
+# ----------------------------
+_worker_n_threads = None
+_worker_numeric_cols = set()
+_worker_models = {}  # model path -> (version, model, encoder)
+
+
+def _worker_get(source):
+    """
+    Model + encoder for `source` = (model_path, version, pipeline_path),
+    loaded once per worker and replaced when the version (model file and
+    feature pipeline, see ModelRegistry.load) changes.
+    """
+    path, version, pipeline_path = source
+    cached = _worker_models.get(path)
+    if cached is None or cached[0] != version:
+        model = limit_model_threads(load_model(path), _worker_n_threads)
+        pipeline = None
+        if pipeline_path and os.path.exists(pipeline_path):
+            pipeline = joblib.load(pipeline_path)
+        cached = (version, model, FeatureEncoder.from_model(model, _worker_numeric_cols, pipeline))
+        _worker_models[path] = cached
+    return cached[1], cached[2]
+
+
+def _init_worker(n_threads: int, numeric_cols, preload=None):
+    global _worker_n_threads, _worker_numeric_cols
+    _worker_n_threads = n_threads
+    _worker_numeric_cols = set(numeric_cols)
+    if preload is not None:
+        try:
+            _worker_get(preload)
+        except Exception:
+            pass  # reported by the first request that needs it
+
+
+def _worker_predict_frame(source, df):
+    model, _ = _worker_get(source)
+    return predict_frame(model, df)
+
+
+def _worker_predict_records(source, records):
+    model, encoder = _worker_get(source)
+    if encoder is None:
+        raise RuntimeError("no feature encoder in inference worker")
+    return predict_records(model, encoder, records)
+
+
+class InferenceExecutor:
+    """
+    Bounded pool for model calls with admission control.
+
+    At most `workers` calls run at once and up to `max_queue` more may wait.
+    Anything beyond that raises ExecutorSaturated immediately instead of
+    piling up latency, so the caller can answer with a 503 or a fallback.
+    """
+
+    def __init__(self, kind="thread", workers=2, max_queue=64, model_threads=None,
+                 numeric_cols=(), preload=None, in_flight=None):
+        if kind not in ("thread", "process", "inline"):
+            raise ValueError(f"unknown executor kind: {kind}")
+
+        self.kind = kind
+        self.workers = max(1, int(workers))
+        self.max_queue = max(0, int(max_queue))
+        self.model_threads = model_threads or default_model_threads(self.workers)
+        self.numeric_cols = set(numeric_cols)
+        self.preload = preload  # model source each process worker loads at start
+        self.in_flight = in_flight  # optional prometheus Gauge
+        self._pending = 0
+        self._pool = None
+
+    def _get_pool(self):
+        # Created on first use: after a gunicorn fork, and after `preload` is known
+        if self._pool is None:
+            if self.kind == "thread":
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+            else:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    initializer=_init_worker,
+                    initargs=(self.model_threads, self.numeric_cols, self.preload),
+                )
+        return self._pool
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _admit(self):
+        # Only touched from the event loop thread, no lock needed
+        if self._pending >= self.capacity:
+            raise ExecutorSaturated(f"inference queue is full ({self._pending} pending)")
+        self._pending += 1
+        if self.in_flight is not None:
+            self.in_flight.set(self._pending)
+
+    def _release(self):
+        self._pending -= 1
+        if self.in_flight is not None:
+            self.in_flight.set(self._pending)
+
+    async def _run(self, local_fn, local_args, worker_fn, source, data):
+        self._admit()
+        try:
+            if self.kind == "inline":
+                return local_fn(*local_args)
+            loop = asyncio.get_running_loop()
+            if self.kind == "process":
+                # Workers load (and cache) the model themselves; only the data travels
+                return await loop.run_in_executor(self._get_pool(), worker_fn, source, data)
+            return await loop.run_in_executor(self._get_pool(), local_fn, *local_args)
+        finally:
+            self._release()
+
+    async def predict(self, model, df, source=None):
+        """
+        Runs predict_frame(model, df) in the pool (pandas path).
+        `source` (see ModelVersion.source) is required in process mode.
+        """
+        return await self._run(predict_frame, (model, df), _worker_predict_frame, source, df)
+
+    async def predict_records(self, model, encoder, records, source=None):
+        """
+        Runs the encoder + inplace_predict fast path in the pool.
+        """
+        return await self._run(
+            predict_records, (model, encoder, records), _worker_predict_records, source, records
+        )
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
@@ -1,37 +1,128 @@
 import os
 import time
-import joblib
 import pandas as pd
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
-from fastapi.responses import Response
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from fastapi.responses import JSONResponse, Response
 
 # Fallback (mevcut dosyan)
 from src.fallback import HeuristicModel
+from src.preprocess import clean_data
+from src.data_profile import PREDICTION, PROFILE_PATH
+from src.monitoring import DriftMonitor, PredictionLogger
+from app.batching import MicroBatcher
+from app.cache import PredictionCache, row_key
+from app.inference import InferenceExecutor, ExecutorSaturated, predict_frame, predict_records
+from app.registry import ModelRegistry, UnknownModelError
+from app.schema import RecordSchema, loads, dumps
+from app.timing import NULL_TIMER, stage_timer
 
-app = FastAPI(title="Course Completion Prediction API")
+
+@asynccontextmanager
+async def lifespan(app):
+    # Per worker process (threads don't survive a gunicorn fork)
+    registry.start_watching(MODEL_WATCH_INTERVAL)
+    prediction_logger.start()
+    drift_monitor.start(DRIFT_CHECK_INTERVAL)
+    yield
+    prediction_logger.stop()
+
+
+app = FastAPI(title="Course Completion Prediction API", lifespan=lifespan)
 
 # ----------------------------
 # Monitoring (Prometheus)
 # ----------------------------
-REQ_COUNT = Counter("request_count_total", "Total API requests")
-REQ_LATENCY = Histogram("request_latency_seconds", "Request latency in seconds")
+# Sub-millisecond resolution at the low end: the fast path answers in well under 1 ms
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.00075, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+REQ_COUNT = Counter("request_count_total", "Total API requests", ["route", "status"])
+REQ_LATENCY = Histogram(
+    "request_latency_seconds", "Request latency in seconds", ["route"], buckets=LATENCY_BUCKETS
+)
+STAGE_LATENCY = Histogram(
+    "request_stage_seconds", "Time spent per request stage (sampled, see METRICS_STAGE_SAMPLE_RATE)",
+    ["route", "stage"],
+    buckets=(0.00001, 0.000025,) + LATENCY_BUCKETS,
+)
 PRED_MODE = Counter("prediction_mode_total", "Predictions by mode", ["mode"])
+INFERENCE_IN_FLIGHT = Gauge("inference_in_flight", "Model calls running or queued in the inference pool")
+INFERENCE_REJECTED = Counter("inference_rejected_total", "Model calls refused because the inference pool was full")
+MICROBATCH_QUEUE_DEPTH = Gauge("microbatch_queue_depth", "Records waiting for the next micro-batch")
+MICROBATCH_SIZE = Histogram(
+    "microbatch_size", "Records per micro-batch flush",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+MICROBATCH_WAIT = Histogram(
+    "microbatch_wait_seconds", "Time a record waited in the micro-batch queue",
+    buckets=(0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+PREDICTION_CACHE_HITS = Counter("prediction_cache_hits_total", "Predictions served from the result cache")
+PREDICTION_CACHE_MISSES = Counter("prediction_cache_misses_total", "Result cache lookups that missed")
+PREDICTION_CACHE_EVICTIONS = Counter(
+    "prediction_cache_evictions_total", "Entries dropped from the result cache", ["reason"]
+)
+PREDICTION_CACHE_SIZE = Gauge("prediction_cache_size", "Entries in the result cache")
+PREDICTION_LOG_DROPPED = Counter(
+    "prediction_log_dropped_total", "Prediction log records overwritten because the buffer was full"
+)
+PREDICTION_LOG_WRITTEN = Counter("prediction_log_written_total", "Prediction log records written to disk")
+DRIFT_GAUGES = {
+    "current_mean": Gauge("drift_current_mean", "Mean of the logged values", ["feature"]),
+    "mean_shift": Gauge("drift_mean_shift", "Shift of the logged mean vs the training baseline (baseline stds)", ["feature"]),
+    "psi": Gauge("drift_psi", "Population stability index of the logged values vs the training baseline", ["feature"]),
+    "ks": Gauge("drift_ks", "KS statistic (at the baseline deciles) of the logged values", ["feature"]),
+    "drift_detected": Gauge("drift_detected", "1 if the feature drifted (mean shift or PSI above threshold)", ["feature"]),
+    "samples": Gauge("drift_samples", "Logged values in the drift window", ["feature"]),
+}
 
 # ----------------------------
 # Model loading (safe)
 # ----------------------------
-MODEL_PATH = os.getenv("MODEL_PATH", "models/model.pkl")
+MODEL_PATH = os.getenv("MODEL_PATH", "models/model.pkl")  # .pkl (joblib) or .ubj (native XGBoost)
+# joblib mmap_mode for .pkl models ("r" maps stored numpy arrays instead of copying them)
+MODEL_MMAP_MODE = os.getenv("MODEL_MMAP_MODE") or None
+# Seconds between checks of the models directory for new/changed models (0 = off)
+MODEL_WATCH_INTERVAL = float(os.getenv("MODEL_WATCH_INTERVAL", "30"))
+# Models loaded with the default one (comma separated); the others on their first ?model= request
+MODEL_PRELOAD = [name for name in os.getenv("MODEL_PRELOAD", "").split(",") if name]
+# If set, POST /admin/models/reload requires the X-Admin-Token header
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+# Fitted feature steps (cross, hashing, category codes) saved next to the model by train_model.py
+FEATURE_PIPELINE_PATH = os.getenv(
+    "FEATURE_PIPELINE_PATH", os.path.join(os.path.dirname(MODEL_PATH), "feature_pipeline.pkl")
+)
 
-model = None
-model_loaded = False
+# Training data profile written by train_model.py (drift baseline; DATA_PROFILE_FILE)
+DATA_PROFILE_PATH = PROFILE_PATH
+# Seconds between drift updates from the prediction log (0 = only on GET /monitoring)
+DRIFT_CHECK_INTERVAL = float(os.getenv("DRIFT_CHECK_INTERVAL", "60"))
 
-try:
-    model = joblib.load(MODEL_PATH)
-    model_loaded = True
-except Exception:
-    model = None
-    model_loaded = False
+# Upper bound for /predict/batch (keeps a single request from pinning the worker)
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "1000"))
+
+# Optional micro-batching of concurrent /predict calls (off by default)
+MICROBATCH_ENABLED = os.getenv("MICROBATCH_ENABLED", "0") == "1"
+MICROBATCH_MAX_SIZE = int(os.getenv("MICROBATCH_MAX_SIZE", "32"))
+MICROBATCH_MAX_WAIT_MS = float(os.getenv("MICROBATCH_MAX_WAIT_MS", "2"))
+
+# Fraction of /predict requests whose per-stage timings are recorded (1 = all, 0 = off)
+METRICS_STAGE_SAMPLE_RATE = float(os.getenv("METRICS_STAGE_SAMPLE_RATE", "1"))
+
+# Optional result cache in front of the model (off by default)
+PREDICTION_CACHE_SIZE_MAX = int(os.getenv("PREDICTION_CACHE_SIZE", "0"))  # max entries, 0 = off
+PREDICTION_CACHE_TTL_SECONDS = float(os.getenv("PREDICTION_CACHE_TTL_SECONDS", "300"))
+
+# Inference pool (see app/inference.py for how this interacts with XGBoost nthread)
+INFERENCE_EXECUTOR = os.getenv("INFERENCE_EXECUTOR", "thread")  # thread | process | inline
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "2"))
+INFERENCE_MAX_QUEUE = int(os.getenv("INFERENCE_MAX_QUEUE", "64"))
+INFERENCE_MODEL_THREADS = int(os.getenv("INFERENCE_MODEL_THREADS", "0"))  # 0 = cpu_count // workers
+INFERENCE_SATURATION = os.getenv("INFERENCE_SATURATION", "fallback")  # fallback | reject
 
 fallback_model = HeuristicModel()
 
@@ -108,66 +199,387 @@ NUMERIC_COLS = {
     "Satisfaction_Rating",
 }
 
+# Typed record schema: guard + casting in one pass (replaces per-field checks)
+record_schema = RecordSchema(EXPECTED_COLS, NUMERIC_COLS, max_fields=200, max_str_len=5000)
 
-def _align_payload_to_df(payload: dict) -> pd.DataFrame:
+
+# ----------------------------
+# Inference pool + model registry
+# ----------------------------
+inference = InferenceExecutor(
+    kind=INFERENCE_EXECUTOR,
+    workers=INFERENCE_WORKERS,
+    max_queue=INFERENCE_MAX_QUEUE,
+    model_threads=INFERENCE_MODEL_THREADS,
+    numeric_cols=NUMERIC_COLS,
+    preload=(MODEL_PATH, None, FEATURE_PIPELINE_PATH),
+    in_flight=INFERENCE_IN_FLIGHT,
+)
+
+prediction_cache = PredictionCache(
+    max_size=PREDICTION_CACHE_SIZE_MAX,
+    ttl=PREDICTION_CACHE_TTL_SECONDS,
+    hits=PREDICTION_CACHE_HITS,
+    misses=PREDICTION_CACHE_MISSES,
+    evictions=PREDICTION_CACHE_EVICTIONS,
+    size=PREDICTION_CACHE_SIZE,
+)
+
+# Drift log: buffered in memory, written by a background thread (PREDICTION_LOG_* in src/monitoring.py)
+prediction_logger = PredictionLogger(dropped=PREDICTION_LOG_DROPPED, written=PREDICTION_LOG_WRITTEN)
+
+# Drift statistics over that log, updated incrementally (exported as drift_* gauges)
+drift_monitor = DriftMonitor(baseline=DATA_PROFILE_PATH, gauges=DRIFT_GAUGES)
+
+# Canned records scored by every new model version before it goes live
+WARMUP_RECORDS = [
+    {"Student_ID": "WARMUP_1", "Category": "Programming", "Course_Level": "Beginner",
+     "Enrollment_Date": "01-01-2024", "Age": 25, "Progress_Percentage": 50, "Quiz_Score_Avg": 70},
+    {"Student_ID": "WARMUP_2"},
+]
+
+
+def _warmup(mv):
+    """
+    Scores WARMUP_RECORDS on the path requests will take; raises if the model can't serve.
+    """
+    if mv.encoder is not None:
+        predict_records(mv.model, mv.encoder, WARMUP_RECORDS)
+    else:
+        predict_frame(mv.model, _model_frame(_align_records_to_df(WARMUP_RECORDS), mv))
+
+
+registry = ModelRegistry(
+    default_path=MODEL_PATH,
+    pipeline_path=FEATURE_PIPELINE_PATH,
+    numeric_cols=NUMERIC_COLS,
+    model_threads=inference.model_threads,
+    mmap_mode=MODEL_MMAP_MODE,
+    warmup=_warmup,
+    # Results of the replaced version can't be served any more: free them now
+    on_swap=lambda name, old, new: prediction_cache.invalidate(name),
+    preload=MODEL_PRELOAD,
+)
+
+# Default model is loaded at import (safe: falls back to the heuristic if missing)
+try:
+    registry.load()
+    inference.preload = registry.get().source
+except Exception as e:
+    print(f"⚠️ Default model not loaded ({MODEL_PATH}): {e}")
+for _name in MODEL_PRELOAD:
+    try:
+        registry.load(_name)
+    except Exception as e:
+        print(f"⚠️ Model '{_name}' not preloaded: {e}")
+
+
+def _align_row(payload: dict) -> list:
     """
     Prevent KeyError by:
-    - Keeping only EXPECTED_COLS
+    - Keeping only EXPECTED_COLS (in order)
     - Filling missing cols with None
     - Casting numeric cols when possible (else None)
     """
-    row = {}
+    row = []
     for col in EXPECTED_COLS:
         val = payload.get(col, None)
 
         if col in NUMERIC_COLS:
             if val is None or val == "":
-                row[col] = None
+                row.append(None)
             else:
                 try:
-                    row[col] = float(val)
+                    row.append(float(val))
                 except Exception:
-                    row[col] = None
+                    row.append(None)
         else:
             # categorical/text/date-like: keep string if provided
             if val is None:
-                row[col] = None
+                row.append(None)
             else:
-                row[col] = str(val)
+                row.append(str(val))
+
+    return row
+
+
+def _align_payload_to_df(payload: dict) -> pd.DataFrame:
+    return pd.DataFrame([_align_row(payload)], columns=EXPECTED_COLS)
+
+
+def _cache_key(payload: dict, mv):
+    """
+    Result cache key: model version + hash of the aligned row, so payloads
+    that differ only in extra fields or number formatting share an entry.
+    """
+    return (mv.name, mv.version, row_key(_align_row(payload)))
+
+
+def _align_records_to_df(records: list) -> pd.DataFrame:
+    """
+    Column-wise version of _align_payload_to_df for a list of payloads.
+    Same rules (EXPECTED_COLS only, missing -> None, numeric casting),
+    applied once per column instead of once per field.
+    """
+    df = pd.DataFrame.from_records(records, columns=EXPECTED_COLS)
+    for col in EXPECTED_COLS:
+        if col in NUMERIC_COLS:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+        else:
+            values = df[col].astype(object)
+            missing = values.isna()
+            df[col] = values.where(missing, values.astype(str)).where(~missing, None)
+    return df
+
+
+def _model_frame(df: pd.DataFrame, mv) -> pd.DataFrame:
+    """
+    Pandas path: applies the model version's fitted feature pipeline (when
+    there is one) to the aligned raw frame and orders the columns the way
+    the model expects.
+    """
+    if mv.pipeline is None:
+        return df
+    # df is built per request: cleaned in place, request-sized frames aren't worth downcasting
+    features = mv.pipeline.transform(clean_data(df, inplace=True, downcast=False))
+    names = getattr(mv.model, "feature_names_in_", None)
+    return features if names is None else features[list(names)]
+
+
+def _json_response(content, status_code: int = 200) -> Response:
+    # Serialized directly: results are plain dicts, no jsonable_encoder pass needed
+    return Response(content=dumps(content), status_code=status_code, media_type="application/json")
+
+
+def _fallback_result(payload, reason: str, mode: str, error: str = None) -> dict:
+    """
+    Heuristic answer for a single record, shaped like a /predict response.
+    """
+    meta = {"mode": "fallback", "reason": reason}
+    if error is not None:
+        meta["error"] = error
+    try:
+        fb = fallback_model.predict(payload if isinstance(payload, dict) else {})
+        PRED_MODE.labels(mode=mode).inc()
+        return {
+            "prediction": int(fb.get("prediction", 0)),
+            "probability": float(fb.get("probability", 0.0)),
+            "meta": meta,
+        }
+    except Exception:
+        PRED_MODE.labels(mode="fallback_failed").inc()
+        return {"prediction": 0, "meta": {**meta, "reason": "fallback_failed"}}
+
+
+def _fallback_results(records: list, reason: str, mode: str, error: str = None) -> list:
+    """
+    _fallback_result for many (schema-coerced) records with one vectorized
+    heuristic call; per record if the batch call fails.
+    """
+    meta = {"mode": "fallback", "reason": reason}
+    if error is not None:
+        meta["error"] = error
+    try:
+        preds, probas = fallback_model.predict_records(records)
+    except Exception:
+        return [_fallback_result(payload, reason, mode, error) for payload in records]
+    PRED_MODE.labels(mode=mode).inc(len(records))
+    return [{"prediction": p, "probability": q, "meta": dict(meta)}
+            for p, q in zip(preds.tolist(), probas.tolist())]
+
 
-    return pd.DataFrame([row], columns=EXPECTED_COLS)
+def _saturated_response():
+    INFERENCE_REJECTED.inc()
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "inference queue is full, retry later."},
+        headers={"Retry-After": "1"},
+    )
 
 
-def _basic_guard(payload: dict):
+def _model_meta(mv) -> dict:
+    return {"mode": "model", "model": mv.name, "version": mv.version}
+
+
+async def _predict_records(records: list, mv, timer=NULL_TIMER):
+    """
+    Scores payloads with one model call: numpy encoder + inplace_predict when
+    the model supports it, aligned DataFrame otherwise. On the encoder path
+    encoding runs inside the pool together with the model call, so its
+    (microsecond) cost is part of the "inference" stage.
+    """
+    if mv.encoder is not None:
+        out = await inference.predict_records(mv.model, mv.encoder, records, source=mv.source)
+        timer.mark("inference")
+        return out
+    df = _align_records_to_df(records)
+    timer.mark("align")
+    df = _model_frame(df, mv)
+    timer.mark("transform")
+    out = await inference.predict(mv.model, df, source=mv.source)
+    timer.mark("inference")
+    return out
+
+
+async def _score_records(records: list, mv, lookup: bool = True, timer=NULL_TIMER) -> list:
+    """
+    Scores a list of payloads with a single call to model version `mv`.
+    Returns one /predict-shaped result per record, in order; records that
+    fail the guard (or a failing model call) get a per-record fallback.
+    With the result cache on, cached records skip the model (lookup=False
+    when the caller already looked them up) and model answers are stored.
+    """
+    results = [None] * len(records)
+
+    # Per-record schema check: bad records get a fallback answer, the rest go to the model
+    valid_idx = []
+    records = list(records)
+    for i, payload in enumerate(records):
+        try:
+            records[i] = record_schema.coerce(payload)
+            valid_idx.append(i)
+        except ValueError as e:
+            results[i] = _fallback_result(payload, "invalid_record", "fallback_error", str(e))
+    timer.mark("guard")
+
+    if not valid_idx:
+        return results
+
+    if mv is None:
+        fallback = _fallback_results([records[i] for i in valid_idx], "model_not_loaded", "fallback_no_model")
+        for i, res in zip(valid_idx, fallback):
+            results[i] = res
+        timer.mark("fallback")
+        return results
+
+    keys = {}
+    if prediction_cache.enabled:
+        for i in list(valid_idx):
+            keys[i] = _cache_key(records[i], mv)
+            hit = prediction_cache.get(keys[i]) if lookup else None
+            if hit is not None:
+                results[i] = hit
+        valid_idx = [i for i in valid_idx if results[i] is None]
+        PRED_MODE.labels(mode="cache").inc(len(keys) - len(valid_idx))
+        timer.mark("cache")
+        if not valid_idx:
+            return results
+
+    try:
+        preds, probas = await _predict_records([records[i] for i in valid_idx], mv, timer)
+        PRED_MODE.labels(mode="model").inc(len(valid_idx))
+        for j, i in enumerate(valid_idx):
+            res = {"prediction": int(preds[j]), "meta": _model_meta(mv)}
+            if probas is not None:
+                res["probability"] = float(probas[j])
+            results[i] = res
+            if i in keys:
+                prediction_cache.put(keys[i], res)
+    except ExecutorSaturated:
+        if INFERENCE_SATURATION == "reject":
+            raise
+        INFERENCE_REJECTED.inc()
+        timer.mark("inference")
+        fallback = _fallback_results([records[i] for i in valid_idx], "saturated", "fallback_saturated")
+        for i, res in zip(valid_idx, fallback):
+            results[i] = res
+        timer.mark("fallback")
+    except Exception as e:
+        timer.mark("inference")
+        fallback = _fallback_results([records[i] for i in valid_idx], "exception", "fallback_error", str(e))
+        for i, res in zip(valid_idx, fallback):
+            results[i] = res
+        timer.mark("fallback")
+
+    return results
+
+
+# One micro-batcher per model name (a batch is scored by a single model)
+micro_batchers = {}
+
+
+def _micro_batcher(name: str):
+    if not MICROBATCH_ENABLED:
+        return None
+    batcher = micro_batchers.get(name)
+    if batcher is None:
+        batcher = MicroBatcher(
+            # resolved at flush time, so a hot reload applies to the next batch
+            # /predict already looked the cache up before queueing
+            lambda records: _score_records(records, registry.get(name), lookup=False),
+            max_batch_size=MICROBATCH_MAX_SIZE,
+            max_wait_ms=MICROBATCH_MAX_WAIT_MS,
+            queue_depth=MICROBATCH_QUEUE_DEPTH,
+            batch_size=MICROBATCH_SIZE,
+            wait_time=MICROBATCH_WAIT,
+        )
+        micro_batchers[name] = batcher
+    return batcher
+
+
+async def _resolve_model(request: Request):
+    """
+    (name, ModelVersion or None) for this request: ?model=<name>, else the
+    default model. Models in the directory that aren't loaded yet are
+    loaded on first use.
     """
-    Minimal safety checks to avoid huge payload / weird types.
-    (Keeps demo stable without being overly strict.)
+    name = request.query_params.get("model") or ModelRegistry.DEFAULT
+    mv = registry.get(name)
+    if mv is None and name != ModelRegistry.DEFAULT:
+        if name not in registry.discover():
+            raise UnknownModelError(name)
+        mv = await asyncio.to_thread(registry.load, name)
+    return name, mv
+
+
+def _unknown_model_response(name):
+    return JSONResponse(status_code=404, content={"detail": f"unknown model '{name}'."})
+
+
+def _parse_records(body: bytes, content_type: str) -> list:
     """
-    if not isinstance(payload, dict):
-        raise ValueError("payload must be a JSON object (dict).")
+    Accepts either a JSON array of records or an NDJSON body
+    (Content-Type: application/x-ndjson, one record per line).
+    """
+    if "ndjson" in content_type:
+        return [loads(line) for line in body.splitlines() if line.strip()]
+
+    records = loads(body)
+    if not isinstance(records, list):
+        raise ValueError("batch payload must be a JSON array of records.")
+    return records
 
-    # Too many keys => suspicious / can slow demo
-    if len(payload.keys()) > 200:
-        raise ValueError("payload has too many fields.")
 
-    # prevent extremely large strings
-    for k, v in payload.items():
-        if isinstance(v, str) and len(v) > 5000:
-            raise ValueError(f"field '{k}' is too large.")
+def _route_label(request: Request) -> str:
+    # Route template, not the raw path: keeps label cardinality bounded
+    route = request.scope.get("route")
+    return getattr(route, "path", "unmatched")
+
 
 @app.middleware("http")
 async def count_all_requests(request: Request, call_next):
-    REQ_COUNT.inc()
-    response = await call_next(request)
-    return response
+    # The only place requests are counted/timed (endpoints must not count again)
+    start = time.perf_counter_ns()
+    status = "500"
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+        return response
+    finally:
+        route = _route_label(request)
+        REQ_COUNT.labels(route=route, status=status).inc()
+        REQ_LATENCY.labels(route=route).observe((time.perf_counter_ns() - start) / 1e9)
 
 
 @app.get("/health")
 def health():
+    mv = registry.get()
     return {
         "status": "ok",
-        "model_loaded": model_loaded,
+        "model_loaded": mv is not None,
         "model_path": MODEL_PATH,
+        "model_version": mv.version if mv is not None else None,
+        "feature_pipeline_loaded": mv is not None and mv.pipeline is not None,
     }
 
 
@@ -177,52 +589,142 @@ def metrics():
     return Response(content=data, media_type=CONTENT_TYPE_LATEST)
 
 
+@app.get("/monitoring")
+def monitoring():
+    """
+    Drift of the logged probabilities and input features vs the training baseline.
+    """
+    results = drift_monitor.check()
+    prediction = results.pop(PREDICTION, {"status": "no_baseline", "feature": PREDICTION})
+    return {**prediction, "features": results}
+
+
+@app.get("/models")
+def models():
+    return registry.describe()
+
+
+@app.post("/admin/models/reload")
+async def reload_models(request: Request):
+    """
+    Reloads ?model=<name> (always), or every model whose file changed.
+    The new version is loaded and warmed in a thread, then swapped in.
+    """
+    if ADMIN_TOKEN and request.headers.get("x-admin-token") != ADMIN_TOKEN:
+        return JSONResponse(status_code=403, content={"detail": "invalid admin token."})
+
+    name = request.query_params.get("model")
+    try:
+        if name:
+            if name not in registry.discover():
+                return _unknown_model_response(name)
+            await asyncio.to_thread(registry.load, name)
+            reloaded = [name]
+        else:
+            reloaded = await asyncio.to_thread(registry.refresh)
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"detail": f"reload failed: {e}"})
+
+    if ModelRegistry.DEFAULT in reloaded:
+        inference.preload = registry.get().source
+    return {"reloaded": reloaded, "models": registry.describe()}
+
+
 @app.post("/predict")
 async def predict(request: Request):
-    start = time.time()
-    REQ_COUNT.inc()
+    payload = None
+    body = await request.body()
+    # Starts after the body is received: stages measure our work, not the client's upload
+    timer = stage_timer("/predict", METRICS_STAGE_SAMPLE_RATE)
 
     try:
-        payload = await request.json()
-        _basic_guard(payload)
-
-        # Align columns to training schema
-        df = _align_payload_to_df(payload)
-
-        # If model not available -> fallback
-        if not model_loaded or model is None:
-            fb = fallback_model.predict(payload)
-            PRED_MODE.labels(mode="fallback_no_model").inc()
-            return {
-                "prediction": int(fb.get("prediction", 0)),
-                "probability": float(fb.get("probability", 0.0)),
-                "meta": {"mode": "fallback", "reason": "model_not_loaded"},
-            }
-
-        # Try real prediction
-        pred = model.predict(df)[0]
-        PRED_MODE.labels(mode="model").inc()
-        return {
-            "prediction": int(pred),
-            "meta": {"mode": "model"},
-        }
+        payload = loads(body)
+        timer.mark("parse")
+        # Typed record: known columns only, numbers already cast (raises on bad payloads)
+        payload = record_schema.coerce(payload)
+        timer.mark("guard")
+
+        # The version picked here serves the whole request, even if a reload swaps it meanwhile
+        name, mv = await _resolve_model(request)
+        timer.skip()
+
+        # Repeated records are answered without touching the model
+        result = None
+        if mv is not None and prediction_cache.enabled:
+            result = prediction_cache.get(_cache_key(payload, mv))
+            if result is not None:
+                PRED_MODE.labels(mode="cache").inc()
+            timer.mark("cache")
+
+        if result is None:
+            batcher = _micro_batcher(name)
+            if batcher is not None:
+                # Concurrent requests share one model call (queue wait counts as inference)
+                result = await batcher.submit(payload)
+                timer.mark("inference")
+            else:
+                # Single-record batch (in the inference pool, off the event loop);
+                # no model -> fallback, failing model call -> fallback
+                result = (await _score_records([payload], mv, lookup=False, timer=timer))[0]
+
+        # Logged with its probability (kept for drift checks), no disk I/O here
+        prediction_logger.log(payload, result, name, mv.version if mv is not None else None)
+
+        # Model answers carry no probability on /predict
+        if result["meta"]["mode"] == "model":
+            result.pop("probability", None)
+        response = _json_response(result)
+        timer.mark("serialize")
+        return response
 
+    except UnknownModelError as e:
+        return _unknown_model_response(e.args[0])
+    except ExecutorSaturated:
+        if INFERENCE_SATURATION == "reject":
+            return _saturated_response()
+        INFERENCE_REJECTED.inc()
+        timer.skip()
+        result = _fallback_result(payload, "saturated", "fallback_saturated")
+        timer.mark("fallback")
+        return result
     except Exception as e:
         # Any error => fallback (demo resilience)
+        timer.skip()
+        result = _fallback_result(payload, "exception", "fallback_error", str(e))
+        timer.mark("fallback")
+        return result
+    finally:
+        timer.observe(STAGE_LATENCY)
+
+
+@app.post("/predict/batch")
+async def predict_batch(request: Request):
+    body = await request.body()
+    timer = stage_timer("/predict/batch", METRICS_STAGE_SAMPLE_RATE)
+
+    try:
+        try:
+            records = _parse_records(body, request.headers.get("content-type", ""))
+        except ValueError as e:
+            return JSONResponse(status_code=422, content={"detail": str(e)})
+        timer.mark("parse")
+
+        if len(records) > MAX_BATCH_SIZE:
+            return JSONResponse(
+                status_code=413,
+                content={"detail": f"batch has {len(records)} records, max is {MAX_BATCH_SIZE}."},
+            )
+
         try:
-            fb = fallback_model.predict(payload if isinstance(payload, dict) else {})
-            PRED_MODE.labels(mode="fallback_error").inc()
-            return {
-                "prediction": int(fb.get("prediction", 0)),
-                "probability": float(fb.get("probability", 0.0)),
-                "meta": {"mode": "fallback", "reason": "exception", "error": str(e)},
-            }
-        except Exception:
-            PRED_MODE.labels(mode="fallback_failed").inc()
-            # Worst case: controlled response, demo doesn't crash
-            return {
-                "prediction": 0,
-                "meta": {"mode": "fallback", "reason": "fallback_failed", "error": str(e)},
-            }
+            _, mv = await _resolve_model(request)
+            timer.skip()
+            results = await _score_records(records, mv, timer=timer)
+        except UnknownModelError as e:
+            return _unknown_model_response(e.args[0])
+        except ExecutorSaturated:
+            return _saturated_response()
+        response = _json_response({"results": results, "count": len(results)})
+        timer.mark("serialize")
+        return response
     finally:
-        REQ_LATENCY.observe(time.time() - start)
+        timer.observe(STAGE_LATENCY)
@@ -0,0 +1,257 @@
+import os
+import time
+import hashlib
+import threading
+
+import joblib
+
+from app.encoder import FeatureEncoder
+from app.inference import limit_model_threads
+from src.data_profile import PROFILE_FILE
+from src.model_io import load_model, is_publishing, NATIVE_EXTENSIONS
+
+MODEL_EXTENSIONS = ('.pkl', '.joblib') + NATIVE_EXTENSIONS
+# Artifacts that live in the models directory but are not models
+# (data_profile.json shares the .json extension of native XGBoost models)
+NON_MODEL_FILES = {'feature_pipeline', os.path.splitext(PROFILE_FILE)[0]}
+
+
+class UnknownModelError(LookupError):
+    """Requested model name is neither loaded nor present in the models directory."""
+
+
+def file_version(path: str) -> str:
+    """
+    Short content hash: changes exactly when the artifact's bytes change.
+    """
+    h = hashlib.blake2b(digest_size=8)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _signature(*paths):
+    sig = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+            sig.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            sig.append(None)
+    return tuple(sig)
+
+
+class ModelVersion:
+    """
+    One fully loaded (and warmed) model with everything needed to serve it.
+    Never mutated after creation: a request holds on to the instance it
+    started with, so a swap can't hand it a half-loaded model.
+    """
+
+    def __init__(self, name, path, model, pipeline=None, encoder=None, version=None,
+                 pipeline_path=None):
+        self.name = name
+        self.path = path
+        self.model = model
+        self.pipeline = pipeline
+        self.encoder = encoder
+        self.version = version or f"mem-{id(model):x}"
+        self.pipeline_path = pipeline_path
+        self.loaded_at = time.time()
+
+    @property
+    def source(self):
+        """
+        What a process-pool worker needs to load the same model itself.
+        """
+        return (self.path, self.version, self.pipeline_path)
+
+    def describe(self) -> dict:
+        return {
+            "path": self.path,
+            "version": self.version,
+            "type": type(self.model).__name__,
+            "fast_path": self.encoder is not None,
+            "feature_pipeline": self.pipeline is not None,
+            "loaded_at": self.loaded_at,
+        }
+
+
+class ModelRegistry:
+    """
+    In-process registry of the models in the models directory.
+
+    - "default" is MODEL_PATH; every other model file in the directory is
+      available under its file name (XGBoost_Boosting, RandomForest_Bagging,
+      XGBoost_Reframed_Regressor, ...), native .ubj preferred over .pkl.
+    - load() builds a new ModelVersion off to the side, warms it with a
+      canned batch and only then swaps the dict of active versions in one
+      assignment. Readers never lock.
+    - Only the default model and the `preload` names are loaded up front;
+      the others load on their first request (see app.main._resolve_model).
+    - refresh() reloads the loaded (and preload) models whose file or the
+      feature pipeline changed, once a publish in progress is complete;
+      start_watching() runs it periodically in a daemon thread.
+    """
+
+    DEFAULT = "default"
+
+    def __init__(self, default_path, pipeline_path=None, numeric_cols=(), model_threads=None,
+                 mmap_mode=None, warmup=None, on_swap=None, preload=()):
+        self.default_path = default_path
+        self.models_dir = os.path.dirname(default_path) or "."
+        self.pipeline_path = pipeline_path
+        self.numeric_cols = set(numeric_cols)
+        self.model_threads = model_threads
+        self.mmap_mode = mmap_mode
+        self.warmup = warmup        # callable(ModelVersion), raises if the model is unusable
+        self.on_swap = on_swap      # callable(name, old_version, new_version)
+        self.preload = set(preload)  # names kept loaded without a request for them
+
+        self._versions = {}
+        self._signatures = {}
+        self._load_lock = threading.Lock()  # one load at a time; reads don't lock
+        self._watcher = None
+        self._watcher_pid = None
+
+    # ----------------------------
+    # Lookup
+    # ----------------------------
+    def get(self, name=None):
+        return self._versions.get(name or self.DEFAULT)
+
+    def names(self):
+        return sorted(set(self._versions) | set(self.discover()))
+
+    def discover(self) -> dict:
+        """
+        name -> path of every model file currently in the models directory.
+        """
+        found = {self.DEFAULT: self.default_path}
+        default_stem = os.path.splitext(os.path.basename(self.default_path))[0]
+        try:
+            files = sorted(os.listdir(self.models_dir))
+        except OSError:
+            return found
+
+        for fname in files:
+            stem, ext = os.path.splitext(fname)
+            # dotfiles are in-progress atomic writes
+            if fname.startswith('.') or ext not in MODEL_EXTENSIONS:
+                continue
+            if stem in NON_MODEL_FILES or stem == default_stem:
+                continue
+            if stem in found and ext not in NATIVE_EXTENSIONS:
+                continue
+            found[stem] = os.path.join(self.models_dir, fname)
+        return found
+
+    def describe(self) -> dict:
+        out = {}
+        for name in self.names():
+            mv = self.get(name)
+            out[name] = mv.describe() if mv is not None else {"loaded": False}
+        return out
+
+    # ----------------------------
+    # Loading / swapping
+    # ----------------------------
+    def _swap(self, mv: ModelVersion):
+        old = self._versions.get(mv.name)
+        versions = dict(self._versions)
+        versions[mv.name] = mv
+        self._versions = versions  # single reference assignment = atomic for readers
+        if self.on_swap is not None:
+            self.on_swap(mv.name, old, mv)
+
+    def register(self, name, model, pipeline=None, path=None):
+        """
+        Serves an in-memory model under `name` (no file involved).
+        """
+        encoder = FeatureEncoder.from_model(model, self.numeric_cols, pipeline)
+        mv = ModelVersion(name, path, model, pipeline, encoder)
+        self._swap(mv)
+        return mv
+
+    def load(self, name=None, path=None):
+        """
+        Loads, warms and activates `name`. On any error the previous version
+        stays active and the exception is raised.
+        """
+        name = name or self.DEFAULT
+        path = path or self.discover().get(name)
+        if path is None:
+            raise UnknownModelError(name)
+
+        with self._load_lock:
+            signature = _signature(path, self.pipeline_path or "")
+            model = limit_model_threads(load_model(path, mmap_mode=self.mmap_mode), self.model_threads)
+
+            pipeline = None
+            version = file_version(path)
+            if self.pipeline_path and os.path.exists(self.pipeline_path):
+                pipeline = joblib.load(self.pipeline_path)
+                # the pipeline is part of what's served: process workers and the
+                # result cache key on the version, so a retrained pipeline alone must change it
+                version = f"{version}-{file_version(self.pipeline_path)}"
+
+            mv = ModelVersion(
+                name, path, model,
+                pipeline=pipeline,
+                encoder=FeatureEncoder.from_model(model, self.numeric_cols, pipeline),
+                version=version,
+                pipeline_path=self.pipeline_path,
+            )
+            if self.warmup is not None:
+                self.warmup(mv)
+
+            self._swap(mv)
+            self._signatures[name] = signature
+            return mv
+
+    def refresh(self) -> list:
+        """
+        (Re)loads the default, preload and already loaded models whose files
+        changed since the last load; other models in the directory (e.g.
+        experiment checkpoints nobody asked for) stay on disk. Returns the
+        names that were swapped in. Nothing is loaded while a training run
+        publishes (src.model_io.publishing): a model must not be paired with
+        the pipeline of another run.
+        """
+        wanted = {self.DEFAULT} | self.preload | set(self._versions)
+        swapped = []
+        for name, path in self.discover().items():
+            if name not in wanted:
+                continue
+            if is_publishing(self.models_dir):
+                break
+            if not os.path.exists(path):
+                continue
+            if self._signatures.get(name) == _signature(path, self.pipeline_path or ""):
+                continue
+            try:
+                self.load(name, path)
+                swapped.append(name)
+            except Exception as e:
+                print(f"⚠️ Model reload failed for '{name}' ({path}): {e}")
+        return swapped
+
+    def start_watching(self, interval: float):
+        """
+        Polls the models directory every `interval` seconds (per process:
+        after a fork the watcher thread has to be started again).
+        """
+        if interval <= 0:
+            return
+        if self._watcher is not None and self._watcher_pid == os.getpid():
+            return
+
+        def _watch():
+            while True:
+                self.refresh()
+                time.sleep(interval)
+
+        self._watcher = threading.Thread(target=_watch, name="model-watcher", daemon=True)
+        self._watcher_pid = os.getpid()
+        self._watcher.start()
@@ -0,0 +1,73 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used when orjson isn't installed
+    orjson = None
+
+
+def loads(body: bytes):
+    """
+    Parses a JSON body (orjson when available). Raises ValueError on bad JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def dumps(obj) -> bytes:
+    """
+    Serializes a response body straight to bytes (no jsonable_encoder pass).
+    Only plain dict/list/str/int/float/bool/None are expected here.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+class RecordSchema:
+    """
+    Fixed, typed record schema built once from the API's column lists.
+
+    coerce() replaces the per-request guard + manual casting with a single
+    pass over the payload:
+    - rejects non-objects, too many fields and oversized strings (ValueError)
+    - keeps only known columns, numeric ones cast to float, the rest to str
+    - drops missing values (None, "", unparsable numbers), which every
+      consumer (alignment, FeatureEncoder, heuristic fallback) already
+      treats as "field not sent"
+
+    The result is a plain dict, so it can go wherever a raw payload went.
+    """
+
+    def __init__(self, columns, numeric_cols, max_fields=200, max_str_len=5000):
+        numeric_cols = set(numeric_cols)
+        self.columns = list(columns)
+        self._numeric = {c: (c in numeric_cols) for c in self.columns}
+        self.max_fields = max_fields
+        self.max_str_len = max_str_len
+
+    def coerce(self, payload) -> dict:
+        if not isinstance(payload, dict):
+            raise ValueError("payload must be a JSON object (dict).")
+        if len(payload) > self.max_fields:
+            raise ValueError("payload has too many fields.")
+
+        numeric = self._numeric
+        record = {}
+        for key, val in payload.items():
+            if isinstance(val, str) and len(val) > self.max_str_len:
+                raise ValueError(f"field '{key}' is too large.")
+            is_numeric = numeric.get(key)
+            if is_numeric is None or val is None:
+                continue
+            if is_numeric:
+                if val == "":
+                    continue
+                try:
+                    record[key] = float(val)
+                except (TypeError, ValueError, OverflowError):
+                    continue
+            else:
+                record[key] = val if isinstance(val, str) else str(val)
+        return record
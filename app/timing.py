@@ -0,0 +1,78 @@
+import random
+import time
+
+# Request stages, in pipeline order (label values of the stage histogram)
+STAGES = ("parse", "guard", "cache", "align", "transform", "inference", "fallback", "serialize")
+
+
+class StageTimer:
+    """
+    Per-request stopwatch. mark(stage) charges the time since the previous
+    mark (or creation) to `stage`; observe() records the totals once at the
+    end of the request, so the hot path only pays a perf_counter_ns call
+    and a dict update per stage.
+    """
+
+    __slots__ = ("route", "durations", "_last")
+
+    def __init__(self, route: str):
+        self.route = route
+        self.durations = {}
+        self._last = time.perf_counter_ns()
+
+    def mark(self, stage: str):
+        now = time.perf_counter_ns()
+        self.durations[stage] = self.durations.get(stage, 0) + now - self._last
+        self._last = now
+
+    def skip(self):
+        """
+        Restarts the clock without charging the elapsed time to any stage.
+        """
+        self._last = time.perf_counter_ns()
+
+    def observe(self, histogram):
+        for stage, ns in self.durations.items():
+            _child(histogram, self.route, stage).observe(ns / 1e9)
+
+
+# (histogram, route, stage) -> labelled child; labels() is the costly part of an observe
+_children = {}
+
+
+def _child(histogram, route, stage):
+    key = (histogram, route, stage)
+    child = _children.get(key)
+    if child is None:
+        child = _children[key] = histogram.labels(route=route, stage=stage)
+    return child
+
+
+class _NullTimer:
+    """
+    Stand-in for requests that aren't sampled: same interface, no work.
+    """
+
+    __slots__ = ()
+    durations = {}
+
+    def mark(self, stage):
+        pass
+
+    def skip(self):
+        pass
+
+    def observe(self, histogram):
+        pass
+
+
+NULL_TIMER = _NullTimer()
+
+
+def stage_timer(route: str, sample_rate: float = 1.0):
+    """
+    StageTimer for a `sample_rate` fraction of requests, NULL_TIMER otherwise.
+    """
+    if sample_rate >= 1.0 or (sample_rate > 0.0 and random.random() < sample_rate):
+        return StageTimer(route)
+    return NULL_TIMER
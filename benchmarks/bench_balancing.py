@@ -0,0 +1,104 @@
+"""
+Peak memory and fit time of the rebalancing strategies.
+
+Usage:
+    python benchmarks/bench_balancing.py [n_rows] [positive_rate]
+
+Defaults: 500,000 rows, 10% positives (the synthetic data is thinned to
+that rate). Each strategy runs in a fresh subprocess: clean_data ->
+strategy -> FeaturePipeline -> XGBoost fit (100 trees), reporting the fit
+time, the peak RSS of the process (ru_maxrss) and the mean predicted
+probability on the unbalanced data (strategies that match upsampling
+land close to it):
+
+- none      : no rebalancing (reference)
+- upsample  : balance_data before the feature pipeline (duplicated rows)
+- weights   : sample_weight=balance_weights(y)
+- index     : balance_index(y) as repeat counts, sample_weight=np.bincount(...)
+- minibatch : balanced_batches(y), boosting continued batch by batch
+              (each batch adds its share of the 100 trees)
+
+Linux only (ru_maxrss in KiB).
+"""
+import os
+import sys
+import json
+import time
+import resource
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+STRATEGIES = ('none', 'upsample', 'weights', 'index', 'minibatch')
+N_TREES = 100
+BATCH_SIZE = 100_000
+
+
+def run_strategy(strategy, n_rows, positive_rate):
+    import numpy as np
+    from xgboost import XGBClassifier
+
+    from benchmarks.synthetic_data import make_raw_frame
+    from src.pipeline_transformers import FeaturePipeline
+    from src.preprocess import balance_data, balance_index, balance_weights, balanced_batches, clean_data
+
+    df = clean_data(make_raw_frame(n_rows, seed=0))
+    rng = np.random.default_rng(0)
+    keep = (df['target'] == 0) | (rng.random(len(df)) < positive_rate / (df['target'].mean() or 1))
+    df = df[keep.to_numpy()].reset_index(drop=True)
+    reference_X = None
+
+    params = dict(max_depth=6, tree_method="hist", n_jobs=os.cpu_count(), random_state=0)
+    start = time.perf_counter()
+    if strategy == 'upsample':
+        df = balance_data(df)
+    pipeline = FeaturePipeline(n_features=50)
+    X = pipeline.fit_transform(df)
+    y = X.pop('target')
+
+    if strategy in ('none', 'upsample'):
+        model = XGBClassifier(n_estimators=N_TREES, **params).fit(X, y)
+    elif strategy == 'weights':
+        model = XGBClassifier(n_estimators=N_TREES, **params).fit(X, y, sample_weight=balance_weights(y))
+    elif strategy == 'index':
+        counts = np.bincount(balance_index(y), minlength=len(y))
+        model = XGBClassifier(n_estimators=N_TREES, **params).fit(X, y, sample_weight=counts)
+    else:
+        batches = list(balanced_batches(y, BATCH_SIZE))
+        per_batch = max(1, N_TREES // len(batches))
+        booster = None
+        for b in batches:
+            model = XGBClassifier(n_estimators=per_batch, **params)
+            model.fit(X.iloc[b], y.iloc[b], xgb_model=booster)
+            booster = model.get_booster()
+    seconds = time.perf_counter() - start
+
+    if strategy == 'upsample':
+        # score on the unbalanced rows like the other strategies
+        reference_X = X.loc[~X.index.duplicated()]
+    proba = model.predict_proba(X if reference_X is None else reference_X)[:, 1].mean()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {"rows": len(y), "seconds": seconds, "peak_mb": peak, "mean_proba": float(proba)}
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    positive_rate = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+    print(f"{n_rows} rows, ~{positive_rate:.0%} positives, {N_TREES} trees\n")
+    print(f"{'strategy':<10} {'train rows':>10} {'time [s]':>9} {'peak RSS [MB]':>14} {'mean proba':>11}")
+    for strategy in STRATEGIES:
+        out = subprocess.run(
+            [sys.executable, __file__, '--child', strategy, str(n_rows), str(positive_rate)],
+            check=True, capture_output=True, text=True, cwd=ROOT,
+        ).stdout.strip().splitlines()[-1]
+        r = json.loads(out)
+        print(f"{strategy:<10} {r['rows']:>10} {r['seconds']:>9.2f} {r['peak_mb']:>14.0f} {r['mean_proba']:>11.3f}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        _, _, strategy, n_rows, positive_rate = sys.argv
+        print(json.dumps(run_strategy(strategy, int(n_rows), float(positive_rate))))
+    else:
+        main()
@@ -0,0 +1,91 @@
+"""
+Rows/sec of /predict (one record per request) vs /predict/batch.
+
+Usage:
+    MODEL_PATH=data/models/model.pkl python benchmarks/bench_batch_predict.py [n_rows] [batch_size]
+
+Runs in-process through FastAPI's TestClient, so the numbers include
+JSON, routing and alignment cost but not network time.
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+from app.main import app, registry
+
+BASE_PAYLOAD = {
+    "Category": "Programming",
+    "Education_Level": "Bachelor",
+    "Employment_Status": "Student",
+    "City": "Delhi",
+    "Device_Type": "Laptop",
+    "Internet_Connection_Quality": "High",
+    "Course_ID": "C101",
+    "Course_Level": "Beginner",
+    "Payment_Mode": "UPI",
+    "Gender": "Male",
+    "Fee_Paid": "Yes",
+    "Discount_Used": "No",
+    "Course_Duration_Days": 30,
+    "Instructor_Rating": 4.5,
+    "Login_Frequency": 5,
+    "Average_Session_Duration_Min": 45,
+    "Video_Completion_Rate": 80,
+    "Discussion_Participation": 5,
+    "Time_Spent_Hours": 10,
+    "Days_Since_Last_Login": 2,
+    "Notifications_Checked": 5,
+    "Peer_Interaction_Score": 8,
+    "Assignments_Submitted": 5,
+    "Assignments_Missed": 0,
+    "Quiz_Attempts": 3,
+    "Project_Grade": 90,
+    "Rewatch_Count": 2,
+    "Payment_Amount": 1000,
+    "App_Usage_Percentage": 80,
+    "Reminder_Emails_Clicked": 2,
+    "Support_Tickets_Raised": 0,
+    "Satisfaction_Rating": 4.5,
+}
+
+
+def make_records(n, seed=42):
+    rng = random.Random(seed)
+    records = []
+    for i in range(n):
+        rec = dict(BASE_PAYLOAD)
+        rec["Student_ID"] = f"STU_{i}"
+        rec["Age"] = rng.randint(18, 60)
+        rec["Progress_Percentage"] = rng.randint(0, 100)
+        rec["Quiz_Score_Avg"] = rng.randint(40, 100)
+        records.append(rec)
+    return records
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    records = make_records(n_rows)
+    client = TestClient(app)
+
+    print(f"model_loaded={registry.get() is not None} rows={n_rows} batch_size={batch_size}")
+
+    start = time.perf_counter()
+    for rec in records:
+        client.post("/predict", json=rec)
+    single = time.perf_counter() - start
+    print(f"/predict        : {n_rows / single:10.1f} rows/sec")
+
+    start = time.perf_counter()
+    for i in range(0, n_rows, batch_size):
+        client.post("/predict/batch", json=records[i:i + batch_size])
+    batch = time.perf_counter() - start
+    print(f"/predict/batch  : {n_rows / batch:10.1f} rows/sec  ({single / batch:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
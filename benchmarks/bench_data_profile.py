@@ -0,0 +1,84 @@
+"""
+Cost of the training data profile (src/data_profile.py) relative to
+training.
+
+Usage:
+    python benchmarks/bench_data_profile.py [n_rows]
+
+Defaults: 300,000 rows. On the cleaned synthetic frame:
+
+- per-column : the straightforward pandas version (isna/min/max/mean/std/
+               quantile per numeric column, value_counts per category)
+- profile    : build_profile (one sort per numeric column, histogram included)
+- training   : feature pipeline, shared split and the three
+               MLEngineerPipeline models (as in train_full, without MLflow)
+
+and prints the profile time as a share of the training time.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from xgboost import XGBClassifier, XGBRegressor
+
+from benchmarks.synthetic_data import make_raw_frame
+from src.data_profile import build_profile
+from src.experiments import fit_xgboost, shared_split, train_matrix
+from src.pipeline_transformers import FeaturePipeline
+from src.preprocess import clean_data
+
+
+def per_column(df):
+    profile = {}
+    for col in df.columns:
+        s = df[col]
+        if pd.api.types.is_numeric_dtype(s):
+            profile[col] = {'null_rate': s.isna().mean(), 'min': s.min(), 'max': s.max(), 'mean': s.mean(),
+                            'std': s.std(), 'edges': s.quantile(np.linspace(0, 1, 11)[1:-1]).tolist()}
+        elif not pd.api.types.is_datetime64_any_dtype(s):
+            profile[col] = {'null_rate': s.isna().mean(), 'frequencies': s.value_counts(normalize=True).head(50)}
+    return profile
+
+
+def train(clean_df):
+    final = FeaturePipeline(n_features=50).fit_transform(clean_df)
+    data = shared_split(final.drop(columns=['target', 'Progress_Percentage']), final['target'],
+                        final['Progress_Percentage'])
+    RandomForestClassifier(n_estimators=100, max_depth=10, random_state=42, n_jobs=-1).fit(data['X_train'], data['y_train'])
+    dtrain = train_matrix('bench', data, 256)
+    clf = fit_xgboost(XGBClassifier(n_estimators=100, learning_rate=0.1, max_depth=6, eval_metric="logloss",
+                                    random_state=42), dtrain, data['y_train'])
+    fit_xgboost(XGBRegressor(n_estimators=100, max_depth=6, learning_rate=0.1, random_state=42),
+                dtrain, data['progress_train'])
+    return clf.predict_proba(data['X_test'])[:, 1]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - start
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    clean_df = clean_data(make_raw_frame(n_rows))
+
+    probabilities, t_train = timed(train, clean_df)
+    _, t_naive = timed(per_column, clean_df)
+    profile, t_profile = timed(build_profile, clean_df, probabilities)
+
+    print(f"\n{n_rows} rows, {len(profile['columns'])} profiled columns\n")
+    print(f"{'':<11} {'time [s]':>9}")
+    print(f"{'per-column':<11} {t_naive:>9.2f}")
+    print(f"{'profile':<11} {t_profile:>9.2f}")
+    print(f"{'training':<11} {t_train:>9.2f}")
+    print(f"\nprofile adds {100 * t_profile / t_train:.1f}% to training")
+
+
+if __name__ == "__main__":
+    main()
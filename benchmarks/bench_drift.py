@@ -0,0 +1,88 @@
+"""
+Drift check cost: rereading the whole prediction log vs the incremental
+DriftMonitor (src/monitoring.py).
+
+Usage:
+    python benchmarks/bench_drift.py [n_logged] [n_new]
+
+Defaults: 500,000 logged predictions, then 1,000 new ones before the
+next check. Times one check of the probability and three input features
+each way:
+
+- reread      : parse every line of the log, mean/std per feature
+- incremental : DriftMonitor.check() (parses only the new lines; the
+                first check reads everything once)
+"""
+import os
+import sys
+import json
+import time
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+
+from src.data_profile import build_profile, save_profile
+from src.monitoring import DriftMonitor, PredictionLogger, log_segments
+
+FEATURES = ("Age", "Quiz_Score_Avg", "Progress_Percentage")
+
+
+def log(logger, n, seed):
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(0, 100, size=(n, len(FEATURES)))
+    probas = rng.uniform(size=n)
+    for row, p in zip(values.tolist(), probas.tolist()):
+        logger.log(dict(zip(FEATURES, row)), {"prediction": int(p > 0.5), "probability": p})
+    logger.flush()
+
+
+def reread(path):
+    values = {name: [] for name in ("probability",) + FEATURES}
+    for segment in log_segments(path):
+        with open(segment) as f:
+            for line in f:
+                entry = json.loads(line)
+                values["probability"].append(entry["probability"])
+                for name in FEATURES:
+                    values[name].append(entry["input"][name])
+    return {name: (np.mean(v), np.std(v)) for name, v in values.items()}
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    n_new = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path, baseline = os.path.join(tmp, "p.jsonl"), os.path.join(tmp, "data_profile.json")
+        rng = np.random.default_rng(0)
+        reference = pd.DataFrame(rng.uniform(0, 100, size=(10_000, len(FEATURES))), columns=FEATURES)
+        save_profile(build_profile(reference, rng.uniform(size=10_000)), baseline)
+        logger = PredictionLogger(path, buffer_size=n, max_bytes=0)
+        log(logger, n, seed=1)
+
+        monitor = DriftMonitor(path, baseline)
+        start = time.perf_counter()
+        monitor.check()
+        t_first = time.perf_counter() - start
+
+        log(logger, n_new, seed=2)
+        start = time.perf_counter()
+        reread(path)
+        t_reread = time.perf_counter() - start
+        start = time.perf_counter()
+        results = monitor.check()
+        t_inc = time.perf_counter() - start
+        size = sum(os.path.getsize(p) for p in log_segments(path)) / 2**20
+
+    print(f"\n{n} + {n_new} logged predictions ({size:.0f} MiB), {len(FEATURES)} features + probability\n")
+    print(f"{'':<24} {'time [ms]':>10}")
+    print(f"{'reread whole log':<24} {t_reread * 1000:>10.1f}")
+    print(f"{'incremental (1st check)':<24} {t_first * 1000:>10.1f}")
+    print(f"{'incremental':<24} {t_inc * 1000:>10.1f}")
+    print(f"\nsamples in window: {results['probability']['samples']}")
+
+
+if __name__ == "__main__":
+    main()
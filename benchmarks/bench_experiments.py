@@ -0,0 +1,82 @@
+"""
+Sequential vs parallel training of the candidate models (src/experiments.py).
+
+Usage:
+    python benchmarks/bench_experiments.py [n_rows] [cores]
+
+Defaults: 200,000 rows, all CPUs. Trains the three MLEngineerPipeline
+models (RandomForest, XGBoost classifier, XGBoost reframed regressor) on
+the synthetic feature set:
+
+- sequential : one model at a time, each with all `cores` threads
+- parallel   : all three at once in the process pool, cores // 3 threads each
+
+and finally re-runs the parallel schedule to show the checkpoint skip.
+MLflow is not involved (the scheduler is used directly).
+"""
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sklearn.ensemble import RandomForestClassifier
+from xgboost import XGBClassifier, XGBRegressor
+
+from benchmarks.synthetic_data import make_raw_frame
+from src.experiments import ExperimentScheduler, core_budget, save_split, shared_split
+from src.pipeline_transformers import FeaturePipeline
+from src.preprocess import clean_data
+
+
+def make_jobs(workdir, n_rows):
+    final = FeaturePipeline(n_features=50).fit_transform(clean_data(make_raw_frame(n_rows, seed=0)))
+    X = final.drop(columns=['target', 'Progress_Percentage'])
+    path = save_split(shared_split(X, final['target'], final['Progress_Percentage']),
+                      os.path.join(workdir, 'split.joblib'))
+    models = [
+        ("RandomForest_Bagging", 'classification',
+         RandomForestClassifier(n_estimators=100, max_depth=10, random_state=42)),
+        ("XGBoost_Boosting", 'classification',
+         XGBClassifier(n_estimators=100, learning_rate=0.1, max_depth=6, eval_metric="logloss", random_state=42)),
+        ("XGBoost_Reframed_Regressor", 'reframing',
+         XGBRegressor(n_estimators=100, max_depth=6, learning_rate=0.1, random_state=42)),
+    ]
+    return [{'name': name, 'task': task, 'model': model, 'data_path': path, 'out_dir': workdir,
+             'fingerprint': name} for name, task, model in models]
+
+
+def timed_run(scheduler, jobs):
+    start = time.perf_counter()
+    outcomes = scheduler.run(jobs)
+    return time.perf_counter() - start, outcomes
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    cores = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        jobs = make_jobs(workdir, n_rows)
+        seq_dir, par_dir = os.path.join(workdir, 'seq'), os.path.join(workdir, 'par')
+        os.makedirs(seq_dir)
+        os.makedirs(par_dir)
+
+        seq_jobs = [{**job, 'out_dir': seq_dir} for job in jobs]
+        par_jobs = [{**job, 'out_dir': par_dir} for job in jobs]
+        t_seq, seq = timed_run(ExperimentScheduler(seq_dir, max_parallel=1, cores=cores), seq_jobs)
+        t_par, par = timed_run(ExperimentScheduler(par_dir, cores=cores), par_jobs)
+        t_skip, _ = timed_run(ExperimentScheduler(par_dir, cores=cores), par_jobs)
+
+    print(f"\n{n_rows} rows, {cores} cores\n")
+    print(f"{'model':<28} {'sequential [s]':>15} {'parallel [s]':>13}")
+    for s, p in zip(seq, par):
+        print(f"{s['result']['Model']:<28} {s['seconds']:>15.1f} {p['seconds']:>13.1f}")
+    print(f"{'wall time':<28} {t_seq:>15.1f} {t_par:>13.1f}")
+    print(f"\nthreads per job: sequential {cores}, parallel {core_budget(len(jobs), cores)}")
+    print(f"retry with all runs checkpointed: {t_skip:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Throughput of the heuristic fallback (src/fallback.py): scalar vs vectorized.
+
+Usage:
+    python benchmarks/bench_fallback.py [n_records]
+
+Defaults: 200,000 records with Progress_Percentage / Quiz_Score_Avg (1%
+with missing fields). Compares:
+
+- scalar      : HeuristicModel.predict per record
+- records     : HeuristicModel.predict_records (dicts -> arrays -> np.where)
+- arrays      : HeuristicModel.predict_batch on ready NumPy arrays
+- api scalar  : app.main._fallback_result per record (the old batch path)
+- api batch   : app.main._fallback_results (what /predict/batch and the
+                micro-batcher use now)
+
+The vectorized answers are checked against the scalar ones.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from src.fallback import HeuristicModel
+
+
+def make_records(n, seed=0):
+    rng = np.random.default_rng(seed)
+    progress, quiz = rng.uniform(0, 100, n).tolist(), rng.uniform(0, 100, n).tolist()
+    records = [{"Progress_Percentage": p, "Quiz_Score_Avg": q} for p, q in zip(progress, quiz)]
+    for i in range(0, n, 100):
+        records[i] = {"Quiz_Score_Avg": quiz[i]}
+    return records
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - start
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    model = HeuristicModel()
+    records = make_records(n)
+    progress = np.array([r.get("Progress_Percentage", 0) for r in records], dtype=float)
+    quiz = np.array([r.get("Quiz_Score_Avg", 0) for r in records], dtype=float)
+
+    scalar, t_scalar = timed(lambda: [model.predict(r) for r in records])
+    (pred, proba), t_records = timed(model.predict_records, records)
+    _, t_arrays = timed(model.predict_batch, progress, quiz)
+    assert pred.tolist() == [r["prediction"] for r in scalar]
+    assert proba.tolist() == [r["probability"] for r in scalar]
+
+    from app.main import _fallback_result, _fallback_results
+    _, t_api_scalar = timed(lambda: [_fallback_result(r, "bench", "fallback_no_model") for r in records])
+    _, t_api_batch = timed(_fallback_results, records, "bench", "fallback_no_model")
+
+    print(f"\n{n} records\n")
+    print(f"{'':<11} {'time [ms]':>10} {'records/s':>14}")
+    for name, t in [("scalar", t_scalar), ("records", t_records), ("arrays", t_arrays),
+                    ("api scalar", t_api_scalar), ("api batch", t_api_batch)]:
+        print(f"{name:<11} {1000 * t:>10.1f} {n / t:>14,.0f}")
+    print(f"\nspeedup: records {t_scalar / t_records:.1f}x, arrays {t_scalar / t_arrays:.0f}x, "
+          f"api {t_api_scalar / t_api_batch:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
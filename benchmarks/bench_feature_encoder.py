@@ -0,0 +1,69 @@
+"""
+Single-row latency (p50/p99) of the pandas path vs the numpy FeatureEncoder path.
+
+Usage:
+    python benchmarks/bench_feature_encoder.py [n_calls]
+
+Trains a small XGBoost model on the numeric API columns, then times
+align -> DataFrame -> predict_proba against encode -> inplace_predict for
+one payload at a time (the /predict hot path, without HTTP).
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+from xgboost import XGBClassifier
+
+from app.main import NUMERIC_COLS, _align_payload_to_df
+from app.encoder import FeatureEncoder
+from app.inference import predict_frame, predict_records
+from bench_batch_predict import make_records
+
+
+def percentiles(samples):
+    ns = np.asarray(samples) / 1000.0  # -> microseconds
+    return np.percentile(ns, 50), np.percentile(ns, 99)
+
+
+def time_calls(fn, records):
+    samples = []
+    for rec in records:
+        t0 = time.perf_counter_ns()
+        fn(rec)
+        samples.append(time.perf_counter_ns() - t0)
+    return samples
+
+
+def main():
+    n_calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    cols = sorted(NUMERIC_COLS)
+    records = make_records(n_calls)
+
+    train = pd.DataFrame(records, columns=cols).astype(float)
+    y = (train["Progress_Percentage"] > 50).astype(int)
+    model = XGBClassifier(n_estimators=100, max_depth=6, n_jobs=1).fit(train, y)
+    encoder = FeatureEncoder.from_model(model, NUMERIC_COLS)
+
+    def pandas_path(rec):
+        df = _align_payload_to_df(rec)[cols].astype(float)
+        return predict_frame(model, df)
+
+    def encoder_path(rec):
+        return predict_records(model, encoder, [rec])
+
+    # warm-up
+    time_calls(pandas_path, records[:50])
+    time_calls(encoder_path, records[:50])
+
+    p50, p99 = percentiles(time_calls(pandas_path, records))
+    print(f"pandas  path: p50 {p50:8.1f} us   p99 {p99:8.1f} us")
+    e50, e99 = percentiles(time_calls(encoder_path, records))
+    print(f"encoder path: p50 {e50:8.1f} us   p99 {e99:8.1f} us   ({p50 / e50:.1f}x at p50)")
+
+
+if __name__ == "__main__":
+    main()
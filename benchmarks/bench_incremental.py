@@ -0,0 +1,108 @@
+"""
+Incremental update vs full rebuild when one new partition arrives.
+
+Usage:
+    python benchmarks/bench_incremental.py [n_partitions] [rows_per_partition]
+
+Defaults: 10 partitions of 50,000 rows. The history (n_partitions - 1
+parts) is written like the streaming DAG's 3_features dataset, the three
+MLEngineerPipeline models are trained on it, then one more partition
+arrives and the models are brought up to date twice:
+
+- full rebuild : read all partitions, fit the feature pipeline, shared
+                 split, train all three models from scratch
+- incremental  : guard (partition hashes, schema, categories, drift) on
+                 the new partition, transform it with the saved feature
+                 pipeline, continue each model (src/incremental.py)
+
+MLflow is not involved. Also prints the accuracy of both on a fresh
+holdout partition.
+"""
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score
+from xgboost import XGBClassifier, XGBRegressor
+
+from benchmarks.synthetic_data import make_raw_frame
+from src.experiments import fit_xgboost, shared_split, train_matrix
+from src.features import apply_feature_cross
+from src.incremental import PartitionTracker, continue_model
+from src.pipeline_transformers import FeaturePipeline
+from src.preprocess import clean_data
+from src.storage import partition_paths, read_dataset, read_partitions, write_partition
+
+ROUNDS = TREES = 20
+
+
+def full_rebuild(directory):
+    clean_df = clean_data(read_dataset(directory))
+    pipeline = FeaturePipeline(n_features=50)
+    final = pipeline.fit_transform(clean_df)
+    data = shared_split(final.drop(columns=['target', 'Progress_Percentage']), final['target'],
+                        final['Progress_Percentage'])
+    rf = RandomForestClassifier(n_estimators=100, max_depth=10, random_state=42, n_jobs=-1)
+    rf.fit(data['X_train'], data['y_train'])
+    dtrain = train_matrix((directory, len(partition_paths(directory))), data, 256)
+    clf = fit_xgboost(XGBClassifier(n_estimators=100, learning_rate=0.1, max_depth=6, eval_metric="logloss",
+                                    random_state=42), dtrain, data['y_train'])
+    reg = fit_xgboost(XGBRegressor(n_estimators=100, max_depth=6, learning_rate=0.1, random_state=42),
+                      dtrain, data['progress_train'])
+    return clean_df, pipeline, {'RandomForest': rf, 'XGBoost': clf, 'XGBoost regressor': reg}
+
+
+def incremental(directory, checkpoint_dir, pipeline, models):
+    tracker = PartitionTracker(checkpoint_dir)
+    paths = partition_paths(directory)
+    new_df = clean_data(read_partitions(tracker.pending(paths)))
+    reasons = tracker.retrain_reasons(paths, new_df, pipeline, [])
+    assert not reasons, reasons
+    final = pipeline.transform(new_df)
+    X, y = final.drop(columns=['target', 'Progress_Percentage']), final['target']
+    for name, model in models.items():
+        continue_model(model, X, final['Progress_Percentage'] if name == 'XGBoost regressor' else y, ROUNDS, TREES)
+    return models
+
+
+def holdout_accuracy(models, pipeline, holdout):
+    final = pipeline.transform(holdout)
+    X = final.drop(columns=['target', 'Progress_Percentage'])
+    return accuracy_score(final['target'], models['XGBoost'].predict(X))
+
+
+def main():
+    n_parts = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+    parts = [apply_feature_cross(clean_data(make_raw_frame(rows, seed=i))) for i in range(n_parts + 1)]
+    holdout = clean_data(parts.pop())
+
+    with tempfile.TemporaryDirectory() as workdir:
+        directory, checkpoint_dir = os.path.join(workdir, '3_features'), os.path.join(workdir, 'models')
+        for i, part in enumerate(parts[:-1]):
+            write_partition(part, directory, i)
+        clean_df, pipeline, models = full_rebuild(directory)
+        PartitionTracker(checkpoint_dir).record(partition_paths(directory), clean_df, pipeline.numeric_cols)
+
+        write_partition(parts[-1], directory, n_parts - 1)
+        start = time.perf_counter()
+        _, full_pipeline, full_models = full_rebuild(directory)
+        t_full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        models = incremental(directory, checkpoint_dir, pipeline, models)
+        t_inc = time.perf_counter() - start
+
+    print(f"\n{n_parts} partitions x {rows} rows, {os.cpu_count()} cores, one new partition\n")
+    print(f"{'':<14} {'time [s]':>9} {'holdout accuracy (XGBoost)':>27}")
+    print(f"{'full rebuild':<14} {t_full:>9.2f} {holdout_accuracy(full_models, full_pipeline, holdout):>27.4f}")
+    print(f"{'incremental':<14} {t_inc:>9.2f} {holdout_accuracy(models, pipeline, holdout):>27.4f}")
+    print(f"\nspeed-up: {t_full / t_inc:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+DAG stage I/O: write/read time and disk footprint per interim format.
+
+Usage:
+    python benchmarks/bench_interim_storage.py [n_rows]
+
+Builds the three interim artifacts of dags/data_pipeline_dag.py from
+synthetic raw data (1_validated, 2_cleaned, 3_features) and times one
+write + one full read of each (best of 3), per format, plus a pruned
+read of 5 columns of 3_features.
+
+In a fresh process the first large parquet read also pays pyarrow's
+allocator warm-up (seconds with mimalloc on some hosts); set
+ARROW_DEFAULT_MEMORY_POOL=system if that shows up in the Airflow tasks.
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.preprocess import clean_data
+from src.features import apply_feature_cross
+from src.storage import FORMATS, stage_path, read_frame, write_frame
+from synthetic_data import make_raw_frame
+
+PRUNED_COLS = ['Age', 'Progress_Percentage', 'Quiz_Score_Avg', 'Category_Level_Cross', 'target']
+
+
+def timed(fn, repeat=3):
+    # Best of `repeat`: the I/O timings are noisy on shared disks
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return out, best
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    validated = make_raw_frame(n_rows)
+    cleaned = clean_data(validated)
+    features = apply_feature_cross(cleaned.copy())
+    stages = [('1_validated', validated), ('2_cleaned', cleaned), ('3_features', features)]
+
+    workdir = tempfile.mkdtemp()
+    print(f"rows={n_rows}")
+    print(f"{'format':<8} {'write':>8} {'read':>8} {'pruned':>8} {'size':>9}  dtypes kept")
+    try:
+        for fmt in FORMATS:
+            # First call pays one-off library imports; keep it out of the timings
+            warm = stage_path(workdir, 'warmup', fmt)
+            write_frame(validated.head(100), warm)
+            read_frame(warm)
+
+            write_s = read_s = size = 0
+            dtypes_kept = True
+            for name, df in stages:
+                path = stage_path(workdir, name, fmt)
+                _, t = timed(lambda: write_frame(df, path))
+                write_s += t
+                back, t = timed(lambda: read_frame(path))
+                read_s += t
+                size += os.path.getsize(path)
+                dtypes_kept &= back.dtypes.astype(str).equals(df.dtypes.astype(str))
+            _, pruned_s = timed(lambda: read_frame(stage_path(workdir, '3_features', fmt), columns=PRUNED_COLS))
+            print(f"{fmt:<8} {write_s:>7.2f}s {read_s:>7.2f}s {pruned_s:>7.3f}s {size / 1e6:>7.1f}MB  {dtypes_kept}")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
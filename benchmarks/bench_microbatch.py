@@ -0,0 +1,53 @@
+"""
+/predict throughput under concurrency, with and without micro-batching.
+
+Usage:
+    MODEL_PATH=data/models/model.pkl python benchmarks/bench_microbatch.py [n_requests] [concurrency]
+
+Drives the ASGI app in-process with httpx.AsyncClient so many requests are
+in flight at once (Locust-style), then swaps in a MicroBatcher and repeats.
+"""
+import os
+import sys
+import time
+import asyncio
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import httpx
+import app.main as main
+from bench_batch_predict import make_records
+
+
+async def drive(records, concurrency):
+    transport = httpx.ASGITransport(app=main.app)
+    sem = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(rec):
+            async with sem:
+                await client.post("/predict", json=rec)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(r) for r in records))
+        return time.perf_counter() - start
+
+
+def main_():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    records = make_records(n)
+    print(f"model_loaded={main.registry.get() is not None} requests={n} concurrency={concurrency}")
+
+    main.MICROBATCH_ENABLED = False
+    direct = asyncio.run(drive(records, concurrency))
+    print(f"direct       : {n / direct:10.1f} req/sec")
+
+    main.MICROBATCH_ENABLED = True
+    main.micro_batchers.clear()
+    batched = asyncio.run(drive(records, concurrency))
+    print(f"micro-batched: {n / batched:10.1f} req/sec  ({direct / batched:.1f}x)")
+
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,113 @@
+"""
+Per-worker memory and start-up time of the model for 1, 4 and 8 workers.
+
+Usage:
+    python benchmarks/bench_model_memory.py [model.pkl|model.ubj] [n_trees]
+
+Without a path a synthetic XGBoost model (default 2000 trees) is trained
+and exported to both formats in a temp dir. Compares:
+
+- load-per-worker : every forked worker loads its own copy (uvicorn --workers)
+- preload + fork  : the master loads once, workers are forked afterwards
+                    (gunicorn -c gunicorn.conf.py, preload_app = True)
+
+USS = memory private to a worker, PSS = private + its share of shared pages.
+Linux only (os.fork, PSS); needs psutil.
+"""
+import gc
+import os
+import sys
+import json
+import time
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import psutil
+
+from src.model_io import load_model, export_native, native_path
+
+MB = 1024 * 1024
+
+
+def build_model(n_trees, workdir):
+    import joblib
+    from xgboost import XGBClassifier
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(20000, 40)).astype(np.float32)
+    y = (X[:, 0] + rng.normal(size=20000) > 0).astype(int)
+    model = XGBClassifier(n_estimators=n_trees, max_depth=8, n_jobs=os.cpu_count()).fit(X, y)
+    path = os.path.join(workdir, "model.pkl")
+    joblib.dump(model, path)
+    export_native(model, native_path(path))
+    return path
+
+
+def worker_report(model, load_seconds, conn_w):
+    model.predict(np.zeros((4, model.n_features_in_), dtype=np.float32))
+    info = psutil.Process().memory_full_info()
+    os.write(conn_w, json.dumps({"load": load_seconds, "uss": info.uss, "pss": info.pss}).encode())
+    os._exit(0)
+
+
+def run(path, n_workers, preload):
+    r, w = os.pipe()
+    model = None
+    if preload:
+        model = load_model(path)
+        gc.freeze()
+
+    pids = []
+    for _ in range(n_workers):
+        pid = os.fork()
+        if pid == 0:
+            os.close(r)
+            if preload:
+                worker_report(model, 0.0, w)
+            start = time.perf_counter()
+            m = load_model(path)
+            worker_report(m, time.perf_counter() - start, w)
+        pids.append(pid)
+    os.close(w)
+
+    for pid in pids:
+        os.waitpid(pid, 0)
+    raw = b""
+    while True:
+        chunk = os.read(r, 65536)
+        if not chunk:
+            break
+        raw += chunk
+    os.close(r)
+    gc.unfreeze()
+
+    reports = [json.loads(x) for x in raw.decode().replace("}{", "}\n{").splitlines()]
+    return (
+        np.mean([x["uss"] for x in reports]) / MB,
+        np.mean([x["pss"] for x in reports]) / MB,
+        max(x["load"] for x in reports),
+    )
+
+
+def main():
+    n_trees = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    workdir = tempfile.mkdtemp()
+    path = sys.argv[1] if len(sys.argv) > 1 else build_model(n_trees, workdir)
+    paths = [path]
+    if path.endswith(".pkl") and os.path.exists(native_path(path)):
+        paths.append(native_path(path))
+
+    print(f"{'artifact':<10} {'mode':<16} {'workers':>7} {'USS/worker':>11} {'PSS/worker':>11} {'load':>8}")
+    for p in paths:
+        fmt = os.path.splitext(p)[1]
+        for n in (1, 4, 8):
+            for preload in (False, True):
+                uss, pss, load = run(p, n, preload)
+                mode = "preload + fork" if preload else "load-per-worker"
+                print(f"{fmt:<10} {mode:<16} {n:>7} {uss:>9.1f}MB {pss:>9.1f}MB {load * 1000:>6.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
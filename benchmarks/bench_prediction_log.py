@@ -0,0 +1,97 @@
+"""
+Per-request cost of prediction logging: synchronous JSONL append vs the
+buffered PredictionLogger (src/monitoring.py).
+
+Usage:
+    python benchmarks/bench_prediction_log.py [n_records] [disk_delay_ms]
+
+Defaults: 20,000 records, 0 ms. disk_delay_ms adds a sleep to every file
+write to emulate a slow or contended disk. Three variants, timed per
+record as the request would see it:
+
+- sync      : open + append one JSON line (+ the delay) per record
+- sync+fsync: the same, with fsync (durable per request)
+- buffered  : PredictionLogger.log() while its writer thread flushes
+"""
+import os
+import sys
+import json
+import time
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from bench_batch_predict import make_records
+import src.monitoring as monitoring
+from src.monitoring import PredictionLogger, log_segments
+
+
+def sync_log(path, record, result, delay, fsync):
+    with open(path, 'ab') as f:
+        line = json.dumps({'ts': time.time(), 'input': record, 'prediction': result['prediction'],
+                           'probability': result['probability']}).encode() + b'\n'
+        if delay:
+            time.sleep(delay)
+        f.write(line)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def timed(fn, records):
+    times = np.empty(len(records))
+    result = {'prediction': 1, 'probability': 0.73}
+    for i, record in enumerate(records):
+        start = time.perf_counter_ns()
+        fn(record, result)
+        times[i] = time.perf_counter_ns() - start
+    return times / 1000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    delay = (float(sys.argv[2]) if len(sys.argv) > 2 else 0.0) / 1000
+    records = make_records(n)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, fsync in (('sync', False), ('sync+fsync', True)):
+            path = os.path.join(tmp, f'{name}.jsonl')
+            rows.append((name, timed(lambda r, res: sync_log(path, r, res, delay, fsync), records)))
+
+        logger = PredictionLogger(os.path.join(tmp, 'buffered.jsonl'), buffer_size=n, flush_interval=0.05)
+        if delay:
+            # every write of the background flush pays the delay too
+            real_open = open
+            monitoring.open = lambda *a, **k: _SlowFile(real_open(*a, **k), delay)
+        logger.start()
+        rows.append(('buffered', timed(lambda r, res: logger.log(r, res), records)))
+        logger.stop()
+        written = sum(1 for p in log_segments(logger.path) for _ in open(p))
+
+    print(f"\n{n} records, disk delay {delay * 1000:g} ms per write\n")
+    print(f"{'':<11} {'p50 [us]':>9} {'p99 [us]':>9} {'max [us]':>10}")
+    for name, t in rows:
+        print(f"{name:<11} {np.percentile(t, 50):>9.1f} {np.percentile(t, 99):>9.1f} {t.max():>10.1f}")
+    print(f"\nbuffered: {written} records written, {logger.dropped} dropped")
+
+
+class _SlowFile:
+    def __init__(self, f, delay):
+        self._f, self._delay = f, delay
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._f.close()
+
+    def write(self, data):
+        time.sleep(self._delay)
+        return self._f.write(data)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Request parsing / response serialization cost and end-to-end /predict RPS.
+
+Usage:
+    python benchmarks/bench_request_path.py [n_requests] [concurrency]
+
+1. parse: json.loads + per-field guard (previous /predict) vs
+   orjson + RecordSchema.coerce (guard and casting in one pass)
+2. serialize: FastAPI's jsonable_encoder + json.dumps (returning a dict)
+   vs dumps() straight to bytes
+3. end-to-end: concurrent /predict through the ASGI app with a small
+   XGBoost model on the numeric columns (fast encoder path)
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import httpx
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+from xgboost import XGBClassifier
+
+import app.main as main
+from app.schema import RecordSchema, loads, dumps
+from bench_batch_predict import make_records
+
+
+def legacy_guard(payload):
+    # The checks /predict ran before the typed schema
+    if not isinstance(payload, dict):
+        raise ValueError("payload must be a JSON object (dict).")
+    if len(payload.keys()) > 200:
+        raise ValueError("payload has too many fields.")
+    for k, v in payload.items():
+        if isinstance(v, str) and len(v) > 5000:
+            raise ValueError(f"field '{k}' is too large.")
+
+
+def per_call_us(fn, items, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for item in items:
+            fn(item)
+        best = min(best, (time.perf_counter_ns() - start) / len(items))
+    return best / 1000.0
+
+
+async def drive(records, concurrency):
+    transport = httpx.ASGITransport(app=main.app)
+    sem = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(rec):
+            async with sem:
+                await client.post("/predict", json=rec)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(r) for r in records))
+        return time.perf_counter() - start
+
+
+def main_():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    records = make_records(n)
+    bodies = [json.dumps(r).encode() for r in records]
+    schema = RecordSchema(main.EXPECTED_COLS, main.NUMERIC_COLS)
+
+    legacy = per_call_us(lambda b: legacy_guard(json.loads(b)), bodies)
+    fast = per_call_us(lambda b: schema.coerce(loads(b)), bodies)
+    print(f"parse     json + guard     : {legacy:7.2f} us/request")
+    print(f"parse     orjson + schema  : {fast:7.2f} us/request  ({legacy / fast:.1f}x)")
+
+    result = {"prediction": 1, "meta": {"mode": "model", "model": "default", "version": "0123456789abcdef"}}
+    legacy = per_call_us(lambda r: json.dumps(jsonable_encoder(r)).encode(), [result] * n)
+    fast = per_call_us(dumps, [result] * n)
+    print(f"serialize jsonable_encoder : {legacy:7.2f} us/response")
+    print(f"serialize dumps            : {fast:7.2f} us/response  ({legacy / fast:.1f}x)")
+
+    cols = sorted(main.NUMERIC_COLS)
+    train = pd.DataFrame(records, columns=cols).astype(float)
+    model = XGBClassifier(n_estimators=50, max_depth=4, n_jobs=1).fit(
+        train, (train["Progress_Percentage"] > 50).astype(int))
+    main.registry.register("default", model)
+
+    asyncio.run(drive(records[:200], concurrency))  # warm-up
+    elapsed = asyncio.run(drive(records, concurrency))
+    print(f"end-to-end /predict        : {n / elapsed:7.1f} req/sec  (concurrency={concurrency})")
+
+
+if __name__ == "__main__":
+    main_()
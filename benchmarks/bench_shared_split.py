@@ -0,0 +1,100 @@
+"""
+End-to-end training time: per-experiment splits vs one shared split.
+
+Usage:
+    python benchmarks/bench_shared_split.py [n_rows]
+
+Defaults: 200,000 rows. Starting from the feature frame, both variants
+train the three MLEngineerPipeline models one after another in this
+process (all CPUs per model) and report the time of each step:
+
+- per-experiment : the old path. train_test_split on the DataFrame for
+                   the classification models, twice more for the reframing
+                   experiment, and every fit converts the frame itself
+                   (sklearn to float32, XGBoost to a QuantileDMatrix)
+- shared         : shared_split once (float32, contiguous), one
+                   QuantileDMatrix for both XGBoost models (src/experiments.py)
+
+Both produce identical predictions (checked at the end).
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import train_test_split
+from xgboost import XGBClassifier, XGBRegressor
+
+from benchmarks.synthetic_data import make_raw_frame
+from src.experiments import fit_xgboost, shared_split, train_matrix
+from src.pipeline_transformers import FeaturePipeline
+from src.preprocess import clean_data
+
+
+def make_models():
+    return (RandomForestClassifier(n_estimators=100, max_depth=10, random_state=42, n_jobs=-1),
+            XGBClassifier(n_estimators=100, learning_rate=0.1, max_depth=6, eval_metric="logloss", random_state=42),
+            XGBRegressor(n_estimators=100, max_depth=6, learning_rate=0.1, random_state=42))
+
+
+class Timer:
+    def __init__(self):
+        self.steps = {}
+
+    def __call__(self, step, fn, *args, **kwargs):
+        start = time.perf_counter()
+        out = fn(*args, **kwargs)
+        self.steps[step] = self.steps.get(step, 0.0) + time.perf_counter() - start
+        return out
+
+
+def per_experiment(final):
+    t, (rf, clf, reg) = Timer(), make_models()
+    target, progress = final['target'], final['Progress_Percentage']
+    X = final.drop(columns=['target', 'Progress_Percentage'])
+
+    X_train, X_test, y_train, y_test = t('split', train_test_split, X, target, test_size=0.2, random_state=42)
+    t('RandomForest', rf.fit, X_train, y_train)
+    t('XGBoost', clf.fit, X_train, y_train)
+
+    X_train, X_test, r_train, r_test = t('split', train_test_split, X, progress, test_size=0.2, random_state=42)
+    t('split', train_test_split, X, target, test_size=0.2, random_state=42)
+    t('XGBoost regressor', reg.fit, X_train, r_train)
+    return t.steps, (rf, clf, reg), X_test
+
+
+def shared(final):
+    t, (rf, clf, reg) = Timer(), make_models()
+    X = final.drop(columns=['target', 'Progress_Percentage'])
+
+    data = t('split', shared_split, X, final['target'], final['Progress_Percentage'])
+    t('RandomForest', rf.fit, data['X_train'], data['y_train'])
+    dtrain = t('QuantileDMatrix', train_matrix, 'bench', data, 256)
+    t('XGBoost', fit_xgboost, clf, dtrain, data['y_train'])
+    t('XGBoost regressor', fit_xgboost, reg, dtrain, data['progress_train'])
+    return t.steps, (rf, clf, reg), data['X_test']
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    final = FeaturePipeline(n_features=50).fit_transform(clean_data(make_raw_frame(n_rows, seed=0)))
+
+    old, old_models, old_test = per_experiment(final)
+    new, new_models, new_test = shared(final)
+
+    print(f"\n{n_rows} rows, {os.cpu_count()} cores\n")
+    print(f"{'step':<20} {'per-experiment [s]':>19} {'shared [s]':>11}")
+    for step in ('split', 'QuantileDMatrix', 'RandomForest', 'XGBoost', 'XGBoost regressor'):
+        print(f"{step:<20} {old.get(step, 0.0):>19.2f} {new.get(step, 0.0):>11.2f}")
+    print(f"{'total':<20} {sum(old.values()):>19.2f} {sum(new.values()):>11.2f}")
+
+    for a, b in zip(old_models, new_models):
+        np.testing.assert_allclose(a.predict(old_test), b.predict(new_test), rtol=1e-6)
+    print("\npredictions identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Dense vs sparse hashing trick: memory of the training matrix and XGBoost fit time.
+
+Usage:
+    python benchmarks/bench_sparse_hashing.py [n_rows] [n_features] [n_trees]
+
+Defaults: 500,000 rows, 50 buckets per column, 50 trees. Student_ID,
+Course_ID and City are hashed. Compares:
+
+- hashing   : old list-of-lists FeatureHasher(...).toarray() for Student_ID
+              vs hashing_matrix for all three columns
+- dense     : FeaturePipeline.transform -> DataFrame with 150 dense hashed columns
+- sparse    : FeaturePipeline.transform_sparse + sparse_design_matrix (CSR)
+
+Matrix memory is the DataFrame's memory_usage / the CSR data+indices+indptr.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sklearn.feature_extraction import FeatureHasher
+from xgboost import XGBClassifier
+
+from benchmarks.synthetic_data import make_raw_frame
+from src.features import hashing_matrix, sparse_design_matrix
+from src.pipeline_transformers import FeaturePipeline
+from src.preprocess import clean_data
+
+MB = 1024 * 1024
+HASH_COLS = ['Student_ID', 'Course_ID', 'City']
+DROP = ['target', 'Progress_Percentage']
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - start
+
+
+def csr_mb(X):
+    return (X.data.nbytes + X.indices.nbytes + X.indptr.nbytes) / MB
+
+
+def fit_seconds(X, y, n_trees):
+    model = XGBClassifier(n_estimators=n_trees, max_depth=6, tree_method="hist", n_jobs=os.cpu_count())
+    _, seconds = timed(lambda: model.fit(X, y))
+    return seconds, model
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    n_features = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    n_trees = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+
+    print(f"Generating {n_rows} rows...")
+    clean = clean_data(make_raw_frame(n_rows, seed=0))
+    y = clean['target']
+
+    _, t_old = timed(lambda: FeatureHasher(n_features=n_features, input_type='string')
+                     .transform([[str(x)] for x in clean['Student_ID']]).toarray())
+    _, t_new = timed(lambda: hashing_matrix(clean, HASH_COLS, n_features))
+    print(f"\nhashing: FeatureHasher list-of-lists (1 column, dense) {t_old:.2f} s, "
+          f"hashing_matrix ({len(HASH_COLS)} columns, CSR) {t_new:.2f} s")
+
+    pipeline = FeaturePipeline(hash_col=HASH_COLS, n_features=n_features).fit(clean)
+    dense, t_dense = timed(lambda: pipeline.transform(clean).drop(columns=DROP))
+    pipeline.sparse_hashing = True
+    (frame, hashed), t_sparse = timed(lambda: pipeline.transform_sparse(clean))
+    X_sparse, t_stack = timed(lambda: sparse_design_matrix(frame.drop(columns=DROP), hashed))
+
+    fit_dense, _ = fit_seconds(dense, y, n_trees)
+    fit_sparse, _ = fit_seconds(X_sparse, y, n_trees)
+
+    print(f"\n{'mode':<8} {'columns':>8} {'transform [s]':>14} {'matrix MB':>10} {'fit [s]':>8}")
+    print(f"{'dense':<8} {dense.shape[1]:>8} {t_dense:>14.2f} "
+          f"{dense.memory_usage(deep=True).sum() / MB:>10.0f} {fit_dense:>8.2f}")
+    print(f"{'sparse':<8} {X_sparse.shape[1]:>8} {t_sparse + t_stack:>14.2f} "
+          f"{csr_mb(X_sparse):>10.0f} {fit_sparse:>8.2f}")
+    print(f"\nsparse hashed block alone: {csr_mb(hashed):.0f} MB "
+          f"(dense float64: {n_rows * hashed.shape[1] * 8 / MB:.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Peak memory of the ingest -> validate -> clean stages, in memory vs streamed.
+
+Usage:
+    python benchmarks/bench_streaming_ingest.py [n_rows] [chunksize]
+
+Writes a synthetic raw CSV (default 1,000,000 rows) to a temp dir and runs
+each mode in a fresh subprocess, reporting wall time and peak RSS
+(ru_maxrss of the child):
+
+- in-memory : load_data + validate_input_data + clean_data + write_frame
+- streamed  : iter_data + StreamingValidator + clean_data per chunk,
+              written as a partitioned dataset (INGEST_CHUNKSIZE mode of the DAG)
+
+Linux only (ru_maxrss in KiB).
+"""
+import os
+import sys
+import json
+import time
+import tempfile
+import resource
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+MB = 1024
+
+
+def run_mode(mode, csv_path, out_dir, chunksize):
+    from src.ingest import load_data, iter_data, stream_to_dataset
+    from src.preprocess import clean_data
+    from src.storage import write_frame
+    from src.validate import StreamingValidator, validate_input_data
+
+    start = time.perf_counter()
+    if mode == 'in-memory':
+        df = clean_data(validate_input_data(load_data(csv_path)))
+        write_frame(df, os.path.join(out_dir, 'in_memory.parquet'))
+        n_rows = len(df)
+    else:
+        n_rows = stream_to_dataset(iter_data(csv_path, chunksize), os.path.join(out_dir, 'streamed'),
+                                   steps=[clean_data], validator=StreamingValidator())
+    seconds = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"rows": n_rows, "seconds": seconds, "peak_mb": peak / MB}
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    chunksize = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+
+    from benchmarks.synthetic_data import make_raw_frame
+
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_path = os.path.join(workdir, 'raw.csv')
+        make_raw_frame(n_rows, seed=0).to_csv(csv_path, index=False)
+        size_mb = os.path.getsize(csv_path) / (MB * MB)
+        print(f"raw csv: {n_rows} rows, {size_mb:.0f} MB, chunksize {chunksize}\n")
+
+        print(f"{'mode':<10} {'rows':>10} {'time [s]':>9} {'peak RSS [MB]':>14}")
+        for mode in ('in-memory', 'streamed'):
+            out = subprocess.run(
+                [sys.executable, __file__, '--child', mode, csv_path, workdir, str(chunksize)],
+                check=True, capture_output=True, text=True, cwd=ROOT,
+            ).stdout.strip().splitlines()[-1]
+            r = json.loads(out)
+            print(f"{mode:<10} {r['rows']:>10} {r['seconds']:>9.2f} {r['peak_mb']:>14.0f}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        _, _, mode, csv_path, out_dir, chunksize = sys.argv
+        print(json.dumps(run_mode(mode, csv_path, out_dir, int(chunksize))))
+    else:
+        main()
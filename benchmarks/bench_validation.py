@@ -0,0 +1,74 @@
+"""
+Column-wise rule evaluation (src/validation.py) vs a per-record loop.
+
+Usage:
+    python benchmarks/bench_validation.py [n_rows] [chunksize]
+
+Defaults: 1,000,000 rows, 100,000-row chunks. On the raw synthetic frame
+with DEFAULT_RULES:
+
+- per-record : to_dict('records') + RuleSet.check_record per row (timed on
+               a 20,000-row sample and scaled to n_rows)
+- frame      : RuleSet.validate_frame on the whole frame
+- chunked    : RuleSet.validate_frame per chunk, counts summed (as
+               StreamingValidator does)
+
+Both paths use the same rules; the counts of the sample are compared.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.synthetic_data import make_raw_frame
+from src.validation import DEFAULT_RULES, RuleSet
+
+SAMPLE = 20_000
+
+
+def per_record(rules, df):
+    return sum(bool(rules.check_record(record)) for record in df.to_dict('records'))
+
+
+def chunked(rules, df, chunksize):
+    counts = None
+    for start in range(0, len(df), chunksize):
+        chunk_counts = rules.validate_frame(df.iloc[start:start + chunksize]).counts
+        counts = chunk_counts if counts is None else counts + chunk_counts
+    return counts
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - start
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    chunksize = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    df = make_raw_frame(n_rows)
+    rules = RuleSet(DEFAULT_RULES)
+
+    sample = df.head(SAMPLE)
+    invalid_records, t_sample = timed(per_record, rules, sample)
+    sample_report = rules.validate_frame(sample)
+    # the duplicate rule has no record path
+    dup = [r.name for r in rules.rules if r.name.endswith(':duplicate')]
+    assert invalid_records == int(sample_report.masks.drop(columns=dup).to_numpy().any(axis=1).sum())
+    t_records = t_sample * n_rows / len(sample)
+
+    report, t_frame = timed(rules.validate_frame, df)
+    _, t_chunked = timed(chunked, rules, df, chunksize)
+
+    print(f"\n{n_rows} rows, {len(rules.rules)} rules, {report.n_invalid} invalid rows\n")
+    print(f"{'':<11} {'time [s]':>9} {'rows/s':>12}")
+    print(f"{'per-record':<11} {t_records:>9.2f} {n_rows / t_records:>12,.0f}  (scaled from {len(sample)} rows)")
+    print(f"{'frame':<11} {t_frame:>9.2f} {n_rows / t_frame:>12,.0f}")
+    print(f"{'chunked':<11} {t_chunked:>9.2f} {n_rows / t_chunked:>12,.0f}")
+    print(f"\nspeedup (frame vs per-record): {t_records / t_frame:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
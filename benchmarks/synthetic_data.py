@@ -0,0 +1,102 @@
+"""
+Synthetic data in the raw Course_Completion_Prediction.csv schema.
+
+Used by the benchmarks (and a few tests) so they run without the real
+dataset. Values are random but the column names, dtypes and formats
+(e.g. dd-mm-yyyy Enrollment_Date, 'Completed' / 'Not Completed' target)
+match the raw export.
+"""
+import numpy as np
+import pandas as pd
+
+CATEGORICAL_VALUES = {
+    "Gender": ["Male", "Female", "Other"],
+    "Education_Level": ["High School", "Diploma", "Bachelor", "Master", "PhD"],
+    "Employment_Status": ["Student", "Employed", "Unemployed", "Self-Employed"],
+    "City": ["Delhi", "Mumbai", "Chennai", "Kolkata", "Pune", "Jaipur", "Lucknow", "Hyderabad"],
+    "Device_Type": ["Laptop", "Mobile", "Tablet", "Desktop"],
+    "Internet_Connection_Quality": ["Low", "Medium", "High"],
+    "Category": ["Programming", "Design", "Marketing", "Business", "Data Science"],
+    "Course_Level": ["Beginner", "Intermediate", "Advanced"],
+    "Payment_Mode": ["UPI", "Card", "NetBanking", "Wallet", "Free"],
+    "Fee_Paid": ["Yes", "No"],
+    "Discount_Used": ["Yes", "No"],
+}
+
+NUMERIC_RANGES = {
+    "Age": (16, 60),
+    "Course_Duration_Days": (7, 120),
+    "Instructor_Rating": (1.0, 5.0),
+    "Login_Frequency": (0, 30),
+    "Average_Session_Duration_Min": (5, 180),
+    "Video_Completion_Rate": (0, 100),
+    "Discussion_Participation": (0, 20),
+    "Time_Spent_Hours": (0, 200),
+    "Days_Since_Last_Login": (0, 60),
+    "Notifications_Checked": (0, 50),
+    "Peer_Interaction_Score": (0, 10),
+    "Assignments_Submitted": (0, 20),
+    "Assignments_Missed": (0, 10),
+    "Quiz_Attempts": (0, 10),
+    "Quiz_Score_Avg": (0, 100),
+    "Project_Grade": (0, 100),
+    "Progress_Percentage": (0, 100),
+    "Rewatch_Count": (0, 10),
+    "Payment_Amount": (0, 5000),
+    "App_Usage_Percentage": (0, 100),
+    "Reminder_Emails_Clicked": (0, 10),
+    "Support_Tickets_Raised": (0, 5),
+    "Satisfaction_Rating": (1.0, 5.0),
+}
+
+INT_COLS = {
+    "Age", "Course_Duration_Days", "Login_Frequency", "Discussion_Participation",
+    "Days_Since_Last_Login", "Notifications_Checked", "Assignments_Submitted",
+    "Assignments_Missed", "Quiz_Attempts", "Rewatch_Count", "Reminder_Emails_Clicked",
+    "Support_Tickets_Raised",
+}
+
+COURSES = {
+    "Programming": ["Python Basics", "Web Development", "Java Fundamentals"],
+    "Design": ["UI/UX Design", "Graphic Design"],
+    "Marketing": ["Digital Marketing", "SEO Mastery"],
+    "Business": ["Project Management", "Entrepreneurship"],
+    "Data Science": ["Machine Learning", "Data Analysis with Python"],
+}
+
+
+def make_raw_frame(n_rows: int, seed: int = 42, n_students: int = None) -> pd.DataFrame:
+    """
+    Returns n_rows of raw course-enrollment data (Completed column included).
+    """
+    rng = np.random.default_rng(seed)
+    n_students = n_students or max(1, n_rows // 2)
+
+    df = pd.DataFrame({
+        "Student_ID": np.char.add("STU", rng.integers(0, n_students, n_rows).astype(str)),
+        "Name": np.char.add("Student ", rng.integers(0, n_students, n_rows).astype(str)),
+    })
+    for col, values in CATEGORICAL_VALUES.items():
+        df[col] = rng.choice(values, n_rows)
+
+    course_names = np.empty(n_rows, dtype=object)
+    for cat, names in COURSES.items():
+        mask = (df["Category"] == cat).to_numpy()
+        course_names[mask] = rng.choice(names, mask.sum())
+    df["Course_Name"] = course_names
+    df["Course_ID"] = np.char.add("C", rng.integers(100, 140, n_rows).astype(str))
+
+    for col, (low, high) in NUMERIC_RANGES.items():
+        if col in INT_COLS:
+            df[col] = rng.integers(low, high + 1, n_rows)
+        else:
+            df[col] = np.round(rng.uniform(low, high, n_rows), 1)
+
+    days = rng.integers(0, 730, n_rows)
+    dates = pd.Timestamp("2023-01-01") + pd.to_timedelta(days, unit="D")
+    df["Enrollment_Date"] = dates.strftime("%d-%m-%Y")
+
+    # Completion loosely follows progress and quiz score (~40% positive)
+    score = df["Progress_Percentage"] * 0.7 + df["Quiz_Score_Avg"] * 0.3 + rng.normal(0, 15, n_rows)
+    df["Completed"] = np.where(score > 60, "Completed", "Not Completed")
+    return df
@@ -0,0 +1,20 @@
+# Multi-worker serving with a shared, preloaded model.
+#
+#   gunicorn -c gunicorn.conf.py app.main:app
+#
+# preload_app imports app.main (and loads the model) once in the master
+# process; workers are then forked and share the model's memory pages
+# copy-on-write instead of each unpickling their own copy.
+import gc
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+
+def when_ready(server):
+    # Move everything loaded so far out of the GC's reach: collections would
+    # otherwise touch object headers in the workers and un-share the pages.
+    gc.freeze()
@@ -0,0 +1,132 @@
+"""
+Profile of the training data (data_profile.json next to model.pkl).
+
+Written by src/train_model.py after every full retrain, from one pass
+over each column of the cleaned frame (numeric columns: one sort):
+
+- numeric columns: null rate, min/max, mean/std and a decile sketch
+  (edges + share of present values per bin)
+- categorical/text columns: null rate, number of distinct values and the
+  frequency table of the TOP_CATEGORIES most common values
+- probability: the same numeric summary of the published model's
+  probabilities on the test split
+
+Consumers load it once (load_profile caches it until the file changes):
+the drift monitor uses the numeric summaries as its baseline
+(drift_baseline), src/validation.py turns the complete category tables
+into allowed-value rules (rules_from_profile).
+"""
+import os
+import json
+
+import numpy as np
+import pandas as pd
+
+from src.model_io import CHECKPOINT_DIR, atomic_path
+
+PROFILE_FILE = 'data_profile.json'
+# Default profile of every reader (validation, drift monitoring, API):
+# the one src/train_model.py writes next to the models
+PROFILE_PATH = os.getenv('DATA_PROFILE_FILE', os.path.join(CHECKPOINT_DIR, PROFILE_FILE))
+PROFILE_BINS = 10
+TOP_CATEGORIES = 50
+PREDICTION = 'probability'
+
+
+def _numeric_summary(values, bins):
+    """
+    Null rate, range, mean/std and decile sketch of one column. A single
+    sort of the present values gives the range, the deciles (linear
+    interpolation, as np.quantile) and the bin counts (searchsorted).
+    """
+    values = np.asarray(values, dtype=float)
+    present = values[~np.isnan(values)]
+    n = len(present)
+    if not n:
+        return {'kind': 'number', 'count': 0, 'null_rate': 1.0}
+    ordered = np.sort(present)
+    pos = np.linspace(0, 1, bins + 1)[1:-1] * (n - 1)
+    lo = np.floor(pos).astype(int)
+    hi = np.minimum(lo + 1, n - 1)
+    edges = np.unique(ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo))
+    counts = np.diff(np.searchsorted(ordered, edges, side='right'), prepend=0, append=n)
+    return {
+        'kind': 'number', 'count': int(n), 'null_rate': float(1 - n / len(values)),
+        'min': float(ordered[0]), 'max': float(ordered[-1]), 'mean': float(present.mean()),
+        'std': float(present.std(ddof=1)) if n > 1 else 0.0,
+        'edges': edges.tolist(), 'shares': (counts / n).tolist(),
+    }
+
+
+def _category_summary(series, top_k):
+    counts = series.value_counts(dropna=True)
+    n = len(series)
+    present = int(counts.sum())
+    top = counts.iloc[:top_k]
+    return {
+        'kind': 'category', 'count': present, 'null_rate': float(1 - present / n) if n else 0.0,
+        'distinct': int(len(counts)),
+        'frequencies': {str(k): float(v / present) for k, v in top.items()} if present else {},
+        'other': float(1 - top.sum() / present) if present else 0.0,
+    }
+
+
+def build_profile(df, probabilities=None, exclude=('target', 'Completed'), bins=PROFILE_BINS,
+                  top_k=TOP_CATEGORIES):
+    """
+    Profile of df (see module docstring). Datetime columns are skipped.
+    """
+    profile = {'rows': int(len(df)), 'columns': {}}
+    for col in df.columns:
+        series = df[col]
+        if col in exclude or pd.api.types.is_datetime64_any_dtype(series):
+            continue
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            profile['columns'][col] = _numeric_summary(series.to_numpy(dtype=float, na_value=np.nan), bins)
+        else:
+            profile['columns'][col] = _category_summary(series, top_k)
+    if probabilities is not None:
+        profile[PREDICTION] = _numeric_summary(probabilities, bins)
+    return profile
+
+
+def save_profile(profile, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with atomic_path(path) as tmp:
+        with open(tmp, 'w') as f:
+            json.dump(profile, f, indent=1)
+
+
+# path -> ((mtime_ns, size), profile)
+_loaded = {}
+
+
+def load_profile(path):
+    """
+    The profile at path (None if missing). Read once, again only after the
+    file changed (a retrain replaced it).
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        _loaded.pop(path, None)
+        return None
+    sig = (st.st_mtime_ns, st.st_size)
+    cached = _loaded.get(path)
+    if cached is None or cached[0] != sig:
+        with open(path) as f:
+            cached = _loaded[path] = (sig, json.load(f))
+    return cached[1]
+
+
+def drift_baseline(profile):
+    """
+    Drift monitor baseline ({feature: count/mean/std/edges/shares}) from a
+    profile: its numeric columns and the probability.
+    """
+    refs = dict(profile.get('columns', {}))
+    if PREDICTION in profile:
+        refs[PREDICTION] = profile[PREDICTION]
+    return {name: {k: ref[k] for k in ('count', 'mean', 'std', 'edges', 'shares')}
+            for name, ref in refs.items() if ref.get('kind') == 'number' and ref.get('count')}
+
@@ -0,0 +1,312 @@
+"""
+Experiment scheduler for MLEngineerPipeline.
+
+Candidate models are independent, so they train concurrently in a process
+pool instead of one after another.
+
+Core budget
+-----------
+RandomForest (`n_jobs`, joblib) and XGBoost (`n_jobs`, OpenMP) are
+multi-threaded themselves. With P jobs running at once, each gets
+`cores // P` threads (`core_budget`) so the pool never runs more busy
+threads than there are cores.
+
+Data hand-off
+-------------
+All experiments share one train/test split (`shared_split`): the row
+positions come from a single train_test_split and the feature matrix is
+converted once to contiguous float32 (or CSR), the dtype both
+RandomForest and XGBoost train on, so neither copies it again. The split
+is written once with joblib next to the checkpoints and opened by the
+workers with mmap_mode='r': the numeric arrays are shared page cache, not
+one pickled copy per job.
+
+XGBoost models train on a QuantileDMatrix built once per process from
+that split (`train_matrix`) and reused by every XGBoost job the process
+runs (classifier and reframed regressor); only label and weights change.
+
+Checkpoints
+-----------
+A finished run leaves `<checkpoint_dir>/runs/<name>.json` with its
+result and a fingerprint of the data, the balance strategy and the model
+parameters. A rerun (e.g. an Airflow retry after one model failed) skips
+every job whose checkpoint and model file still match, and trains only
+the rest.
+
+Workers only fit, score and save the model; MLflow logging stays in the
+parent (see MLEngineerPipeline.run_experiments), and a job is checkpointed
+after it was logged.
+"""
+import os
+import json
+import time
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import joblib
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from scipy import sparse
+from sklearn.metrics import accuracy_score, f1_score, mean_squared_error
+from sklearn.model_selection import train_test_split
+from xgboost import XGBClassifier, XGBRegressor
+
+from src.model_io import atomic_dump, atomic_path, export_native
+
+RUNS_DIR = 'runs'
+# QuantileDMatrix of the training split this process works on: (key, matrix)
+_TRAIN_MATRIX = {}
+
+
+def core_budget(n_parallel, cores=None):
+    """
+    Threads per job when n_parallel jobs share `cores` (default: all CPUs).
+    """
+    cores = cores or os.cpu_count() or 1
+    return max(1, cores // max(1, n_parallel))
+
+
+def shared_split(X, y, progress=None, names=None, test_size=0.2, random_state=42):
+    """
+    The train/test split every experiment trains on. X is a DataFrame
+    (-> contiguous float32) or a CSR matrix with its column `names`; y and
+    the optional progress target are split by the same row positions, which
+    are those train_test_split(X, y, ...) picks for the frame itself.
+    """
+    if isinstance(X, pd.DataFrame):
+        names = list(X.columns) if names is None else names
+        X = np.ascontiguousarray(X.to_numpy(dtype=np.float32))
+    else:
+        X = sparse.csr_matrix(X, dtype=np.float32)
+    train_idx, test_idx = train_test_split(np.arange(X.shape[0]), test_size=test_size, random_state=random_state)
+    y = np.asarray(y)
+    data = {'X_train': X[train_idx], 'X_test': X[test_idx], 'names': list(names),
+            'y_train': y[train_idx], 'y_test': y[test_idx], 'fit_kwargs': {}}
+    if progress is not None:
+        progress = np.asarray(progress, dtype=np.float32)
+        data['progress_train'], data['progress_test'] = progress[train_idx], progress[test_idx]
+    return data
+
+
+def is_xgboost(model):
+    return isinstance(model, (XGBClassifier, XGBRegressor))
+
+
+def model_input(model, X):
+    """
+    sklearn trees don't accept NaN in sparse input: there missing -> 0,
+    like the unset hashed buckets. XGBoost takes the CSR matrix as is.
+    """
+    if not sparse.issparse(X) or is_xgboost(model):
+        return X
+    X = X.copy()
+    X.data = np.nan_to_num(X.data, nan=0.0)
+    return X
+
+
+def train_matrix(key, data, max_bin):
+    """
+    QuantileDMatrix of data['X_train'], built once per process and split:
+    the quantile sketch and the binned copy are the expensive part of the
+    conversion. The sketch is weighted, so the split's sample weights go in
+    here; only the label differs between the jobs that share it.
+    """
+    if key not in _TRAIN_MATRIX:
+        _TRAIN_MATRIX.clear()
+        _TRAIN_MATRIX[key] = xgb.QuantileDMatrix(data['X_train'], feature_names=data['names'], max_bin=max_bin,
+                                                 weight=data['fit_kwargs'].get('sample_weight'))
+    return _TRAIN_MATRIX[key]
+
+
+def fit_xgboost(model, dtrain, y):
+    """
+    Same model as model.fit(X, y, sample_weight=<dtrain weights>), trained
+    on a prebuilt DMatrix and loaded back into the sklearn wrapper.
+    """
+    params = {k: v for k, v in model.get_xgb_params().items() if v is not None}
+    if isinstance(model, XGBClassifier) and len(np.unique(y)) > 2:
+        params.update(objective='multi:softprob', num_class=len(np.unique(y)))
+    dtrain.set_label(y)
+    booster = xgb.train(params, dtrain, num_boost_round=model.get_num_boosting_rounds())
+    model.load_model(bytearray(booster.save_raw('ubj')))
+    return model
+
+
+def set_feature_names(model, names):
+    # Array input has no column names; the API needs them to line up its features
+    # (XGBoost models get them from the DMatrix)
+    if not is_xgboost(model):
+        model.feature_names_in_ = np.asarray(names, dtype=object)
+
+
+def fingerprint(*parts):
+    """
+    Stable digest of DataFrames/Series, numpy and scipy.sparse arrays and
+    plain values (params, strategy names).
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, (pd.DataFrame, pd.Series)):
+            h.update(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes())
+            labels = part.columns if isinstance(part, pd.DataFrame) else [part.name]
+            h.update(repr(list(labels)).encode())
+        elif hasattr(part, 'indptr'):
+            for arr in (part.data, part.indices, part.indptr):
+                h.update(np.ascontiguousarray(arr).tobytes())
+        elif isinstance(part, np.ndarray):
+            h.update(np.ascontiguousarray(part).tobytes())
+        else:
+            h.update(repr(part).encode())
+    return h.hexdigest()
+
+
+def model_params(model):
+    # n_jobs is a scheduling detail, not part of what the model learns
+    return sorted((k, repr(v)) for k, v in model.get_params().items() if k != 'n_jobs')
+
+
+def save_split(data, path):
+    """
+    Writes a training split for the workers to memory-map.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with atomic_path(path) as tmp:
+        joblib.dump(data, tmp)
+    return path
+
+
+def score_model(name, task, model, X, y, progress=None):
+    """
+    Result row for get_results_table. y are the 0/1 labels; the reframing
+    task also needs the progress target (RMSE).
+    """
+    preds = model.predict(X)
+    if task == 'reframing':
+        # Convert Regression output to Classification (Threshold: 50%)
+        preds_class = (np.asarray(preds) >= 50.0).astype(int)
+        return {
+            "Model": name,
+            "Task": "Reframing (Reg->Clf)",
+            "Accuracy": float(accuracy_score(y, preds_class)),
+            "F1": None,
+            "RMSE": float(np.sqrt(mean_squared_error(progress, preds))),
+        }
+    return {
+        "Model": name,
+        "Task": "Classification",
+        "Accuracy": float(accuracy_score(y, preds)),
+        "F1": float(f1_score(y, preds)),
+        "RMSE": None,
+    }
+
+
+def run_job(job, threads=None):
+    """
+    Fits, scores and saves one model. Runs in a pool worker (or inline).
+
+    job: name, task ('classification' | 'reframing'), model, data_path,
+         out_dir. The data file is a `shared_split` plus fit_kwargs;
+         reframing trains on progress_train and scores against both targets.
+    Returns the result row for get_results_table plus 'seconds'.
+    """
+    data = joblib.load(job['data_path'], mmap_mode='r')
+    model = job['model']
+    if threads:
+        model.set_params(n_jobs=threads)
+    y_train = data['progress_train'] if job['task'] == 'reframing' else data['y_train']
+
+    start = time.perf_counter()
+    if is_xgboost(model):
+        dtrain = train_matrix(job['data_path'], data, model.get_params()['max_bin'] or 256)
+        fit_xgboost(model, dtrain, y_train)
+    else:
+        model.fit(model_input(model, data['X_train']), y_train, **data['fit_kwargs'])
+    result = score_model(job['name'], job['task'], model, model_input(model, data['X_test']), data['y_test'],
+                         data.get('progress_test'))
+    set_feature_names(model, data['names'])
+
+    # Save model locally
+    atomic_dump(model, os.path.join(job['out_dir'], f"{job['name']}.pkl"))
+    export_native(model, os.path.join(job['out_dir'], f"{job['name']}.ubj"))
+    return {"result": result, "seconds": time.perf_counter() - start}
+
+
+class ExperimentScheduler:
+    """
+    Runs experiment jobs concurrently with a per-job core budget and
+    skips jobs that already finished in an earlier attempt.
+
+    on_done(job, outcome) is called in the parent for every newly finished
+    job (MLflow logging) before its checkpoint is written.
+    """
+
+    def __init__(self, checkpoint_dir, max_parallel=None, cores=None):
+        self.checkpoint_dir = checkpoint_dir
+        self.runs_dir = os.path.join(checkpoint_dir, RUNS_DIR)
+        self.max_parallel = max_parallel
+        self.cores = cores or os.cpu_count() or 1
+
+    def _checkpoint_path(self, name):
+        return os.path.join(self.runs_dir, f"{name}.json")
+
+    def completed(self, job):
+        """
+        The checkpointed outcome of `job` if it is still valid, else None.
+        """
+        path = self._checkpoint_path(job['name'])
+        if not os.path.exists(path) or not os.path.exists(os.path.join(job['out_dir'], f"{job['name']}.pkl")):
+            return None
+        try:
+            with open(path) as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return saved if saved.get('fingerprint') == job['fingerprint'] else None
+
+    def _checkpoint(self, job, outcome):
+        os.makedirs(self.runs_dir, exist_ok=True)
+        with atomic_path(self._checkpoint_path(job['name'])) as tmp:
+            with open(tmp, 'w') as f:
+                json.dump({**outcome, 'fingerprint': job['fingerprint']}, f, indent=2)
+
+    def run(self, jobs, on_done=None):
+        """
+        Returns the outcomes ({'result', 'seconds', 'skipped'}) in job order.
+        """
+        outcomes = {}
+        pending = []
+        for job in jobs:
+            saved = self.completed(job)
+            if saved is not None:
+                print(f"⏭️  {job['name']}: finished in an earlier run, skipped")
+                outcomes[job['name']] = {'result': saved['result'], 'seconds': saved['seconds'], 'skipped': True}
+            else:
+                pending.append(job)
+
+        n_parallel = min(len(pending), self.max_parallel or len(pending) or 1, self.cores)
+        threads = core_budget(n_parallel, self.cores)
+
+        def finish(job, outcome):
+            outcome['skipped'] = False
+            if on_done is not None:
+                on_done(job, outcome)
+            self._checkpoint(job, outcome)
+            outcomes[job['name']] = outcome
+            print(f"  {job['name']} -> Accuracy: {outcome['result']['Accuracy']:.4f} ({outcome['seconds']:.1f}s)")
+
+        if n_parallel <= 1:
+            for job in pending:
+                print(f"Training {job['name']} ({threads} threads)...")
+                finish(job, run_job(job, threads))
+        elif pending:
+            print(f"Training {len(pending)} models, {n_parallel} at a time, {threads} threads each...")
+            # spawn: forking a process whose OpenMP runtime is already in use can deadlock
+            with ProcessPoolExecutor(max_workers=n_parallel, mp_context=multiprocessing.get_context('spawn')) as pool:
+                futures = {pool.submit(run_job, job, threads): job for job in pending}
+                for future in as_completed(futures):
+                    finish(futures[future], future.result())
+        _TRAIN_MATRIX.clear()
+
+        return [outcomes[job['name']] for job in jobs]
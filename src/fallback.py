@@ -1,7 +1,23 @@
+import numpy as np
+
+PROGRESS = "Progress_Percentage"
+QUIZ_SCORE = "Quiz_Score_Avg"
+
+
+def _missing(value):
+    # None and NaN count as missing, like an absent key
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def _value(data, key):
+    value = data.get(key)
+    return 0 if _missing(value) else value
+
+
 class HeuristicModel:
     def predict(self, data):
-        # Handle missing data
-        if not data:
+        # Handle missing data (no field with a value)
+        if not data or all(_missing(v) for v in data.values()):
             return {
                 "prediction": 0,
                 "probability": 0.0,
@@ -9,8 +25,8 @@ class HeuristicModel:
             }
             
         # Extract key features with defaults
-        progress = data.get("Progress_Percentage", 0)
-        quiz_score = data.get("Quiz_Score_Avg", 0)
+        progress = _value(data, PROGRESS)
+        quiz_score = _value(data, QUIZ_SCORE)
         
         # Case 1: High engagement -> likely to complete
         if progress >= 90 and quiz_score >= 70:
@@ -34,3 +50,37 @@ class HeuristicModel:
             "probability": probability,
             "status": "success"
         }
+
+    def predict_batch(self, progress, quiz_score, empty=None):
+        """
+        predict() over arrays (or Series) of Progress_Percentage and
+        Quiz_Score_Avg: np.where instead of a loop per row. NaN is a missing
+        value (0); rows flagged in `empty` are records without any value.
+        Returns (predictions, probabilities).
+        """
+        progress = np.asarray(progress, dtype=float)
+        quiz_score = np.asarray(quiz_score, dtype=float)
+        progress = np.where(np.isnan(progress), 0.0, progress)
+        quiz_score = np.where(np.isnan(quiz_score), 0.0, quiz_score)
+        high = (progress >= 90) & (quiz_score >= 70)
+        low = ~high & (progress <= 30)
+        score = (progress * 0.7 + quiz_score * 0.3) / 100
+        probability = np.where(high, 0.95, np.where(low, 0.1, score))
+        prediction = np.where(high, 1, np.where(low, 0, probability >= 0.5)).astype(np.int64)
+        if empty is not None:
+            empty = np.asarray(empty, dtype=bool)
+            probability = np.where(empty, 0.0, probability)
+            prediction[empty] = 0
+        return prediction, probability
+
+    def predict_records(self, records):
+        """
+        predict_batch for a list of dicts with numeric values (e.g. records
+        after schema coercion), with the same missing-value rules as predict().
+        """
+        # float arrays turn None into NaN, i.e. missing
+        progress = np.array([r.get(PROGRESS) for r in records], dtype=float)
+        quiz_score = np.array([r.get(QUIZ_SCORE) for r in records], dtype=float)
+        empty = np.fromiter((all(_missing(v) for v in r.values()) for r in records), dtype=bool,
+                            count=len(records))
+        return self.predict_batch(progress, quiz_score, empty=empty)
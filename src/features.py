@@ -1,5 +1,8 @@
+import numpy as np
 import pandas as pd
+from scipy import sparse
 from sklearn.feature_extraction import FeatureHasher
+from sklearn.utils import murmurhash3_32
 
 def apply_feature_cross(df):
     """
@@ -8,25 +11,87 @@ def apply_feature_cross(df):
     """
     print("Applying Feature Cross...")
     # Example: 'Programming' + 'Beginner' -> 'Programming_Beginner'
-    df['Category_Level_Cross'] = df['Category'] + '_' + df['Course_Level']
+    # astype(object): the inputs may be categoricals (see clean_data)
+    df['Category_Level_Cross'] = df['Category'].astype(object) + '_' + df['Course_Level'].astype(object)
     return df
 
+def hash_bucket(value, n_features):
+    """
+    (bucket index, sign) for one string, identical to
+    FeatureHasher(n_features, input_type='string') with alternate_sign=True.
+    """
+    h = murmurhash3_32(str(value), seed=0, positive=False)
+    index = (2147483647 if h == -2147483648 else abs(h)) % n_features
+    return index, (1.0 if h >= 0 else -1.0)
+
+def hash_buckets(values, n_features):
+    """
+    hash_bucket for a whole column: (bucket, sign) arrays, one entry per
+    row. The distinct values are hashed in one FeatureHasher call; its CSR
+    output has exactly one entry per value (column = bucket, data = sign).
+    """
+    codes, uniques = pd.factorize(pd.Series(values).astype(str), use_na_sentinel=False)
+    hasher = FeatureHasher(n_features=n_features, input_type='string')
+    hashed = hasher.transform([str(value)] for value in uniques)
+    buckets = hashed.indices.astype(np.int32, copy=False)
+    signs = hashed.data.astype(np.float32, copy=False)
+    return buckets[codes], signs[codes]
+
+def hashed_names(col_names, n_features):
+    if isinstance(col_names, str):
+        col_names = [col_names]
+    return [f'hashed_{col}_{i}' for col in col_names for i in range(n_features)]
+
+def hashing_matrix(df, col_names, n_features=100, dtype=np.float32):
+    """
+    Sparse hashing trick for one or more columns in one pass.
+    Returns a CSR matrix (n_rows, len(col_names) * n_features): one block of
+    n_features columns per input column (names: hashed_names), with exactly
+    one non-zero per row and block - the same values apply_hashing writes
+    into dense columns.
+    """
+    if isinstance(col_names, str):
+        col_names = [col_names]
+    n_rows, k = len(df), len(col_names)
+    indices = np.empty((n_rows, k), dtype=np.int32)
+    data = np.empty((n_rows, k), dtype=dtype)
+    for j, col in enumerate(col_names):
+        buckets, signs = hash_buckets(df[col], n_features)
+        indices[:, j] = buckets + j * n_features
+        data[:, j] = signs
+    indptr = np.arange(0, n_rows * k + 1, k, dtype=np.int64)
+    return sparse.csr_matrix((data.ravel(), indices.ravel(), indptr), shape=(n_rows, k * n_features))
+
+def sparse_design_matrix(frame, hashed, dtype=np.float32):
+    """
+    Model input without densifying the hashed block: the (dense) frame
+    columns followed by the hashed CSR columns, as one CSR matrix.
+    Every frame cell is stored explicitly, so a 0 stays a 0 and NaN stays
+    missing; hashed buckets that aren't set are not stored, which XGBoost
+    treats as missing (see FeaturePipeline(sparse_hashing=True)).
+    """
+    values = frame.to_numpy(dtype=dtype)
+    n_rows, n_cols = values.shape
+    dense = sparse.csr_matrix(
+        (values.ravel(), np.tile(np.arange(n_cols, dtype=np.int32), n_rows),
+         np.arange(0, n_rows * n_cols + 1, n_cols, dtype=np.int64)),
+        shape=(n_rows, n_cols),
+    )
+    return sparse.hstack([dense, hashed.astype(dtype)], format='csr')
+
 def apply_hashing(df, col_name, n_features=100):
     """
     MANDATORY REQUIREMENT (III.1): High Cardinality Handling (Hashing Trick).
     Compresses columns with high unique values (e.g., Student_ID).
+    Dense output; use hashing_matrix to keep it sparse.
     """
     print(f"Applying Hashing Trick: {col_name} -> {n_features} buckets")
-    
-    # FeatureHasher expects a list of lists of strings: [['id1'], ['id2'], ...]
-    col_data = [[str(x)] for x in df[col_name]]
-    
-    hasher = FeatureHasher(n_features=n_features, input_type='string')
-    hashed_features = hasher.transform(col_data).toarray()
-    
+
+    # Same buckets/signs as FeatureHasher(n_features, input_type='string') on str(x)
+    hashed_features = hashing_matrix(df, [col_name], n_features, dtype=np.float64).toarray()
+
     # Hashed column names
-    hashed_cols = [f'hashed_{col_name}_{i}' for i in range(n_features)]
-    hashed_df = pd.DataFrame(hashed_features, columns=hashed_cols, index=df.index)
-    
+    hashed_df = pd.DataFrame(hashed_features, columns=hashed_names(col_name, n_features), index=df.index)
+
     # Dropping the original high-cardinality column and adding the hashed version
-    return pd.concat([df.drop(columns=[col_name]), hashed_df], axis=1)
\ No newline at end of file
+    return pd.concat([df.drop(columns=[col_name]), hashed_df], axis=1)
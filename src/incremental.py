@@ -0,0 +1,231 @@
+"""
+Incremental retraining (TRAIN_MODE=incremental in src/train_model.py).
+
+Instead of rebuilding every model on the full history, the saved models
+are continued on the partitions of the feature dataset (streaming DAG,
+data/interim/3_features) that they haven't seen yet:
+
+- XGBoost (classifier and reframed regressor) keeps boosting from the
+  saved booster: `rounds` more trees fitted on the new rows
+- RandomForest grows `trees` more trees on the new rows (warm_start)
+
+Partition tracking
+------------------
+`<checkpoint_dir>/runs/incremental.json` records which partitions were
+consumed (by content hash, the DAG rewrites unchanged parts), the input
+schema and a reference profile (decile bins per numeric column) of the
+data of the last full retrain.
+
+Guard
+-----
+`retrain_reasons` lists why an update would be unsafe; any reason means
+a full retrain on all partitions instead: no previous training, missing
+model files, consumed partitions changed or removed, a schema change,
+unseen values in low-cardinality categories (their codes don't exist in
+the saved feature pipeline) or drift (PSI above the threshold) on a
+numeric column.
+"""
+import os
+import json
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from src.model_io import atomic_path
+from src.pipeline_transformers import _as_tokens
+
+# Under RUNS_DIR (src/experiments.py): *.json in the checkpoint dir itself would be served as models
+MANIFEST_FILE = os.path.join('runs', 'incremental.json')
+DRIFT_PSI = 0.2
+# Categorical columns with more known values than this are ID-like (e.g. Name): not guarded
+MAX_GUARDED_CATEGORIES = 100
+PROFILE_BINS = 10
+
+
+def file_fingerprint(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _kind(dtype):
+    # int/float both 'number': chunks are downcast independently and NaN turns ints into floats
+    if isinstance(dtype, pd.CategoricalDtype):
+        return 'category'
+    if pd.api.types.is_numeric_dtype(dtype):
+        return 'number'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'datetime'
+    return 'text'
+
+
+def schema_of(df):
+    return {col: _kind(dtype) for col, dtype in df.dtypes.items()}
+
+
+def reference_profile(df, columns, bins=PROFILE_BINS):
+    """
+    Decile edges per numeric column and the share of rows in each bin
+    (last entry: missing values).
+    """
+    profile = {}
+    for col in columns:
+        values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float)
+        present = values[~np.isnan(values)]
+        if not len(present):
+            continue
+        edges = np.unique(np.quantile(present, np.linspace(0, 1, bins + 1)[1:-1]))
+        profile[col] = {'edges': edges.tolist(), 'shares': _shares(values, edges).tolist()}
+    return profile
+
+
+def _shares(values, edges):
+    missing = np.isnan(values)
+    counts = np.bincount(np.searchsorted(edges, values[~missing], side='right'), minlength=len(edges) + 1)
+    counts = np.append(counts, missing.sum())
+    return counts / max(len(values), 1)
+
+
+def psi(expected, actual, eps=1e-4):
+    """
+    Population stability index between two bin share vectors.
+    """
+    expected = np.clip(np.asarray(expected, dtype=float), eps, None)
+    actual = np.clip(np.asarray(actual, dtype=float), eps, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def drifted_columns(profile, df, threshold=DRIFT_PSI):
+    """
+    {column: PSI} of the profiled columns of df whose PSI exceeds threshold.
+    """
+    out = {}
+    for col, ref in profile.items():
+        if col not in df.columns:
+            continue
+        values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float)
+        score = psi(ref['shares'], _shares(values, np.asarray(ref['edges'])))
+        if score > threshold:
+            out[col] = round(score, 3)
+    return out
+
+
+def unseen_categories(feature_pipeline, df, max_categories=MAX_GUARDED_CATEGORIES):
+    """
+    {column: unseen values} for the low-cardinality categorical columns of
+    the fitted FeaturePipeline.
+    """
+    out = {}
+    for col, vocab in feature_pipeline.vocabularies.items():
+        if col not in df.columns or len(vocab) > max_categories:
+            continue
+        new = sorted(set(_as_tokens(df[col]).unique()) - set(vocab))
+        if new:
+            out[col] = new
+    return out
+
+
+class PartitionTracker:
+    """
+    The manifest of consumed partitions for one checkpoint directory.
+    """
+
+    def __init__(self, checkpoint_dir):
+        self.path = os.path.join(checkpoint_dir, MANIFEST_FILE)
+        self.manifest = None
+        if os.path.exists(self.path):
+            try:
+                with open(self.path) as f:
+                    self.manifest = json.load(f)
+            except (OSError, ValueError):
+                self.manifest = None
+
+    @property
+    def consumed(self):
+        return self.manifest['partitions'] if self.manifest else {}
+
+    def pending(self, paths):
+        """
+        Partitions that are not consumed yet.
+        """
+        return [p for p in paths if os.path.basename(p) not in self.consumed]
+
+    def changed(self, paths):
+        """
+        Consumed partitions that were removed or rewritten with other content.
+        """
+        current = {os.path.basename(p): p for p in paths}
+        return sorted(name for name, digest in self.consumed.items()
+                      if name not in current or file_fingerprint(current[name]) != digest)
+
+    def retrain_reasons(self, paths, new_df, feature_pipeline, model_paths, target_col='target',
+                        threshold=DRIFT_PSI):
+        """
+        Why the new partitions can't be trained on incrementally (empty list: they can).
+        """
+        if self.manifest is None:
+            return ["no previous incremental training"]
+        reasons = []
+        if target_col in new_df.columns and new_df[target_col].nunique() < 2:
+            reasons.append("new partitions hold a single class")
+        missing = [os.path.basename(p) for p in model_paths if not os.path.exists(p)]
+        if feature_pipeline is None:
+            missing.append("feature pipeline")
+        if missing:
+            reasons.append(f"previous models missing ({', '.join(missing)})")
+        if getattr(feature_pipeline, 'sparse_hashing', False):
+            reasons.append("sparse hashed models are only trained in full")
+        changed = self.changed(paths)
+        if changed:
+            reasons.append(f"consumed partitions changed ({', '.join(changed)})")
+        schema = schema_of(new_df)
+        if schema != self.manifest['schema']:
+            diff = sorted(set(schema.items()) ^ set(self.manifest['schema'].items()))
+            reasons.append(f"schema changed ({', '.join(f'{c}: {k}' for c, k in diff)})")
+        if feature_pipeline is not None:
+            unseen = unseen_categories(feature_pipeline, new_df)
+            if unseen:
+                reasons.append(f"unseen categories ({', '.join(f'{c}: {v[:3]}' for c, v in unseen.items())})")
+        drift = drifted_columns(self.manifest['reference'], new_df, threshold)
+        if drift:
+            reasons.append(f"drift PSI > {threshold} ({', '.join(f'{c}: {s}' for c, s in drift.items())})")
+        return reasons
+
+    def record(self, paths, df=None, numeric_cols=()):
+        """
+        Marks `paths` as consumed. With df (full retrain) the manifest starts
+        over: schema and reference profile come from df, nothing else counts
+        as consumed.
+        """
+        if df is not None or self.manifest is None:
+            self.manifest = {'partitions': {}, 'schema': schema_of(df),
+                             'reference': reference_profile(df, numeric_cols)}
+        for p in paths:
+            self.manifest['partitions'][os.path.basename(p)] = file_fingerprint(p)
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with atomic_path(self.path) as tmp:
+            with open(tmp, 'w') as f:
+                json.dump(self.manifest, f, indent=2)
+
+
+def continue_model(model, X, y, rounds=20, trees=20, fit_kwargs=None):
+    """
+    Continues a fitted model on new rows: `rounds` more boosting rounds
+    from the current booster (XGBoost) or `trees` more trees (RandomForest,
+    warm_start). Returns the model.
+    """
+    fit_kwargs = fit_kwargs or {}
+    if hasattr(model, 'get_booster'):
+        booster = model.get_booster()
+        total = booster.num_boosted_rounds() + rounds
+        model.set_params(n_estimators=rounds)
+        model.fit(X, y, xgb_model=booster, **fit_kwargs)
+        model.set_params(n_estimators=total)
+    else:
+        model.set_params(warm_start=True, n_estimators=len(model.estimators_) + trees)
+        model.fit(X, y, **fit_kwargs)
+        model.set_params(warm_start=False)
+    return model
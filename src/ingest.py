@@ -1,14 +1,94 @@
-import pandas as pd
-import os
-
-def load_data(file_path):
-    """
-    Reads the CSV file from the specified path.
-    """
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"ERROR: File not found -> {file_path}")
-    
-    print(f"Loading data: {file_path}")
-    df = pd.read_csv(file_path)
-    print(f"Data loaded. Shape: {df.shape}")
-    return df
\ No newline at end of file
+import pandas as pd
+import os
+import shutil
+
+from src.storage import write_partition
+
+# Explicit dtypes for the raw export. Chunks are parsed independently, so
+# without them a chunk whose column happens to be all-empty (or all-int)
+# would get a different dtype than the next one.
+TEXT_COLUMNS = [
+    'Student_ID', 'Name', 'Gender', 'Education_Level', 'Employment_Status', 'City',
+    'Device_Type', 'Internet_Connection_Quality', 'Course_ID', 'Course_Name', 'Category',
+    'Course_Level', 'Enrollment_Date', 'Payment_Mode', 'Fee_Paid', 'Discount_Used', 'Completed',
+]
+NUMERIC_COLUMNS = [
+    'Age', 'Course_Duration_Days', 'Instructor_Rating', 'Login_Frequency',
+    'Average_Session_Duration_Min', 'Video_Completion_Rate', 'Discussion_Participation',
+    'Time_Spent_Hours', 'Days_Since_Last_Login', 'Notifications_Checked',
+    'Peer_Interaction_Score', 'Assignments_Submitted', 'Assignments_Missed', 'Quiz_Attempts',
+    'Quiz_Score_Avg', 'Project_Grade', 'Progress_Percentage', 'Rewatch_Count',
+    'Payment_Amount', 'App_Usage_Percentage', 'Reminder_Emails_Clicked',
+    'Support_Tickets_Raised', 'Satisfaction_Rating',
+]
+RAW_DTYPES = {**{c: 'str' for c in TEXT_COLUMNS}, **{c: 'float64' for c in NUMERIC_COLUMNS}}
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def load_data(file_path):
+    """
+    Reads the CSV file from the specified path.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"ERROR: File not found -> {file_path}")
+
+    print(f"Loading data: {file_path}")
+    df = pd.read_csv(file_path)
+    print(f"Data loaded. Shape: {df.shape}")
+    return df
+
+
+def iter_data(file_path, chunksize=DEFAULT_CHUNKSIZE, dtype=None):
+    """
+    Streaming version of load_data: yields the CSV in chunks of `chunksize`
+    rows (explicit dtypes, stripped column names). Only one chunk is held
+    in memory at a time.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"ERROR: File not found -> {file_path}")
+
+    print(f"Streaming data: {file_path} (chunks of {chunksize} rows)")
+    reader = pd.read_csv(file_path, chunksize=chunksize, dtype=RAW_DTYPES if dtype is None else dtype)
+    with reader:
+        for chunk in reader:
+            chunk.columns = chunk.columns.str.strip()
+            yield chunk
+
+
+def stream_to_dataset(chunks, out_dir, steps=(), validator=None, fmt=None):
+    """
+    Runs every chunk through `steps` (functions df -> df, e.g. clean_data)
+    and writes it as one part file of the partitioned dataset `out_dir`.
+
+    With a validator (see src.validate.StreamingValidator), each chunk is
+    checked before the steps run and the checks are finalized after the
+    last chunk. The parts are written to a temporary directory that only
+    replaces `out_dir` once everything passed, so a failed run never
+    leaves a half-written dataset behind. Returns the number of rows written.
+    """
+    tmp_dir = f"{out_dir.rstrip(os.sep)}.tmp-{os.getpid()}"
+    if os.path.isdir(tmp_dir):
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    n_rows = 0
+    try:
+        for part, chunk in enumerate(chunks):
+            if validator is not None:
+                chunk = validator.update(chunk)
+            for step in steps:
+                chunk = step(chunk)
+            write_partition(chunk, tmp_dir, part, fmt)
+            n_rows += len(chunk)
+        if validator is not None:
+            validator.finalize()
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    if os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+    os.replace(tmp_dir, out_dir)
+    print(f"Dataset written: {out_dir} ({n_rows} rows)")
+    return n_rows
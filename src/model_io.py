@@ -0,0 +1,117 @@
+import os
+import time
+import shutil
+from contextlib import contextmanager
+
+import joblib
+
+NATIVE_EXTENSIONS = ('.ubj', '.json')
+# Where src/train_model.py writes models and their artifacts (the DAG's data volume)
+CHECKPOINT_DIR = '/opt/airflow/data/models'
+# Present in a models directory while a set of artifacts is being published
+PUBLISH_MARKER = '.publishing'
+# A marker older than this is left over from a crashed publish and ignored
+PUBLISH_TIMEOUT = 600
+
+
+def native_path(pkl_path):
+    """
+    models/XGBoost_Boosting.pkl -> models/XGBoost_Boosting.ubj
+    """
+    return os.path.splitext(pkl_path)[0] + '.ubj'
+
+
+@contextmanager
+def atomic_path(path):
+    """
+    Yields a temporary path next to `path` and renames it over `path` once
+    the block finishes. A reader (e.g. the API's model watcher) sees either
+    the old file or the new one, never a half-written one. The temp file is
+    a dotfile with the same extension, so model discovery skips it.
+    """
+    directory, base = os.path.split(path)
+    stem, ext = os.path.splitext(base)
+    tmp = os.path.join(directory, f".{stem}-{os.getpid()}{ext}")
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+@contextmanager
+def publishing(directory):
+    """
+    Marks `directory` as being updated for the duration of the block.
+    Each file is replaced atomically, but artifacts that belong together
+    (the models and the feature pipeline) are replaced one after the other;
+    readers check is_publishing() and wait for the whole set.
+    """
+    marker = os.path.join(directory, PUBLISH_MARKER)
+    os.makedirs(directory, exist_ok=True)
+    with open(marker, 'w') as f:
+        f.write(str(os.getpid()))
+    try:
+        yield
+    finally:
+        os.remove(marker)
+
+
+def is_publishing(directory):
+    try:
+        age = time.time() - os.path.getmtime(os.path.join(directory, PUBLISH_MARKER))
+    except OSError:
+        return False
+    return age < PUBLISH_TIMEOUT
+
+
+def atomic_dump(obj, path):
+    with atomic_path(path) as tmp:
+        joblib.dump(obj, tmp)
+
+
+def atomic_copy(src, dst):
+    with atomic_path(dst) as tmp:
+        shutil.copyfile(src, tmp)
+
+
+def export_native(model, path):
+    """
+    Saves an XGBoost sklearn model in XGBoost's own UBJSON format.
+    Unlike a pickle it does not depend on the Python/xgboost version that
+    wrote it and loads without unpickling. Returns the path, or None for
+    models that have no native format (e.g. RandomForest).
+    """
+    if not hasattr(model, 'save_model') or not hasattr(model, 'get_booster'):
+        return None
+    with atomic_path(path) as tmp:
+        model.save_model(tmp)
+    return path
+
+
+def _load_native(path):
+    from xgboost import XGBClassifier, XGBRegressor
+
+    # The file records which sklearn wrapper wrote it; try the common case first
+    model = XGBClassifier()
+    try:
+        model.load_model(path)
+        return model
+    except TypeError:
+        model = XGBRegressor()
+        model.load_model(path)
+        return model
+
+
+def load_model(path, mmap_mode=None):
+    """
+    Loads a model artifact by extension:
+    - .ubj / .json : native XGBoost format
+    - anything else: joblib pickle; mmap_mode='r' memory-maps the numpy
+      arrays stored in the pickle (read-only pages shared by every process
+      that maps the same file)
+    """
+    if path.endswith(NATIVE_EXTENSIONS):
+        return _load_native(path)
+    return joblib.load(path, mmap_mode=mmap_mode)
@@ -0,0 +1,575 @@
+"""
+Prediction logging and drift monitoring.
+
+The API hands every answered record to a PredictionLogger. log() only
+appends to a bounded in-memory ring buffer; a background thread drains
+it in batches to LOG_FILE as JSONL, one line per prediction:
+
+    {"ts": ..., "model": ..., "version": ..., "input": {...}, "prediction": 1, "probability": 0.83}
+
+so request latency doesn't depend on the disk. When the buffer is full
+(disk slower than traffic), the oldest records are overwritten and
+counted as dropped. Every process (gunicorn worker) appends to its own
+live file LOG_FILE.live-<pid>, so no two writers share or rename a file.
+Live files are rotated by size and/or age to LOG_FILE.<time_ns>-<pid>;
+only the newest LOG_BACKUPS rotated segments are kept. Readers take all
+segments (log_segments), plus a plain LOG_FILE if one exists.
+
+Drift
+-----
+DriftMonitor reads the log incrementally: each segment is tracked by
+inode and read offset, so an update only parses lines appended since the
+last one. Per segment it keeps running statistics of the probability and
+of each baseline feature (count, Welford mean/variance, a histogram over
+the baseline's decile edges), i.e. O(1) memory per feature and retained
+segment. The drift window is the retained log (rotated segments drop out
+of it when they are pruned).
+
+The reference is the training data profile written by src/train_model.py
+(BASELINE_FILE, see src/data_profile.py: mean, std and decile sketch per
+numeric input and of the published model's test-set probabilities).
+Without one, the means in DEFAULT_BASELINE are used. A feature drifts when its mean moved by more
+than DRIFT_MEAN_SHIFT (in baseline standard deviations, or relative to
+the mean when the baseline has no spread) or its PSI exceeds DRIFT_PSI.
+"""
+import os
+import re
+import json
+import glob
+import time
+import random
+import threading
+from collections import deque
+
+import numpy as np
+
+from src.data_profile import PREDICTION, PROFILE_PATH, drift_baseline, load_profile
+from src.incremental import psi
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used when orjson isn't installed
+    orjson = None
+
+LOG_FILE = os.getenv('PREDICTION_LOG_FILE', 'models/logs/prediction_logs.jsonl')
+LOG_BUFFER_SIZE = int(os.getenv('PREDICTION_LOG_BUFFER_SIZE', '10000'))    # records, 0 = logging off
+LOG_FLUSH_INTERVAL = float(os.getenv('PREDICTION_LOG_FLUSH_SECONDS', '1'))
+LOG_FLUSH_BATCH = int(os.getenv('PREDICTION_LOG_FLUSH_BATCH', '1000'))      # flush early at this many records
+LOG_SAMPLE_RATE = float(os.getenv('PREDICTION_LOG_SAMPLE_RATE', '1'))       # fraction of predictions logged
+LOG_MAX_BYTES = int(os.getenv('PREDICTION_LOG_MAX_BYTES', str(64 << 20)))   # rotate above this size, 0 = never
+LOG_ROTATE_SECONDS = float(os.getenv('PREDICTION_LOG_ROTATE_SECONDS', '0'))  # rotate after this age, 0 = never
+LOG_BACKUPS = int(os.getenv('PREDICTION_LOG_BACKUPS', '5'))
+
+BASELINE_FILE = PROFILE_PATH
+DRIFT_MEAN_SHIFT = float(os.getenv('DRIFT_MEAN_SHIFT', '0.2'))
+DRIFT_PSI = float(os.getenv('DRIFT_PSI', '0.2'))
+DRIFT_MIN_SAMPLES = int(os.getenv('DRIFT_MIN_SAMPLES', '30'))   # fewer logged values: no verdict
+# Reference means when train_model.py hasn't written a profile yet
+DEFAULT_BASELINE = {'probability': {'mean': 0.5}, 'Age': {'mean': 25.0}}
+READ_BLOCK = 4 << 20
+
+
+def _dumps(entry) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(entry)
+    return json.dumps(entry, separators=(',', ':')).encode()
+
+
+def _loads(line):
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+_ROTATED = re.compile(r'(\d+)(?:-\d+)?')
+_LIVE = re.compile(r'live-(\d+)')
+
+
+def log_segments(path=None):
+    """
+    Rotated segments of `path` (default LOG_FILE), oldest first, then the
+    live files of the writer processes and a plain `path`. Other suffixes
+    (e.g. a stray .tmp) are not log segments.
+    """
+    path = path or LOG_FILE
+    rotated, live = [], []
+    for p in glob.glob(glob.escape(path) + '.*'):
+        suffix = p[len(path) + 1:]
+        m = _ROTATED.fullmatch(suffix)
+        if m:
+            rotated.append((int(m.group(1)), p))
+        elif _LIVE.fullmatch(suffix):
+            live.append(p)
+    return [p for _, p in sorted(rotated)] + sorted(live) + ([path] if os.path.exists(path) else [])
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class PredictionLogger:
+    """
+    Bounded ring buffer + background writer for prediction records.
+
+    log() is safe to call from the event loop and from pool threads; it
+    never touches the disk. start() launches the writer thread (per
+    process, like the model watcher), stop() flushes what is left. Each
+    process writes and rotates only its own live_path.
+    `dropped` / `written` are optional prometheus Counters.
+    """
+
+    def __init__(self, path=None, buffer_size=LOG_BUFFER_SIZE, flush_interval=LOG_FLUSH_INTERVAL,
+                 flush_batch=LOG_FLUSH_BATCH, sample_rate=LOG_SAMPLE_RATE, max_bytes=LOG_MAX_BYTES,
+                 rotate_seconds=LOG_ROTATE_SECONDS, backups=LOG_BACKUPS, dropped=None, written=None):
+        self.path = path or LOG_FILE
+        self.buffer_size = max(0, int(buffer_size))
+        self.flush_interval = flush_interval
+        self.flush_batch = max(1, int(flush_batch))
+        self.sample_rate = sample_rate
+        self.max_bytes = max_bytes
+        self.rotate_seconds = rotate_seconds
+        self.backups = backups
+        self.dropped_metric = dropped
+        self.written_metric = written
+
+        self.dropped = 0
+        self._buffer = deque(maxlen=self.buffer_size or 1)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._write_lock = threading.Lock()  # one writer at a time (thread vs explicit flush)
+        self._opened_at = None
+        self._thread = None
+        self._thread_pid = None
+        self._stopping = False
+
+    @property
+    def enabled(self):
+        return self.buffer_size > 0
+
+    def __len__(self):
+        return len(self._buffer)
+
+    @property
+    def live_path(self):
+        # resolved per call: a logger created before a fork writes one file per worker
+        return f"{self.path}.live-{os.getpid()}"
+
+    def log(self, record, result, model=None, version=None):
+        """
+        Queues one answered record (the coerced payload and its /predict result).
+        """
+        if not self.enabled or (self.sample_rate < 1 and random.random() >= self.sample_rate):
+            return
+        entry = (time.time(), model, version, record, result.get('prediction'), result.get('probability'))
+        with self._lock:
+            full = len(self._buffer) == self.buffer_size
+            self._buffer.append(entry)  # overwrites the oldest entry when full
+        if full:
+            self.dropped += 1
+            if self.dropped_metric is not None:
+                self.dropped_metric.inc()
+        if len(self._buffer) >= self.flush_batch:
+            self._wake.set()
+
+    def _drain(self):
+        with self._lock:
+            entries = list(self._buffer)
+            self._buffer.clear()
+        return entries
+
+    def flush(self):
+        """
+        Writes everything buffered so far (rotating first when due). Returns
+        the number of records written.
+        """
+        with self._write_lock:
+            entries = self._drain()
+            if not entries:
+                return 0
+            lines = b''.join(
+                _dumps({'ts': ts, 'model': model, 'version': version, 'input': record,
+                        'prediction': prediction, 'probability': probability}) + b'\n'
+                for ts, model, version, record, prediction, probability in entries
+            )
+            self._rotate_if_due(len(lines))
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.live_path, 'ab') as f:
+                f.write(lines)
+            if self._opened_at is None:
+                self._opened_at = time.time()
+        if self.written_metric is not None:
+            self.written_metric.inc(len(entries))
+        return len(entries)
+
+    def _rotate_if_due(self, incoming):
+        try:
+            size = os.path.getsize(self.live_path)
+        except OSError:
+            self._opened_at = None
+            return
+        too_big = self.max_bytes > 0 and size > 0 and size + incoming > self.max_bytes
+        too_old = (self.rotate_seconds > 0 and self._opened_at is not None
+                   and time.time() - self._opened_at >= self.rotate_seconds)
+        if too_big or too_old:
+            self.rotate()
+
+    def rotate(self):
+        """
+        Moves this process's live file to LOG_FILE.<time_ns>-<pid> (live
+        files of exited processes too) and prunes old segments.
+        """
+        live = self.live_path
+        for p in glob.glob(glob.escape(self.path) + '.live-*'):
+            m = _LIVE.fullmatch(p[len(self.path) + 1:])
+            if m is None or (p != live and _pid_alive(int(m.group(1)))):
+                continue
+            try:
+                os.replace(p, f"{self.path}.{time.time_ns()}-{m.group(1)}")
+            except FileNotFoundError:
+                pass  # another worker adopted the orphan first
+        self._opened_at = None
+        rotated = [p for p in log_segments(self.path) if _ROTATED.fullmatch(p[len(self.path) + 1:])]
+        for old in rotated[:max(0, len(rotated) - self.backups)]:
+            try:
+                os.remove(old)
+            except FileNotFoundError:
+                pass  # pruned by another worker
+
+    def start(self):
+        """
+        Starts the writer thread (no-op if it already runs in this process).
+        """
+        if not self.enabled or (self._thread is not None and self._thread_pid == os.getpid()):
+            return
+        self._stopping = False
+
+        def _run():
+            while not self._stopping:
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                try:
+                    self.flush()
+                except Exception as e:
+                    print(f"⚠️ Prediction log flush failed: {e}")
+
+        self._thread = threading.Thread(target=_run, name='prediction-logger', daemon=True)
+        self._thread_pid = os.getpid()
+        self._thread.start()
+
+    def stop(self):
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None and self._thread_pid == os.getpid():
+            self._thread.join(timeout=5)
+        self._thread = None
+        self.flush()
+
+
+# ----------------------------
+# Drift
+# ----------------------------
+class RunningStats:
+    """
+    Count, Welford mean/variance and a histogram over fixed bin edges
+    (bins: below the first edge, between edges, above the last).
+    """
+
+    __slots__ = ('count', 'mean', 'm2', 'edges', 'hist')
+
+    def __init__(self, edges=None):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.edges = edges
+        self.hist = None if edges is None else np.zeros(len(edges) + 1, dtype=np.int64)
+
+    def update(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if self.hist is not None:
+            self.hist[np.searchsorted(self.edges, value, side='right')] += 1
+
+    def update_many(self, values):
+        """
+        Adds an array of values at once (numpy stats of the batch, then merge).
+        """
+        values = np.asarray(values, dtype=float)
+        if not len(values):
+            return self
+        batch = RunningStats(self.edges)
+        batch.count = len(values)
+        batch.mean = float(values.mean())
+        batch.m2 = float(((values - batch.mean) ** 2).sum())
+        if batch.hist is not None:
+            batch.hist += np.bincount(np.searchsorted(self.edges, values, side='right'), minlength=len(batch.hist))
+        return self.merge(batch)
+
+    def merge(self, other):
+        """
+        Adds other's values (Chan et al. parallel update).
+        """
+        if not other.count:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        if self.hist is not None:
+            self.hist += other.hist
+        return self
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else 0.0
+
+
+def ks_statistic(expected_shares, hist):
+    """
+    Max CDF distance between the baseline and the logged histogram (KS
+    statistic at the bin edges).
+    """
+    actual = np.cumsum(hist) / max(hist.sum(), 1)
+    return float(np.max(np.abs(np.cumsum(expected_shares) - actual)))
+
+
+class _Segment:
+    """
+    Read position and running statistics of one log file (by inode).
+    """
+
+    def __init__(self, features):
+        self.offset = 0
+        self.head = b''
+        self.records = 0
+        self.stats = {name: RunningStats(edges) for name, edges in features.items()}
+
+
+class DriftMonitor:
+    """
+    Incremental drift statistics over the prediction log segments of `path`
+    against `baseline` (a drift_baseline dict, or the path of the data
+    profile written by train_model.py; DEFAULT_BASELINE when it's missing).
+
+    update() parses what was appended since the last call, check() returns
+    one result per feature (and sets `gauges`, a {result field: labelled
+    prometheus Gauge} dict, for numeric fields).
+    """
+
+    def __init__(self, path=None, baseline=None, gauges=None):
+        self.path = path or LOG_FILE
+        # a dict baseline is fixed; a profile is reloaded when train_model.py rewrites it
+        self.baseline = baseline if isinstance(baseline, dict) else None
+        self.baseline_path = None if self.baseline is not None else (baseline or BASELINE_FILE)
+        self._baseline_sig = None
+        self.gauges = gauges or {}
+        self._segments = {}
+        self._lock = threading.RLock()
+        self._thread = None
+        self._thread_pid = None
+
+    # ----------------------------
+    # Baseline
+    # ----------------------------
+    def _refresh_baseline(self):
+        path = self.baseline_path
+        if path is None:
+            return
+        try:
+            st = os.stat(path)
+            sig = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            sig = (None, None)
+        if sig == self._baseline_sig:
+            return
+        baseline = DEFAULT_BASELINE
+        if sig[0] is not None:
+            try:
+                baseline = drift_baseline(load_profile(path)) or DEFAULT_BASELINE
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Data profile {path} not readable, using default drift baselines: {e}")
+        self.baseline = baseline
+        self._baseline_sig = sig
+        self._segments = {}  # new bins: logs are read again once
+
+    @property
+    def _features(self):
+        return {name: (np.asarray(ref['edges']) if ref.get('edges') else None)
+                for name, ref in self.baseline.items()}
+
+    # ----------------------------
+    # Log reading
+    # ----------------------------
+    def update(self):
+        """
+        Parses the lines appended to the log segments since the last update.
+        Returns the number of new records.
+        """
+        with self._lock:
+            self._refresh_baseline()
+            features = self._features
+            seen, new = set(), 0
+            for path in log_segments(self.path):
+                try:
+                    with open(path, 'rb') as f:
+                        st = os.fstat(f.fileno())
+                        key = (st.st_dev, st.st_ino)
+                        seen.add(key)
+                        segment = self._segments.get(key)
+                        if segment is not None and (st.st_size < segment.offset
+                                                    or f.read(len(segment.head)) != segment.head):
+                            segment = None  # truncated or replaced by a new file
+                        if segment is None:
+                            segment = self._segments[key] = _Segment(features)
+                        new += self._read(f, segment)
+                except FileNotFoundError:
+                    continue  # rotated/pruned meanwhile: picked up under its new name next time
+            for key in set(self._segments) - seen:
+                del self._segments[key]
+            return new
+
+    def _read(self, f, segment):
+        new = 0
+        while True:
+            f.seek(segment.offset)
+            block = f.read(READ_BLOCK)
+            end = block.rfind(b'\n') + 1
+            if not end:
+                return new  # nothing, or a line still being written
+            if not segment.offset:
+                segment.head = block[:min(end, 256)]
+            new += self._add_block(segment, block[:end])
+            segment.offset += end
+
+    def _add_block(self, segment, block):
+        """
+        Parses the complete lines of a block; values are collected per
+        feature and added to the running statistics in one step each.
+        """
+        collected = {name: [] for name in segment.stats}
+        records = 0
+        for line in block.splitlines():
+            if not line.strip():
+                continue
+            try:
+                entry = _loads(line)
+            except ValueError:
+                continue
+            records += 1
+            inputs = entry.get('input') or {}
+            for name, values in collected.items():
+                value = entry.get(PREDICTION) if name == PREDICTION else inputs.get(name)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    values.append(value)
+        for name, values in collected.items():
+            values = np.asarray(values, dtype=float)
+            segment.stats[name].update_many(values[~np.isnan(values)])
+        segment.records += records
+        return records
+
+    # ----------------------------
+    # Results
+    # ----------------------------
+    def _totals(self, name):
+        edges = self._features.get(name)
+        total = RunningStats(edges)
+        for segment in self._segments.values():
+            if name in segment.stats:
+                total.merge(segment.stats[name])
+        return total
+
+    def result(self, name):
+        """
+        Drift result of one feature (PREDICTION for the model's probabilities).
+        """
+        if not log_segments(self.path):
+            return {'status': 'no_logs', 'feature': name}
+        ref = self.baseline.get(name)
+        if ref is None:
+            return {'status': 'no_baseline', 'feature': name}
+        if not sum(segment.records for segment in self._segments.values()):
+            return {'status': 'empty_logs', 'feature': name}
+        stats = self._totals(name)
+        result = {'status': 'success', 'feature': name, 'samples': stats.count,
+                  'baseline_mean': ref['mean'], 'current_mean': stats.mean if stats.count else None,
+                  'mean_shift': None, 'psi': None, 'ks': None, 'drift_detected': False}
+        if stats.count < DRIFT_MIN_SAMPLES:
+            result['status'] = 'insufficient_data'
+            return result
+        scale = ref.get('std') or abs(ref['mean']) or 1.0
+        result['mean_shift'] = abs(stats.mean - ref['mean']) / scale
+        drift = result['mean_shift'] > DRIFT_MEAN_SHIFT
+        if stats.hist is not None:
+            result['psi'] = psi(ref['shares'], stats.hist / stats.count)
+            result['ks'] = ks_statistic(ref['shares'], stats.hist)
+            drift = drift or result['psi'] > DRIFT_PSI
+        result['drift_detected'] = bool(drift)
+        return result
+
+    def check(self):
+        """
+        update() + the results of every baseline feature ({name: result}).
+        """
+        with self._lock:
+            self.update()
+            results = {name: self.result(name) for name in self.baseline}
+        for field, gauge in self.gauges.items():
+            for name, result in results.items():
+                value = result.get(field)
+                if value is not None:
+                    gauge.labels(feature=name).set(float(value))
+        return results
+
+    def start(self, interval: float):
+        """
+        Runs check() every `interval` seconds in a daemon thread (per process).
+        """
+        if interval <= 0 or (self._thread is not None and self._thread_pid == os.getpid()):
+            return
+
+        def _run():
+            while True:
+                try:
+                    self.check()
+                except Exception as e:
+                    print(f"⚠️ Drift check failed: {e}")
+                time.sleep(interval)
+
+        self._thread = threading.Thread(target=_run, name='drift-monitor', daemon=True)
+        self._thread_pid = os.getpid()
+        self._thread.start()
+
+
+# One monitor per (log, baseline) pair, so repeated checks stay incremental
+_monitors = {}
+
+
+def _monitor():
+    key = (LOG_FILE, BASELINE_FILE)
+    if key not in _monitors:
+        _monitors[key] = DriftMonitor(LOG_FILE, BASELINE_FILE)
+    monitor = _monitors[key]
+    monitor.update()
+    return monitor
+
+
+def check_drift():
+    """
+    Mean (and histogram) of the logged probabilities vs the baseline.
+    """
+    return _monitor().result(PREDICTION)
+
+
+def check_feature_drift(feature_name='Age'):
+    """
+    Same as check_drift for one logged input feature.
+    """
+    return _monitor().result(feature_name)
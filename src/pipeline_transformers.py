@@ -0,0 +1,194 @@
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+
+from src.preprocess import clean_data
+from src.features import apply_hashing, hash_bucket, hash_buckets, hashed_names, hashing_matrix
+
+MISSING_TOKEN = "nan"
+
+
+class CleanDataTransformer(BaseEstimator, TransformerMixin):
+    """
+    sklearn wrapper around clean_data (target encoding + Enrollment_Month).
+    """
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        return clean_data(X)
+
+
+class FeatureCrossTransformer(BaseEstimator, TransformerMixin):
+    """
+    Feature Cross as a transformer: col1 + '_' + col2 -> new_col_name.
+    """
+    def __init__(self, col1='Category', col2='Course_Level', new_col_name='Category_Level_Cross'):
+        self.col1 = col1
+        self.col2 = col2
+        self.new_col_name = new_col_name
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        X = X.copy()
+        X[self.new_col_name] = X[self.col1].astype(object) + '_' + X[self.col2].astype(object)
+        return X
+
+
+class HashingTransformer(BaseEstimator, TransformerMixin):
+    """
+    Hashing Trick as a transformer (see apply_hashing).
+    """
+    def __init__(self, col_name='Student_ID', n_features=100):
+        self.col_name = col_name
+        self.n_features = n_features
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        return apply_hashing(X.copy(), self.col_name, n_features=self.n_features)
+
+
+def _as_tokens(series: pd.Series) -> pd.Series:
+    """
+    String tokens used as vocabulary keys. Missing values become 'nan',
+    which is what LabelEncoder saw after .astype(str) during training.
+    """
+    values = series.astype(object)
+    return values.where(values.notna(), MISSING_TOKEN).astype(str)
+
+
+class FeaturePipeline:
+    """
+    Fitted, serializable bundle of the training-time feature steps so that
+    serving applies exactly what training did:
+
+    - Feature Cross (col1 + '_' + col2)
+    - Hashing Trick for the high-cardinality column(s) (murmurhash, same
+      buckets/signs as sklearn's FeatureHasher); `hash_col` is one column
+      name or a list of them, each gets its own block of n_features
+    - Category -> integer code lookup tables, identical to the codes a
+      LabelEncoder fit on the same column produces (sorted vocabulary)
+
+    Input is the cleaned frame (output of clean_data). Unseen categories
+    are encoded as NaN (missing) instead of raising.
+
+    sparse_hashing=True is for models trained on transform_sparse output:
+    buckets that are not set are missing there (not stored in the CSR
+    matrix), so transform writes NaN instead of 0 for them.
+    """
+
+    def __init__(self, cross=('Category', 'Course_Level', 'Category_Level_Cross'),
+                 hash_col='Student_ID', n_features=50, date_col='Enrollment_Date',
+                 month_col='Enrollment_Month', exclude=('target', 'Completed'),
+                 sparse_hashing=False):
+        self.cross = tuple(cross) if cross else None
+        self.hash_col = hash_col
+        self.n_features = n_features
+        self.date_col = date_col
+        self.month_col = month_col
+        self.exclude = tuple(exclude)
+        self.sparse_hashing = sparse_hashing
+        self.vocabularies = {}
+        self.numeric_cols = []
+        self.output_cols = []
+
+    @property
+    def hash_columns(self):
+        if not self.hash_col:
+            return []
+        return [self.hash_col] if isinstance(self.hash_col, str) else list(self.hash_col)
+
+    @property
+    def hashed_cols(self):
+        return hashed_names(self.hash_columns, self.n_features)
+
+    def _add_cross(self, df):
+        if self.cross and self.cross[0] in df.columns and self.cross[1] in df.columns:
+            col1, col2, new_col = self.cross
+            df[new_col] = df[col1].astype(object) + '_' + df[col2].astype(object)
+        return df
+
+    def fit(self, df: pd.DataFrame):
+        df = self._add_cross(df.copy())
+        present = [c for c in self.hash_columns if c in df.columns]
+        if not present:
+            self.hash_col = None
+        elif not isinstance(self.hash_col, str):
+            self.hash_col = present
+        hash_columns = self.hash_columns
+
+        self.vocabularies = {}
+        self.numeric_cols = []
+        for col in df.columns:
+            if col in self.exclude or col in hash_columns:
+                continue
+            if pd.api.types.is_numeric_dtype(df[col]):
+                self.numeric_cols.append(col)
+            else:
+                uniques = np.unique(_as_tokens(df[col]).to_numpy())
+                self.vocabularies[col] = {v: i for i, v in enumerate(uniques)}
+
+        self.output_cols = [c for c in df.columns if c not in hash_columns] + self.hashed_cols
+        return self
+
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        return self.fit(df).transform(df)
+
+    def hash_matrix(self, values) -> np.ndarray:
+        """
+        Dense (n, n_features) hashing-trick matrix for one column.
+        """
+        buckets, signs = hash_buckets(values, self.n_features)
+        out = np.full((len(buckets), self.n_features), self._unset_bucket, dtype=np.float64)
+        out[np.arange(len(buckets)), buckets] = signs
+        return out
+
+    @property
+    def _unset_bucket(self):
+        # pipelines pickled before sparse_hashing existed are dense ones
+        return np.nan if getattr(self, 'sparse_hashing', False) else 0.0
+
+    def _encode(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Feature cross + category codes; hash columns are left untouched.
+        """
+        df = self._add_cross(df.copy())
+
+        for col, vocab in self.vocabularies.items():
+            if col in df.columns:
+                df[col] = _as_tokens(df[col]).map(vocab).astype(float)
+
+        # Codes fit into ints when nothing unseen showed up (matches LabelEncoder dtype)
+        for col in self.vocabularies:
+            if col in df.columns and not df[col].isna().any():
+                df[col] = df[col].astype(int)
+        return df
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vectorized transform of a cleaned frame into the training feature frame.
+        """
+        df = self._encode(df)
+        hash_columns = [c for c in self.hash_columns if c in df.columns]
+        if hash_columns:
+            hashed = pd.DataFrame(np.hstack([self.hash_matrix(df[c]) for c in hash_columns]),
+                                  columns=hashed_names(hash_columns, self.n_features), index=df.index)
+            df = pd.concat([df.drop(columns=hash_columns), hashed], axis=1)
+        return df
+
+    def fit_transform_sparse(self, df: pd.DataFrame):
+        return self.fit(df).transform_sparse(df)
+
+    def transform_sparse(self, df: pd.DataFrame):
+        """
+        Same features as transform, but the hashed block is never densified.
+        Returns (frame without the hash columns, CSR matrix of the hashed
+        columns in hashed_cols order); see src.features.sparse_design_matrix.
+        """
+        df = self._encode(df)
+        hash_columns = [c for c in self.hash_columns if c in df.columns]
+        return df.drop(columns=hash_columns), hashing_matrix(df, hash_columns, self.n_features)
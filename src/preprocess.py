@@ -1,25 +1,83 @@
+import numpy as np
 import pandas as pd
 from sklearn.utils import resample
 from sklearn.model_selection import train_test_split
 
-def clean_data(df):
+# Low-cardinality text columns of the raw export, stored as `category`
+# (integer codes + one copy of each label instead of one string per row).
+# Student_ID/Name are near-unique and stay plain strings.
+CATEGORY_COLUMNS = [
+    'Gender', 'Education_Level', 'Employment_Status', 'City', 'Device_Type',
+    'Internet_Connection_Quality', 'Course_ID', 'Course_Name', 'Category',
+    'Course_Level', 'Payment_Mode', 'Fee_Paid', 'Discount_Used',
+]
+# Format of Enrollment_Date in the raw export (dd-mm-yyyy)
+DATE_FORMAT = '%d-%m-%Y'
+
+
+def _parse_months(values):
+    """
+    Month of each date string. Each distinct string is parsed once (a few
+    hundred enrollment dates repeat over millions of rows) and the result
+    is broadcast back with the factorize codes. The explicit format avoids
+    per-element format inference; strings it doesn't match fall back to
+    the old dayfirst inference. Missing dates give NaN.
+    """
+    codes, uniques = pd.factorize(values)
+    try:
+        dates = pd.to_datetime(uniques, format=DATE_FORMAT)
+    except (TypeError, ValueError):
+        dates = pd.to_datetime(uniques, dayfirst=True)
+    months = np.append(np.asarray(dates.month, dtype='float64'), np.nan)
+    # code -1 (missing) picks the trailing NaN
+    return pd.Series(months[codes], index=values.index)
+
+
+def downcast_dtypes(df, category_columns=CATEGORY_COLUMNS):
+    """
+    In place: low-cardinality text -> category, float64 -> float32,
+    int64 -> the smallest integer type that holds the values.
+    """
+    for col in df.columns:
+        dtype = df[col].dtype
+        if col in category_columns:
+            if not isinstance(dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype('category')
+        elif pd.api.types.is_bool_dtype(dtype):
+            continue
+        elif pd.api.types.is_float_dtype(dtype):
+            df[col] = df[col].astype('float32')
+        elif pd.api.types.is_integer_dtype(dtype):
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+
+def clean_data(df, inplace=False, downcast=True):
     """
     Basic data cleaning and date formatting.
+    inplace=True modifies and returns `df` instead of a new frame;
+    downcast=False keeps the input dtypes (see downcast_dtypes).
     """
-    df = df.copy()
-    
+    if not inplace:
+        # Only whole columns are replaced/dropped below, so the input is never written to
+        df = df.copy(deep=False)
+
     # Target variable transformation (Target Encoding)
     if 'Completed' in df.columns:
-        df['target'] = df['Completed'].apply(lambda x: 1 if x == 'Completed' else 0)
-        df = df.drop(columns=['Completed'])
-    
+        df['target'] = (df['Completed'] == 'Completed').astype('int8' if downcast else 'int64')
+        df.drop(columns=['Completed'], inplace=True)
+
     # Date conversion
     if 'Enrollment_Date' in df.columns:
-        df['Enrollment_Date'] = pd.to_datetime(df['Enrollment_Date'], dayfirst=True)
         # Deriving new feature from date (Month information)
-        df['Enrollment_Month'] = df['Enrollment_Date'].dt.month
-        df = df.drop(columns=['Enrollment_Date'])
-        
+        month = _parse_months(df['Enrollment_Date'])
+        if not month.isna().any():
+            month = month.astype('int8' if downcast else 'int32')
+        df['Enrollment_Month'] = month
+        df.drop(columns=['Enrollment_Date'], inplace=True)
+
+    if downcast:
+        downcast_dtypes(df)
     return df
 
 def split_data(df):
@@ -30,21 +88,61 @@ def split_data(df):
     y = df['target']
     return train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
 
+def balance_index(y, random_state=42):
+    """
+    Row positions of the balance_data result, without copying any rows:
+    all majority (0) positions followed by the minority (1) positions drawn
+    with replacement up to the majority count. Same draw as balance_data,
+    so df.iloc[balance_index(df.target)] is exactly its output.
+    """
+    y = np.asarray(y)
+    majority = np.flatnonzero(y == 0)
+    minority = np.flatnonzero(y == 1)
+    if len(minority) == 0 or len(minority) >= len(majority):
+        return np.arange(len(y))
+    picks = resample(np.arange(len(minority)), replace=True,
+                     n_samples=len(majority), random_state=random_state)
+    return np.concatenate([majority, minority[picks]])
+
+
+def balance_weights(y):
+    """
+    Sample weights with the same class totals as upsampling: each minority
+    row counts n_majority / n_minority times (no rows are copied).
+    Pass as fit(..., sample_weight=...).
+    """
+    y = np.asarray(y)
+    weights = np.ones(len(y), dtype=np.float32)
+    n_majority, n_minority = (y == 0).sum(), (y == 1).sum()
+    if 0 < n_minority < n_majority:
+        weights[y == 1] = n_majority / n_minority
+    return weights
+
+
+def balanced_batches(y, batch_size, random_state=42):
+    """
+    Stratified mini-batches of row positions: every batch is half majority,
+    half minority. One pass covers each majority row once (shuffled) and
+    draws the minority rows with replacement, like upsampling does.
+    """
+    rng = np.random.default_rng(random_state)
+    y = np.asarray(y)
+    majority = rng.permutation(np.flatnonzero(y == 0))
+    minority = np.flatnonzero(y == 1)
+    half = max(1, batch_size // 2)
+    for start in range(0, len(majority), half):
+        major = majority[start:start + half]
+        minor = rng.choice(minority, size=len(major), replace=True) if len(minority) else minority
+        yield rng.permutation(np.concatenate([major, minor]))
+
+
 def balance_data(train_df):
     """
     MANDATORY REQUIREMENT (III.2): Rebalancing Design Pattern.
     Addresses imbalance in training data using Upsampling.
+    See balance_index / balance_weights / balanced_batches for the
+    variants that don't duplicate rows.
     """
     print("Performing Rebalancing (Upsampling)...")
-    majority = train_df[train_df.target == 0]
-    minority = train_df[train_df.target == 1]
-    
-    # Minority class is upsampled to match the majority class
-    if len(minority) < len(majority):
-        minority_upsampled = resample(minority, 
-                                      replace=True, 
-                                      n_samples=len(majority), 
-                                      random_state=42)
-        return pd.concat([majority, minority_upsampled])
-    
-    return train_df
\ No newline at end of file
+    # Minority class is upsampled to match the majority class (one row take, no concat)
+    return train_df.iloc[balance_index(train_df['target'])]
@@ -0,0 +1,142 @@
+"""
+Content-addressed cache of pipeline stage outputs (Airflow DAG and
+run_pipeline.py).
+
+A stage's key is a hash of
+- the content of its inputs (files, or every file of a dataset directory)
+- its parameters (e.g. n_features, chunk size, storage format)
+- the source code of the modules that implement it
+
+After a stage ran, `<data_dir>/.stage_cache/<stage>.json` records the key
+and the content hash of every output. When the stage comes up again with
+the same key and its outputs still hash to the recorded values, it is
+skipped and the existing artifacts are reused. Paths in the metadata are
+relative to the data directory, so the DAG (/opt/airflow/data) and local
+runs (./data, the same volume) share the cache.
+
+STAGE_CACHE=0 disables it (every stage runs, nothing is recorded).
+"""
+import os
+import json
+import time
+import inspect
+import hashlib
+
+from src.model_io import atomic_path
+
+CACHE_DIR_NAME = '.stage_cache'
+STAGE_CACHE = os.getenv('STAGE_CACHE', '1') == '1'
+
+
+def _file_digest(path, h):
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+
+
+def content_hash(path):
+    """
+    Hash of a file, or of every file (names and content) under a directory.
+    None if the path doesn't exist.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    if os.path.isdir(path):
+        for directory, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                full = os.path.join(directory, name)
+                h.update(os.path.relpath(full, path).encode())
+                _file_digest(full, h)
+    elif os.path.isfile(path):
+        _file_digest(path, h)
+    else:
+        return None
+    return h.hexdigest()
+
+
+def source_hash(modules):
+    """
+    Hash of the source files of `modules` (the code version of a stage).
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for module in modules:
+        h.update(module.__name__.encode())
+        _file_digest(inspect.getsourcefile(module), h)
+    return h.hexdigest()
+
+
+class StageCache:
+    """
+    Stage metadata under <data_dir>/.stage_cache.
+    """
+
+    def __init__(self, data_dir, enabled=None):
+        self.data_dir = os.path.abspath(data_dir)
+        self.cache_dir = os.path.join(self.data_dir, CACHE_DIR_NAME)
+        self.enabled = STAGE_CACHE if enabled is None else enabled
+
+    def _relative(self, path):
+        path = os.path.abspath(path)
+        if os.path.commonpath([path, self.data_dir]) == self.data_dir:
+            return os.path.relpath(path, self.data_dir)
+        return path
+
+    def _metadata_path(self, stage):
+        return os.path.join(self.cache_dir, f"{stage}.json")
+
+    def key(self, stage, inputs=(), params=None, modules=()):
+        h = hashlib.blake2b(digest_size=16)
+        h.update(stage.encode())
+        for path in inputs:
+            # by content only: the same data under another mount point is the same input
+            h.update(str(content_hash(path)).encode())
+        h.update(json.dumps(params or {}, sort_keys=True, default=str).encode())
+        h.update(source_hash(modules).encode())
+        return h.hexdigest()
+
+    def lookup(self, stage, key, outputs):
+        """
+        True if `stage` last ran with `key` and its outputs are unchanged.
+        """
+        try:
+            with open(self._metadata_path(stage)) as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if saved.get('key') != key:
+            return False
+        recorded = saved.get('outputs', {})
+        for path in outputs:
+            digest = content_hash(path)
+            if digest is None or recorded.get(self._relative(path)) != digest:
+                return False
+        return True
+
+    def record(self, stage, key, outputs, seconds):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        metadata = {
+            'key': key,
+            'outputs': {self._relative(p): content_hash(p) for p in outputs},
+            'seconds': round(seconds, 3),
+            'finished_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        with atomic_path(self._metadata_path(stage)) as tmp:
+            with open(tmp, 'w') as f:
+                json.dump(metadata, f, indent=2)
+
+    def run(self, stage, fn, inputs=(), outputs=(), params=None, modules=()):
+        """
+        Runs fn() unless the cache holds `stage` for these inputs, params and
+        code. Returns True if it ran, False on a cache hit.
+        """
+        if not self.enabled:
+            fn()
+            return True
+        key = self.key(stage, inputs, params, modules)
+        if self.lookup(stage, key, outputs):
+            print(f"⏭️  {stage}: inputs, parameters and code unchanged, reusing {', '.join(map(self._relative, outputs))}")
+            return False
+        start = time.perf_counter()
+        fn()
+        self.record(stage, key, outputs, time.perf_counter() - start)
+        return True
@@ -0,0 +1,170 @@
+"""
+Pipeline stages shared by the Airflow DAG (dags/data_pipeline_dag.py) and
+the local run (run_pipeline.py).
+
+Every stage goes through the stage cache (src/stage_cache.py): it is
+skipped when its inputs, parameters and code are unchanged since the
+last run and its outputs are still there.
+"""
+import os
+import sys
+
+import pandas as pd
+
+from src import data_profile, features, ingest, preprocess, storage, validate, validation
+from src.ingest import load_data, iter_data, stream_to_dataset
+from src.validate import validate_input_data, StreamingValidator
+from src.preprocess import clean_data, split_data, balance_data
+from src.features import apply_feature_cross, apply_hashing
+from src.storage import stage_path, read_frame, write_frame, iter_partitions
+from src.stage_cache import StageCache
+
+# Buckets of the Student_ID hashing trick in the processed train/test files
+PROCESSED_HASH_FEATURES = 100
+
+
+class StagePaths:
+    """
+    Artifact locations under one data directory. Interim/processed files
+    use INTERIM_FORMAT; streaming runs (chunksize > 0) hand over
+    partitioned datasets (directories of part files) for steps 1-3.
+    """
+
+    def __init__(self, data_dir, chunksize=0):
+        self.data_dir = data_dir
+        self.chunksize = chunksize
+        self.raw = f'{data_dir}/raw/Course_Completion_Prediction.csv'
+        self.validated = self._interim('1_validated')
+        self.cleaned = self._interim('2_cleaned')
+        self.features = self._interim('3_features')
+        self.processed_dir = f'{data_dir}/processed'
+        self.train = stage_path(self.processed_dir, 'train_processed')
+        self.test = stage_path(self.processed_dir, 'test_processed')
+        self.models_dir = f'{data_dir}/models'
+
+    @property
+    def streaming(self):
+        return self.chunksize > 0
+
+    def _interim(self, name):
+        if self.streaming:
+            return f'{self.data_dir}/interim/{name}'
+        return stage_path(f'{self.data_dir}/interim', name)
+
+    def cache(self):
+        return StageCache(self.data_dir)
+
+
+def _run(paths, stage, fn, inputs, outputs, modules, **params):
+    params.update(chunksize=paths.chunksize, format=storage.DEFAULT_FORMAT, compression=storage.DEFAULT_COMPRESSION)
+    # the stage bodies are closures in this module: its source is part of every stage's code version
+    modules = [sys.modules[__name__]] + list(modules)
+    return paths.cache().run(stage, fn, inputs, outputs, params, modules)
+
+
+def ingest_validate(paths):
+    # Record rules include the categories of the last training run's profile,
+    # so a new profile is an input of the stage like the raw file
+    profile_path = os.path.join(paths.models_dir, data_profile.PROFILE_FILE)
+
+    def run():
+        rules = validation.default_rules(profile_path)
+        if paths.streaming:
+            # Validation statistics accumulate per chunk; nothing is kept if it fails
+            print("🔍 Starting Data Validation (streaming)...")
+            stream_to_dataset(iter_data(paths.raw, paths.chunksize), paths.validated,
+                              validator=StreamingValidator(rules=rules))
+            return
+
+        df = load_data(paths.raw)
+
+        # Standardize column names (remove hidden spaces)
+        df.columns = df.columns.str.strip()
+
+        # Validate data schema and quality
+        df = validate_input_data(df, rules)
+
+        # Save the validated data for the next step
+        write_frame(df, paths.validated)
+        print(f"Validated data saved to {paths.validated}")
+
+    return _run(paths, '1_ingest_validate', run, [paths.raw, profile_path], [paths.validated], [ingest, validate, validation, storage])
+
+
+def clean(paths):
+    def run():
+        if paths.streaming:
+            stream_to_dataset(iter_partitions(paths.validated), paths.cleaned, steps=[clean_data])
+            return
+
+        df = read_frame(paths.validated)
+
+        # Apply cleaning logic (Imputation, etc.)
+        df = clean_data(df)
+
+        # Save cleaned data
+        write_frame(df, paths.cleaned)
+        print(f"Cleaned data saved to {paths.cleaned}")
+
+    return _run(paths, '2_clean', run, [paths.validated], [paths.cleaned], [preprocess, ingest, storage])
+
+
+def feature_eng(paths):
+    def run():
+        if paths.streaming:
+            stream_to_dataset(iter_partitions(paths.cleaned), paths.features, steps=[apply_feature_cross])
+            return
+
+        df = read_frame(paths.cleaned)
+
+        # Apply Feature Crossing
+        df = apply_feature_cross(df)
+
+        # Save feature-engineered data
+        write_frame(df, paths.features)
+        print(f"Feature engineered data saved to {paths.features}")
+
+    return _run(paths, '3_feature_engineering', run, [paths.cleaned], [paths.features], [features, ingest, storage])
+
+
+def split_balance_save(paths):
+    def run():
+        # Splitting/balancing needs the whole training set (a dataset directory is read as one frame)
+        df = read_frame(paths.features)
+
+        # Split Data into Train/Test sets
+        X_train, X_test, y_train, y_test = split_data(df)
+
+        # Merge back to DataFrames for easier processing
+        train_df = pd.concat([X_train, y_train], axis=1)
+        test_df = pd.concat([X_test, y_test], axis=1)
+
+        # Balance Data (Applied ONLY to the Training Set to prevent data leakage)
+        train_df = balance_data(train_df)
+
+        # Apply Hashing Trick (For High Cardinality columns like Student_ID)
+        # The same logic is applied to both Train and Test sets independently
+        if 'Student_ID' in train_df.columns:
+            train_df = apply_hashing(train_df, 'Student_ID', n_features=PROCESSED_HASH_FEATURES)
+        if 'Student_ID' in test_df.columns:
+            test_df = apply_hashing(test_df, 'Student_ID', n_features=PROCESSED_HASH_FEATURES)
+
+        # Save Final Processed Artifacts
+        # The training script (train_model.py) will read these files
+        os.makedirs(paths.processed_dir, exist_ok=True)
+        write_frame(train_df, paths.train)
+        write_frame(test_df, paths.test)
+        print("Processed files saved successfully. Ready for training.")
+
+    return _run(paths, '4_split_balance_save', run, [paths.features], [paths.train, paths.test],
+                [preprocess, features, storage], n_features=PROCESSED_HASH_FEATURES)
+
+
+def train(paths):
+    """
+    Runs src/train_model.py main() through the cache (see its cache_spec).
+    """
+    from src import train_model
+
+    inputs, outputs, params, modules = train_model.cache_spec()
+    return paths.cache().run('5_train_model', train_model.main, inputs, outputs, params, modules)
@@ -0,0 +1,137 @@
+import os
+
+import pandas as pd
+
+# Interim/processed artifacts between pipeline stages.
+# parquet (default) and feather keep dtypes (categoricals, datetimes, ints)
+# and can read a subset of columns; csv is kept for inspection/compatibility.
+FORMATS = {
+    'parquet': '.parquet',
+    'feather': '.feather',
+    'csv': '.csv',
+}
+DEFAULT_FORMAT = os.getenv('INTERIM_FORMAT', 'parquet')
+DEFAULT_COMPRESSION = os.getenv('INTERIM_COMPRESSION', 'zstd')
+
+
+def _format_of(path, fmt=None):
+    if fmt:
+        if fmt not in FORMATS:
+            raise ValueError(f"❌ ERROR: Unknown storage format '{fmt}' (expected one of {list(FORMATS)})")
+        return fmt
+    ext = os.path.splitext(path)[1].lower()
+    for name, suffix in FORMATS.items():
+        if ext == suffix:
+            return name
+    raise ValueError(f"❌ ERROR: Can't infer storage format from '{path}'")
+
+
+def stage_path(directory, name, fmt=None):
+    """
+    data/interim + '2_cleaned' -> data/interim/2_cleaned.parquet
+    """
+    return os.path.join(directory, name + FORMATS[_format_of('', fmt or DEFAULT_FORMAT)])
+
+
+def write_frame(df, path, fmt=None, compression=None):
+    """
+    Writes a DataFrame in the format given by `fmt` or the file extension.
+    The index is not stored (stages always work on a fresh RangeIndex).
+    """
+    fmt = _format_of(path, fmt)
+    compression = compression or DEFAULT_COMPRESSION
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    if fmt == 'parquet':
+        df.to_parquet(path, index=False, compression=compression)
+    elif fmt == 'feather':
+        df.reset_index(drop=True).to_feather(path, compression=compression)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def read_frame(path, columns=None, fmt=None):
+    """
+    Reads a stage artifact. `columns` limits the read to those columns
+    (only they are decoded for parquet/feather; csv still scans the file).
+    A directory is read as a partitioned dataset (see write_partition).
+    """
+    if os.path.isdir(path):
+        return read_dataset(path, columns)
+    fmt = _format_of(path, fmt)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"ERROR: File not found -> {path}")
+
+    columns = list(columns) if columns is not None else None
+    if fmt == 'parquet':
+        return pd.read_parquet(path, columns=columns)
+    if fmt == 'feather':
+        return pd.read_feather(path, columns=columns)
+    return pd.read_csv(path, usecols=columns)
+
+
+# ----------------------------
+# Partitioned datasets (one part file per chunk, for streaming stages)
+# ----------------------------
+def write_partition(df, directory, part, fmt=None, compression=None):
+    """
+    Writes chunk number `part` of a dataset: <directory>/part-00000.parquet
+    """
+    fmt = fmt or DEFAULT_FORMAT
+    path = os.path.join(directory, f"part-{part:05d}{FORMATS[_format_of('', fmt)]}")
+    return write_frame(df, path, fmt, compression)
+
+
+def partition_paths(directory):
+    return sorted(
+        os.path.join(directory, f) for f in os.listdir(directory)
+        if f.startswith('part-') and os.path.splitext(f)[1] in FORMATS.values()
+    )
+
+
+def iter_partitions(directory, columns=None):
+    """
+    Yields the parts of a dataset one at a time, in order.
+    """
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"ERROR: Dataset not found -> {directory}")
+    for path in partition_paths(directory):
+        yield read_frame(path, columns)
+
+
+def read_dataset(directory, columns=None):
+    """
+    Reads a whole partitioned dataset into one DataFrame.
+    """
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"ERROR: Dataset not found -> {directory}")
+    paths = partition_paths(directory)
+    if not paths:
+        raise FileNotFoundError(f"ERROR: Dataset is empty -> {directory}")
+    return read_partitions(paths, columns)
+
+
+def read_partitions(paths, columns=None):
+    """
+    Reads some part files of a dataset into one DataFrame.
+    """
+    parts = [read_frame(path, columns) for path in paths]
+    return pd.concat(_unify_categories(parts), ignore_index=True)
+
+
+def _unify_categories(parts):
+    """
+    Chunks are written independently, so the same categorical column has
+    different categories in each part and pd.concat would fall back to
+    object. Gives every part the sorted union of the categories (same order as
+    astype('category') on the whole column).
+    """
+    for col in parts[0].columns:
+        if not all(isinstance(p[col].dtype, pd.CategoricalDtype) for p in parts if col in p):
+            continue
+        categories = pd.api.types.union_categoricals([p[col] for p in parts if col in p], sort_categories=True).categories
+        for p in parts:
+            if col in p:
+                p[col] = p[col].cat.set_categories(categories)
+    return parts
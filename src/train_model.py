@@ -1,18 +1,15 @@
 import sys
 import os
-import joblib
+import time
 import warnings
-import shutil
 import pandas as pd
 import numpy as np
 import mlflow
 import mlflow.sklearn
 import mlflow.xgboost
 from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, f1_score, mean_squared_error
 from sklearn.ensemble import RandomForestClassifier
 from xgboost import XGBClassifier, XGBRegressor
-from sklearn.preprocessing import LabelEncoder
 
 # --- Path Setup for Docker Environment ---
 # We add /opt/airflow to sys.path so Python can find custom modules inside the container
@@ -20,32 +17,91 @@ sys.path.append('/opt/airflow')
 
 try:
     from src.ingest import load_data
-    from src.preprocess import clean_data, balance_data
-    from src.features import apply_feature_cross, apply_hashing
+    from src.preprocess import clean_data, balance_data, balance_index, balance_weights
+    from src.pipeline_transformers import FeaturePipeline
+    from src.model_io import CHECKPOINT_DIR, native_path, atomic_dump, atomic_copy, load_model, export_native, publishing
+    from src.storage import stage_path, read_frame, read_dataset, read_partitions, partition_paths
+    from src.features import sparse_design_matrix
+    from src.experiments import ExperimentScheduler, RUNS_DIR, fingerprint, model_params, save_split, shared_split, score_model, model_input
+    from src.tuning import HyperparameterSearch
+    from src.incremental import PartitionTracker, continue_model
+    from src.data_profile import PROFILE_FILE, build_profile, save_profile
 except ImportError:
     # Fallback for local testing outside Docker
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
     from src.ingest import load_data
-    from src.preprocess import clean_data, balance_data
-    from src.features import apply_feature_cross, apply_hashing
+    from src.preprocess import clean_data, balance_data, balance_index, balance_weights
+    from src.pipeline_transformers import FeaturePipeline
+    from src.model_io import CHECKPOINT_DIR, native_path, atomic_dump, atomic_copy, load_model, export_native, publishing
+    from src.storage import stage_path, read_frame, read_dataset, read_partitions, partition_paths
+    from src.features import sparse_design_matrix
+    from src.experiments import ExperimentScheduler, RUNS_DIR, fingerprint, model_params, save_split, shared_split, score_model, model_input
+    from src.tuning import HyperparameterSearch
+    from src.incremental import PartitionTracker, continue_model
+    from src.data_profile import PROFILE_FILE, build_profile, save_profile
 
 warnings.filterwarnings("ignore")
 
 # --- Constants ---
-# Defined absolute paths for Docker environment
-CHECKPOINT_DIR = '/opt/airflow/data/models'
+# Defined absolute paths for Docker environment (CHECKPOINT_DIR: src/model_io.py)
 DATA_PATH = '/opt/airflow/data/raw/Course_Completion_Prediction.csv'
-BACKUP_DATA_PATH = '/opt/airflow/data/interim/3_features.csv'
+BACKUP_DATA_PATH = stage_path('/opt/airflow/data/interim', '3_features')
+if not os.path.exists(BACKUP_DATA_PATH) and os.path.isdir('/opt/airflow/data/interim/3_features'):
+    BACKUP_DATA_PATH = '/opt/airflow/data/interim/3_features'  # streaming DAG run (partitioned dataset)
+FEATURE_PIPELINE_FILE = 'feature_pipeline.pkl'
+# Full retrains write their models and feature pipeline here (inside
+# CHECKPOINT_DIR, skipped by the API's model discovery) and publish them together
+STAGING_DIR = '.staging'
+HASH_N_FEATURES = 50
+# High-cardinality columns for the hashing trick (comma separated). With
+# HASH_SPARSE=1 the hashed block is kept as a CSR matrix through training.
+HASH_COLUMNS = os.getenv('HASH_COLUMNS', 'Student_ID').split(',')
+HASH_SPARSE = os.getenv('HASH_SPARSE', '0') == '1'
+# upsample: duplicate minority rows before training (balance_data)
+# weights:  sample_weight in fit, no copies
+# index:    the upsampling draw of the training split as per-row repeat counts (sample_weight)
+BALANCE_STRATEGY = os.getenv('BALANCE_STRATEGY', 'upsample')
+BALANCE_STRATEGIES = ('upsample', 'weights', 'index')
+# Experiment scheduler: models trained at once (0 = all) and cores shared between them (0 = all CPUs)
+EXPERIMENT_WORKERS = int(os.getenv('EXPERIMENT_WORKERS', '0'))
+TRAIN_CORES = int(os.getenv('TRAIN_CORES', '0'))
+# Hyperparameter search before training (0 trials = off, default parameters)
+TUNING_TRIALS = int(os.getenv('TUNING_TRIALS', '0'))
+TUNING_BUDGET_SECONDS = float(os.getenv('TUNING_BUDGET_SECONDS', '600'))
+# Metric for tuning and for picking the model the API serves (accuracy | f1)
+SELECTION_METRIC = os.getenv('SELECTION_METRIC', 'accuracy')
+METRIC_COLUMNS = {'accuracy': 'Accuracy', 'f1': 'F1'}
+# full: rebuild every model on all data
+# incremental: continue the saved models on the partitions of INCREMENTAL_DATA_DIR they haven't
+#              seen (src/incremental.py); falls back to a full rebuild on drift/schema changes
+TRAIN_MODE = os.getenv('TRAIN_MODE', 'full')
+INCREMENTAL_DATA_DIR = os.getenv('INCREMENTAL_DATA_DIR', '/opt/airflow/data/interim/3_features')
+INCREMENTAL_ROUNDS = int(os.getenv('INCREMENTAL_ROUNDS', '20'))  # boosting rounds added per update
+INCREMENTAL_TREES = int(os.getenv('INCREMENTAL_TREES', '20'))  # trees added to the forest per update
+REFRAMED_MODEL = "XGBoost_Reframed_Regressor"
+MODEL_NAMES = ("RandomForest_Bagging", "XGBoost_Boosting", REFRAMED_MODEL)
 
 class MLEngineerPipeline:
     """
     Class responsible for running ML experiments, logging to MLflow,
     and saving model artifacts.
     """
-    def __init__(self, processed_dataframe, experiment_name="Course_Completion_MLOps"):
+    def __init__(self, processed_dataframe, experiment_name="Course_Completion_MLOps",
+                 hashed=None, hashed_cols=(), balance='upsample'):
+        if balance not in BALANCE_STRATEGIES:
+            raise ValueError(f"Unknown balance strategy '{balance}' (expected one of {BALANCE_STRATEGIES})")
         self.data = processed_dataframe
+        # 'upsample' data arrives already balanced; the others are applied to each training split
+        self.balance = balance
+        # Optional sparse hashed block (rows aligned with processed_dataframe)
+        self.hashed = hashed
+        self.hashed_cols = list(hashed_cols)
         self.experiment_name = experiment_name
         self.results = []
+        # Train/test split shared by all experiments (built on first use)
+        self._split = None
+        # Best parameters per model from tune()
+        self.tuned = {}
 
         # Initialize MLflow experiment
         mlflow.set_experiment(self.experiment_name)
@@ -54,121 +110,431 @@ class MLEngineerPipeline:
         if not os.path.exists(CHECKPOINT_DIR):
             os.makedirs(CHECKPOINT_DIR, exist_ok=True)
 
-    def run_classification_experiments(self):
+    def _features(self, drop_cols):
         """
-        Runs standard classification models (RandomForest, XGBoost).
+        Model input: the frame without drop_cols, plus the sparse hashed
+        block as one CSR matrix when there is one. Returns (X, feature names
+        for the CSR case or None).
         """
-        target_col = 'target' if 'target' in self.data.columns else 'Completed'
+        X = self.data.drop(columns=drop_cols)
+        if self.hashed is None:
+            return X, None
+        return sparse_design_matrix(X, self.hashed), list(X.columns) + self.hashed_cols
 
+    def _balanced(self, y_train):
+        """
+        Fit kwargs of the training split for the balance strategy. y_train
+        are the 0/1 labels; the reframing experiment trains on the same rows
+        with the same weights.
+        """
+        if self.balance == 'weights':
+            return {'sample_weight': balance_weights(y_train)}
+        if self.balance == 'index':
+            # How often balance_data would repeat each row, as frequency weights:
+            # the same draw as upsampling, but no row is copied
+            return {'sample_weight': np.bincount(balance_index(y_train), minlength=len(y_train))}
+        return {}
+
+    def _target_col(self):
+        target_col = 'target' if 'target' in self.data.columns else 'Completed'
         if target_col not in self.data.columns:
             print(f"Target column '{target_col}' not found. Available columns: {self.data.columns}")
             raise ValueError(f"Target column '{target_col}' missing.")
+        return target_col
 
-        # Drop target and auxiliary columns
-        drop_cols = [target_col, 'Progress_Percentage']
-        cols_to_drop = [c for c in drop_cols if c in self.data.columns]
-
-        X = self.data.drop(columns=cols_to_drop)
-        y = self.data[target_col]
+    def shared_split(self):
+        """
+        The train/test split every experiment uses, built once: one set of
+        row positions, the features as contiguous float32 (CSR with a sparse
+        hashed block) and both targets (see src.experiments.shared_split).
+        """
+        if self._split is None:
+            target_col = self._target_col()
+
+            # Drop target and auxiliary columns
+            drop_cols = [target_col, 'Progress_Percentage']
+            cols_to_drop = [c for c in drop_cols if c in self.data.columns]
+
+            X, names = self._features(cols_to_drop)
+            progress = self.data['Progress_Percentage'] if 'Progress_Percentage' in self.data.columns else None
+            self._split = shared_split(X, self.data[target_col], progress, names=names)
+            self._split['fit_kwargs'] = self._balanced(self._split['y_train'])
+        return self._split
+
+    def _params(self, name, **defaults):
+        # Tuned parameters (and number of trees/rounds) override the defaults
+        found = self.tuned.get(name)
+        if found is None:
+            return defaults
+        return {**defaults, **found['params'], 'n_estimators': found['n_estimators']}
+
+    def _classification_models(self):
+        """
+        Standard classification models (RandomForest, XGBoost).
+        """
+        return {
+            "RandomForest_Bagging": RandomForestClassifier(**self._params(
+                "RandomForest_Bagging", n_estimators=100, max_depth=10, random_state=42)),
+            "XGBoost_Boosting": XGBClassifier(**self._params(
+                "XGBoost_Boosting", n_estimators=100, learning_rate=0.1, max_depth=6, eval_metric="logloss",
+                random_state=42)),
+        }
 
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    def _reframing_models(self):
+        """
+        Experimental approach: Treat as Regression (predict %) then convert to Classification.
+        """
+        if 'Progress_Percentage' not in self.data.columns:
+            print("Skipping reframing experiment: 'Progress_Percentage' column missing.")
+            return {}
+        return {
+            "XGBoost_Reframed_Regressor": XGBRegressor(n_estimators=100, max_depth=6, learning_rate=0.1, random_state=42)
+        }
 
-        # Define models to compare
-        models = {
-            "RandomForest_Bagging": RandomForestClassifier(n_estimators=100, max_depth=10, random_state=42),
-            "XGBoost_Boosting": XGBClassifier(n_estimators=100, learning_rate=0.1, max_depth=6, eval_metric="logloss", random_state=42)
+    def _log_run(self, job, outcome):
+        """
+        MLflow run for a model trained by the scheduler (called in this process).
+        """
+        result = outcome['result']
+        with mlflow.start_run(run_name=job['name']):
+            mlflow.log_param("model_type", job['name'])
+            mlflow.log_param("balance", self.balance)
+            mlflow.log_param("train_mode", job.get('mode', 'full'))
+            if job['task'] == 'reframing':
+                mlflow.log_metric("rmse", result['RMSE'])
+                mlflow.log_metric("derived_accuracy", result['Accuracy'])
+            else:
+                mlflow.log_metric("accuracy", result['Accuracy'])
+                mlflow.log_metric("f1_score", result['F1'])
+            mlflow.log_metric("train_seconds", outcome['seconds'])
+            mlflow.sklearn.log_model(load_model(f"{job.get('out_dir', CHECKPOINT_DIR)}/{job['name']}.pkl"), "model")
+
+    def _log_trial(self, trial, outcome):
+        """
+        Nested MLflow run (inside the tuning run) for one search trial.
+        """
+        with mlflow.start_run(run_name=f"{trial['model']}_trial{trial['id']}_rung{trial['rung']}", nested=True):
+            mlflow.log_param("model_type", trial['model'])
+            mlflow.log_params(trial['params'])
+            mlflow.log_param("n_estimators", trial['resource'])
+            mlflow.log_param("rung", trial['rung'])
+            if outcome['best_iteration'] is not None:
+                mlflow.log_metric("best_iteration", outcome['best_iteration'])
+            if outcome['score'] is not None:
+                mlflow.log_metric(f"valid_{trial['metric']}", outcome['score'])
+            mlflow.log_metric("train_seconds", outcome['seconds'])
+
+    def tune(self, n_trials=27, budget_seconds=600, metric='accuracy', max_parallel=None):
+        """
+        Hyperparameter search for the classification models (src/tuning.py):
+        successive halving on a validation fold of the training split, within
+        budget_seconds. The best parameters are used by run_experiments.
+        """
+        data = self.shared_split()
+        # Validation fold for early stopping and ranking; the test split stays untouched
+        fit_idx, valid_idx = train_test_split(np.arange(len(data['y_train'])), test_size=0.2, random_state=42,
+                                              stratify=data['y_train'])
+        weights = data['fit_kwargs'].get('sample_weight')
+        tuning_data = {
+            'X_fit': data['X_train'][fit_idx], 'y_fit': data['y_train'][fit_idx],
+            'X_valid': data['X_train'][valid_idx], 'y_valid': data['y_train'][valid_idx],
+            'fit_kwargs': {} if weights is None else {'sample_weight': weights[fit_idx]},
         }
+        data_path = save_split(tuning_data, os.path.join(CHECKPOINT_DIR, RUNS_DIR, "tuning.joblib"))
+        search = HyperparameterSearch(data_path, metric=metric, budget_seconds=budget_seconds, n_trials=n_trials,
+                                      max_parallel=max_parallel or EXPERIMENT_WORKERS, cores=TRAIN_CORES)
+        try:
+            with mlflow.start_run(run_name="tuning"):
+                mlflow.log_param("n_trials", n_trials)
+                mlflow.log_param("budget_seconds", budget_seconds)
+                mlflow.log_param("metric", metric)
+                self.tuned = search.run(on_trial=self._log_trial)
+                for name, found in self.tuned.items():
+                    mlflow.log_metric(f"{name}_valid_{metric}", found['score'])
+        finally:
+            os.remove(data_path)
+        return self.tuned
+
+    def run_experiments(self, tasks=('classification', 'reframing'), max_parallel=None, out_dir=None):
+        """
+        Trains the models of all `tasks` concurrently (see src/experiments.py):
+        one worker process per model with the cores split between them, saved
+        to out_dir (default CHECKPOINT_DIR). Models that already finished on
+        the same data in an earlier attempt are skipped. Returns the scheduler
+        outcomes; results go to self.results.
+        """
+        models = {'classification': self._classification_models, 'reframing': self._reframing_models}
+        out_dir = out_dir or CHECKPOINT_DIR
+        os.makedirs(out_dir, exist_ok=True)
+        scheduler = ExperimentScheduler(CHECKPOINT_DIR, max_parallel=max_parallel or EXPERIMENT_WORKERS,
+                                        cores=TRAIN_CORES)
+        data_fingerprint = fingerprint(self.data, self.hashed_cols,
+                                       self.hashed if self.hashed is not None else None)
+
+        # One split file for all tasks
+        data_path = os.path.join(CHECKPOINT_DIR, RUNS_DIR, "split.joblib")
+        jobs = [
+            {'name': name, 'task': task, 'model': model, 'data_path': data_path, 'out_dir': out_dir,
+             'fingerprint': fingerprint(data_fingerprint, task, self.balance, model_params(model))}
+            for task in tasks for name, model in models[task]().items()
+        ]
+        # Written only if something still has to train on it
+        written = any(scheduler.completed(job) is None for job in jobs)
+        if written:
+            save_split(self.shared_split(), data_path)
+
+        try:
+            outcomes = scheduler.run(jobs, on_done=self._log_run)
+        finally:
+            if written and os.path.exists(data_path):
+                os.remove(data_path)
+        self.results.extend(outcome['result'] for outcome in outcomes)
+        return outcomes
+
+    def continue_training(self, rounds=20, trees=20):
+        """
+        Incremental update on self.data (new partitions only): each saved
+        model is scored on the new rows first, which it hasn't seen, then
+        continued on them (src.incremental.continue_model) and saved again.
+        """
+        target_col = self._target_col()
+        X = self.data.drop(columns=[c for c in (target_col, 'Progress_Percentage') if c in self.data.columns])
+        y = self.data[target_col].to_numpy()
+        progress = self.data['Progress_Percentage'].to_numpy() if 'Progress_Percentage' in self.data.columns else None
+        fit_kwargs = self._balanced(y)
+
+        for name in MODEL_NAMES:
+            task = 'reframing' if name == REFRAMED_MODEL else 'classification'
+            if task == 'reframing' and progress is None:
+                continue
+            path = f"{CHECKPOINT_DIR}/{name}.pkl"
+            model = load_model(path)
+            result = score_model(name, task, model, X, y, progress)
+
+            start = time.perf_counter()
+            continue_model(model, X, progress if task == 'reframing' else y, rounds, trees, fit_kwargs)
+            outcome = {'result': result, 'seconds': time.perf_counter() - start}
+            atomic_dump(model, path)
+            export_native(model, native_path(path))
+            print(f"  {name} -> Accuracy on the new rows: {result['Accuracy']:.4f}, updated in {outcome['seconds']:.1f}s")
+            self._log_run({'name': name, 'task': task, 'mode': 'incremental'}, outcome)
+            self.results.append(result)
+        return self.results
 
-        # Train and Evaluate
-        for name, model in models.items():
-            with mlflow.start_run(run_name=name):
-                print(f"Training {name}...")
-                model.fit(X_train, y_train)
-                preds = model.predict(X_test)
-
-                acc = accuracy_score(y_test, preds)
-                f1 = f1_score(y_test, preds)
-
-                # Log metrics and params
-                mlflow.log_param("model_type", name)
-                mlflow.log_metric("accuracy", acc)
-                mlflow.log_metric("f1_score", f1)
-
-                mlflow.sklearn.log_model(model, "model")
-                
-                # Save model locally
-                joblib.dump(model, f"{CHECKPOINT_DIR}/{name}.pkl")
-
-                self.results.append({
-                    "Model": name,
-                    "Task": "Classification",
-                    "Accuracy": acc,
-                    "F1": f1,
-                    "RMSE": None
-                })
-                print(f"  {name} -> Accuracy: {acc:.4f}")
+    def run_classification_experiments(self):
+        """
+        Runs standard classification models (RandomForest, XGBoost).
+        """
+        return self.run_experiments(('classification',))
 
     def run_reframing_experiment(self):
         """
         Experimental approach: Treat as Regression (predict %) then convert to Classification.
         """
-        if 'Progress_Percentage' not in self.data.columns:
-            print("Skipping reframing experiment: 'Progress_Percentage' column missing.")
-            return
+        return self.run_experiments(('reframing',))
 
-        target_col = 'target' if 'target' in self.data.columns else 'Completed'
+    def get_results_table(self):
+        return pd.DataFrame(self.results).sort_values(by="Accuracy", ascending=False)
 
-        cols_to_drop = [target_col, 'Progress_Percentage']
-        real_drop = [c for c in cols_to_drop if c in self.data.columns]
+    def best_model(self, metric='accuracy'):
+        """
+        Name of the best classification model by `metric` (the reframed
+        regressor predicts a percentage, so the API can't serve it).
+        """
+        if metric not in METRIC_COLUMNS:
+            raise ValueError(f"Unknown metric '{metric}' (expected one of {tuple(METRIC_COLUMNS)})")
+        table = self.get_results_table()
+        table = table[table["Task"] == "Classification"]
+        return table.sort_values(by=METRIC_COLUMNS[metric], ascending=False)["Model"].iloc[0]
 
-        X = self.data.drop(columns=real_drop)
-        y_reg = self.data['Progress_Percentage']
-        y_class_true = self.data[target_col]
+def publish_best_model(pipeline):
+    """
+    Copies the best classification model by SELECTION_METRIC to 'model.pkl'
+    so the API can find it easily. Copies are atomic (temp file + rename):
+    a running API hot-reloads them safely.
+    """
+    best_name = pipeline.best_model(SELECTION_METRIC)
+    best_model_source = f"{CHECKPOINT_DIR}/{best_name}.pkl"
+    final_model_dest = f"{CHECKPOINT_DIR}/model.pkl"
+
+    if os.path.exists(best_model_source):
+        atomic_copy(best_model_source, final_model_dest)
+        # Native XGBoost copy: version-independent, no unpickling at API start-up
+        if os.path.exists(native_path(best_model_source)):
+            atomic_copy(native_path(best_model_source), native_path(final_model_dest))
+        elif os.path.exists(native_path(final_model_dest)):
+            # e.g. RandomForest won: don't leave the previous XGBoost model next to it
+            os.remove(native_path(final_model_dest))
+        print(f"✅ Best model ({best_name}, {SELECTION_METRIC}) copied to {final_model_dest} for API usage.")
+    else:
+        print(f"⚠️ Warning: Could not find {best_model_source} to set as default.")
+
+
+def publish_models(pipeline, staging_dir):
+    """
+    Copies the models and the feature pipeline of a full retrain from
+    staging_dir into CHECKPOINT_DIR, then the best model to 'model.pkl'.
+    The API's model watcher doesn't reload until all of them are in place.
+    The staged copies stay: a retry on the same data skips their training.
+    """
+    with publishing(CHECKPOINT_DIR):
+        for fname in sorted(os.listdir(staging_dir)):
+            if not fname.startswith('.'):
+                atomic_copy(os.path.join(staging_dir, fname), os.path.join(CHECKPOINT_DIR, fname))
+        publish_best_model(pipeline)
 
-        # Split
-        X_train, X_test, y_train, y_test = train_test_split(X, y_reg, test_size=0.2, random_state=42)
-        _, _, _, y_test_class = train_test_split(X, y_class_true, test_size=0.2, random_state=42)
 
-        model_name = "XGBoost_Reframed_Regressor"
-        model = XGBRegressor(n_estimators=100, max_depth=6, learning_rate=0.1, random_state=42)
+def save_data_profile(pipeline, clean_df):
+    """
+    Writes the training data profile next to model.pkl (src/data_profile.py):
+    the cleaned training data and the published model's probabilities on
+    the test split. The API's drift checks and input validation read it.
+    """
+    start = time.perf_counter()
+    probabilities = None
+    model_path = f"{CHECKPOINT_DIR}/model.pkl"
+    if os.path.exists(model_path):
+        model = load_model(model_path)
+        data = pipeline.shared_split()
+        X_test = model_input(model, data['X_test'])
+        if hasattr(model, 'feature_names_in_') and isinstance(X_test, np.ndarray):
+            X_test = pd.DataFrame(X_test, columns=data['names'])
+        probabilities = model.predict_proba(X_test)[:, 1]
+    path = f"{CHECKPOINT_DIR}/{PROFILE_FILE}"
+    save_profile(build_profile(clean_df, probabilities), path)
+    print(f"Data profile saved to {path} ({time.perf_counter() - start:.2f}s)")
+
+
+def train_full(raw_df):
+    """
+    Rebuilds every model from raw_df (steps 2-5 of main). Returns the
+    cleaned frame and the fitted feature pipeline.
+    """
+    # 2. Pipeline Steps (Preprocessing & Feature Engineering)
+    # Note: Even if Airflow did these steps, we re-run them here to ensure
+    # the training script is self-contained and consistent.
+    print("Preprocessing data...")
+    clean_df = clean_data(raw_df)
+    # Other strategies balance each training split without copying rows (see MLEngineerPipeline)
+    balanced_df = balance_data(clean_df) if BALANCE_STRATEGY == 'upsample' else clean_df
+
+    # Feature Cross + Hashing Trick + category codes, fitted once and saved
+    # so the API applies exactly the same transformation at serving time
+    feature_pipeline = FeaturePipeline(
+        hash_col=HASH_COLUMNS[0] if len(HASH_COLUMNS) == 1 else HASH_COLUMNS,
+        n_features=HASH_N_FEATURES, sparse_hashing=HASH_SPARSE,
+    )
+    if HASH_SPARSE:
+        final_df, hashed = feature_pipeline.fit_transform_sparse(balanced_df)
+        print(f"Data Ready for Training. Shape: {final_df.shape} + sparse hashed block {hashed.shape}")
+        pipeline = MLEngineerPipeline(final_df, hashed=hashed, hashed_cols=feature_pipeline.hashed_cols,
+                                      balance=BALANCE_STRATEGY)
+    else:
+        final_df = feature_pipeline.fit_transform(balanced_df)
+        print(f"Data Ready for Training. Shape: {final_df.shape}")
+        pipeline = MLEngineerPipeline(final_df, balance=BALANCE_STRATEGY)
 
-        with mlflow.start_run(run_name=model_name):
-            print(f"Training {model_name}...")
-            model.fit(X_train, y_train)
-            preds_percent = model.predict(X_test)
+    # 3. Run Experiments (all candidate models at once, finished ones skipped on retries)
+    if TUNING_TRIALS > 0:
+        pipeline.tune(n_trials=TUNING_TRIALS, budget_seconds=TUNING_BUDGET_SECONDS, metric=SELECTION_METRIC)
+    # Models and pipeline go live together (step 5): a running API never
+    # serves a new model with the previous run's feature pipeline
+    staging_dir = os.path.join(CHECKPOINT_DIR, STAGING_DIR)
+    pipeline.run_experiments(out_dir=staging_dir)
+    atomic_dump(feature_pipeline, f"{staging_dir}/{FEATURE_PIPELINE_FILE}")
 
-            # Convert Regression output to Classification (Threshold: 50%)
-            preds_class = [1 if p >= 50.0 else 0 for p in preds_percent]
+    # 4. Report Results
+    print("\n--- EXPERIMENT RESULTS REPORT ---")
+    print(pipeline.get_results_table())
 
-            rmse = np.sqrt(mean_squared_error(y_test, preds_percent))
-            acc = accuracy_score(y_test_class, preds_class)
+    # 5. Publish the models, the feature pipeline and the best model for API usage
+    publish_models(pipeline, staging_dir)
+    print(f"\nModels and feature pipeline saved to '{CHECKPOINT_DIR}' directory.")
 
-            mlflow.log_param("model_type", model_name)
-            mlflow.log_metric("rmse", rmse)
-            mlflow.log_metric("derived_accuracy", acc)
+    # 6. Training data profile (drift baseline + validation reference for the API)
+    save_data_profile(pipeline, clean_df)
+    return clean_df, feature_pipeline
 
-            mlflow.sklearn.log_model(model, "model")
-            joblib.dump(model, f"{CHECKPOINT_DIR}/{model_name}.pkl")
 
-            self.results.append({
-                "Model": model_name,
-                "Task": "Reframing (Reg->Clf)",
-                "Accuracy": acc,
-                "F1": None,
-                "RMSE": rmse
-            })
-            print(f"  {model_name} -> Derived Accuracy: {acc:.4f}")
+def train_incremental(dataset_dir):
+    """
+    TRAIN_MODE=incremental: continues the saved models on the partitions of
+    dataset_dir they haven't consumed yet, or rebuilds them on all
+    partitions when the guard finds a reason to (see src/incremental.py).
+    Returns 'full', 'incremental' or None (nothing new).
+    """
+    start = time.perf_counter()
+    tracker = PartitionTracker(CHECKPOINT_DIR)
+    paths = partition_paths(dataset_dir)
+    new_paths = tracker.pending(paths)
+    feature_pipeline_path = f"{CHECKPOINT_DIR}/{FEATURE_PIPELINE_FILE}"
+
+    if tracker.manifest is None:
+        reasons = ["no previous incremental training"]
+    elif not new_paths:
+        changed = tracker.changed(paths)
+        if not changed:
+            print("✅ No new partitions since the last training, models unchanged.")
+            return None
+        reasons = [f"consumed partitions changed ({', '.join(changed)})"]
+    else:
+        new_df = clean_data(read_partitions(new_paths))
+        feature_pipeline = load_model(feature_pipeline_path) if os.path.exists(feature_pipeline_path) else None
+        reasons = tracker.retrain_reasons(paths, new_df, feature_pipeline,
+                                          [f"{CHECKPOINT_DIR}/{name}.pkl" for name in MODEL_NAMES])
+
+    if reasons:
+        print(f"🔁 Full retrain on {len(paths)} partitions: {'; '.join(reasons)}")
+        clean_df, feature_pipeline = train_full(read_dataset(dataset_dir))
+        tracker.record(paths, clean_df, feature_pipeline.numeric_cols)
+        mode = 'full'
+    else:
+        print(f"➕ Incremental update on {len(new_paths)} new partitions ({len(new_df)} rows)")
+        balanced_df = balance_data(new_df) if BALANCE_STRATEGY == 'upsample' else new_df
+        pipeline = MLEngineerPipeline(feature_pipeline.transform(balanced_df), balance=BALANCE_STRATEGY)
+        pipeline.continue_training(INCREMENTAL_ROUNDS, INCREMENTAL_TREES)
+        tracker.record(new_paths)
+        publish_best_model(pipeline)
+        mode = 'incremental'
+    print(f"⏱️ {mode} training took {time.perf_counter() - start:.1f}s")
+    return mode
+
+
+def cache_spec():
+    """
+    (inputs, outputs, params, modules) of main() for the stage cache
+    (src/stages.py): the training data of the current TRAIN_MODE, the
+    published and per-model checkpoints, the settings that change them.
+    """
+    from src import data_profile, experiments, features, incremental, model_io, pipeline_transformers, preprocess, tuning
+
+    if TRAIN_MODE == 'incremental':
+        inputs = [INCREMENTAL_DATA_DIR]
+    else:
+        inputs = [DATA_PATH if os.path.exists(DATA_PATH) else BACKUP_DATA_PATH]
+    outputs = [os.path.join(CHECKPOINT_DIR, name) for name in ('model.pkl', FEATURE_PIPELINE_FILE, PROFILE_FILE)]
+    outputs += [os.path.join(CHECKPOINT_DIR, f"{name}.pkl") for name in MODEL_NAMES]
+    params = {
+        'train_mode': TRAIN_MODE, 'hash_columns': HASH_COLUMNS, 'hash_n_features': HASH_N_FEATURES,
+        'hash_sparse': HASH_SPARSE, 'balance': BALANCE_STRATEGY, 'tuning_trials': TUNING_TRIALS,
+        'tuning_budget_seconds': TUNING_BUDGET_SECONDS, 'selection_metric': SELECTION_METRIC,
+        'incremental_rounds': INCREMENTAL_ROUNDS, 'incremental_trees': INCREMENTAL_TREES,
+    }
+    modules = [sys.modules[__name__], data_profile, experiments, features, incremental, model_io,
+               pipeline_transformers, preprocess, tuning]
+    return inputs, outputs, params, modules
 
-    def get_results_table(self):
-        return pd.DataFrame(self.results).sort_values(by="Accuracy", ascending=False)
 
 # --- MAIN EXECUTION FUNCTION ---
 # This function is what Airflow imports and runs.
 def main():
     print("🚀 Training process started inside Airflow...")
-    
+
     try:
+        if TRAIN_MODE == 'incremental':
+            train_incremental(INCREMENTAL_DATA_DIR)
+            return
+
         # 1. Load Data
         # Try loading raw data first, otherwise fallback to interim data
         if os.path.exists(DATA_PATH):
@@ -176,52 +542,11 @@ def main():
             raw_df = load_data(DATA_PATH)
         elif os.path.exists(BACKUP_DATA_PATH):
             print(f"Raw data not found. Loading interim data from {BACKUP_DATA_PATH}")
-            raw_df = pd.read_csv(BACKUP_DATA_PATH)
+            raw_df = read_frame(BACKUP_DATA_PATH)
         else:
             raise FileNotFoundError(f"Data not found at {DATA_PATH} or {BACKUP_DATA_PATH}")
 
-        # 2. Pipeline Steps (Preprocessing & Feature Engineering)
-        # Note: Even if Airflow did these steps, we re-run them here to ensure
-        # the training script is self-contained and consistent.
-        print("Preprocessing data...")
-        clean_df = clean_data(raw_df)
-        balanced_df = balance_data(clean_df)
-        df_crossed = apply_feature_cross(balanced_df)
-
-        if 'Student_ID' in df_crossed.columns:
-            final_df = apply_hashing(df_crossed, 'Student_ID', n_features=50)
-        else:
-            final_df = df_crossed
-
-        # Label Encoding for Object columns
-        object_cols = final_df.select_dtypes(include=['object']).columns
-        le = LabelEncoder()
-        for col in object_cols:
-            if col != 'target' and 'hashed' not in col:
-                final_df[col] = le.fit_transform(final_df[col].astype(str))
-
-        print(f"Data Ready for Training. Shape: {final_df.shape}")
-
-        # 3. Run Experiments
-        pipeline = MLEngineerPipeline(final_df)
-        pipeline.run_classification_experiments()
-        pipeline.run_reframing_experiment()
-
-        # 4. Report Results
-        print("\n--- EXPERIMENT RESULTS REPORT ---")
-        print(pipeline.get_results_table())
-        print(f"\nModels saved to '{CHECKPOINT_DIR}' directory.")
-        
-        # 5. Save the Best Model for API Usage
-        # We copy the standard XGBoost model to 'model.pkl' so the API can find it easily.
-        best_model_source = f"{CHECKPOINT_DIR}/XGBoost_Boosting.pkl"
-        final_model_dest = f"{CHECKPOINT_DIR}/model.pkl"
-        
-        if os.path.exists(best_model_source):
-            shutil.copy(best_model_source, final_model_dest)
-            print(f"✅ Best model copied to {final_model_dest} for API usage.")
-        else:
-            print("⚠️ Warning: Could not find XGBoost model to set as default.")
+        train_full(raw_df)
 
     except Exception as e:
         print(f"❌ Critical Error in Training: {e}")
@@ -0,0 +1,226 @@
+"""
+Hyperparameter search for MLEngineerPipeline: random search with
+successive halving.
+
+Every model in SEARCH_SPACES gets `n_trials` random configurations. They
+are scored on a validation fold of the training split with a small
+resource (boosting rounds for XGBoost, trees for RandomForest); the best
+1/eta move on to the next rung with eta times the resource, until one
+rung holds the full MAX_RESOURCE. XGBoost trials use early stopping on
+the validation fold, so the tuned model also gets its number of rounds.
+
+Budget
+------
+The search shares one wall-clock deadline between the models (each gets
+an equal share of what is left). No trial starts after its model's
+deadline, and running ones stop at it: XGBoost through a training
+callback, RandomForest between blocks of trees (it grows with
+warm_start). Trials cut short are not ranked. When no trial of a model
+finished, it keeps its default parameters.
+
+Trials run concurrently in a spawn process pool with the cores split
+between them (see src/experiments.py); results come back to the parent,
+which logs them (MLflow nested runs in MLEngineerPipeline.tune).
+"""
+import os
+import math
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+
+import joblib
+import numpy as np
+import xgboost as xgb
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score, f1_score
+from xgboost import XGBClassifier
+
+from src.experiments import core_budget, model_input
+
+# Selection metrics (higher is better), computed on predicted classes
+METRICS = {'accuracy': accuracy_score, 'f1': f1_score}
+# (kind, low, high) for int / float / log-uniform, ('choice', options)
+SEARCH_SPACES = {
+    'XGBoost_Boosting': {
+        'max_depth': ('int', 3, 10),
+        'learning_rate': ('log', 0.01, 0.3),
+        'min_child_weight': ('log', 0.5, 10.0),
+        'subsample': ('float', 0.6, 1.0),
+        'colsample_bytree': ('float', 0.5, 1.0),
+        'reg_lambda': ('log', 0.1, 10.0),
+    },
+    'RandomForest_Bagging': {
+        'max_depth': ('int', 4, 20),
+        'min_samples_leaf': ('int', 1, 20),
+        'max_features': ('choice', ['sqrt', 'log2', 0.5]),
+    },
+}
+# Resource of the last rung: boosting rounds (upper bound for early stopping) / trees
+MAX_RESOURCE = {'XGBoost_Boosting': 400, 'RandomForest_Bagging': 200}
+EARLY_STOPPING_ROUNDS = 20
+# RandomForest trials check the deadline after every block of trees
+RF_BLOCK = 25
+
+
+def sample_params(space, rng):
+    params = {}
+    for name, spec in space.items():
+        kind = spec[0]
+        if kind == 'int':
+            params[name] = int(rng.integers(spec[1], spec[2] + 1))
+        elif kind == 'float':
+            params[name] = float(rng.uniform(spec[1], spec[2]))
+        elif kind == 'log':
+            params[name] = float(math.exp(rng.uniform(math.log(spec[1]), math.log(spec[2]))))
+        else:
+            params[name] = spec[1][int(rng.integers(len(spec[1])))]
+    return params
+
+
+def rung_resources(max_resource, n_trials, eta):
+    """
+    Resource per rung, e.g. 400 rounds, 27 trials, eta 3 -> [15, 44, 133, 400].
+    """
+    n_rungs = int(math.log(max(n_trials, 1), eta) + 1e-9) + 1
+    return [max(1, round(max_resource / eta ** (n_rungs - 1 - i))) for i in range(n_rungs)]
+
+
+class _Deadline(xgb.callback.TrainingCallback):
+    def __init__(self, deadline):
+        super().__init__()
+        self.deadline = deadline
+        self.hit = False
+
+    def after_iteration(self, model, epoch, evals_log):
+        self.hit = time.time() >= self.deadline
+        return self.hit
+
+
+def run_trial(trial, threads=None):
+    """
+    Fits one configuration with trial['resource'] and scores it on the
+    validation fold. Runs in a pool worker (or inline).
+
+    trial: model, params, resource, data_path, metric, deadline (time.time()).
+    The data file holds X_fit, y_fit, X_valid, y_valid and fit_kwargs.
+    """
+    data = joblib.load(trial['data_path'], mmap_mode='r')
+    start = time.perf_counter()
+    out = {'best_iteration': None}
+
+    if trial['model'] == 'XGBoost_Boosting':
+        deadline = _Deadline(trial['deadline'])
+        model = XGBClassifier(n_estimators=trial['resource'], eval_metric='logloss', random_state=42,
+                              early_stopping_rounds=EARLY_STOPPING_ROUNDS, callbacks=[deadline],
+                              n_jobs=threads, **trial['params'])
+        model.fit(data['X_fit'], data['y_fit'], eval_set=[(data['X_valid'], data['y_valid'])],
+                  verbose=False, **data['fit_kwargs'])
+        truncated = deadline.hit
+        if not truncated:
+            # (not set when the deadline stopped training before early stopping ran)
+            out['best_iteration'] = int(model.best_iteration)
+    else:
+        model = RandomForestClassifier(warm_start=True, random_state=42, n_jobs=threads, **trial['params'])
+        # Same forest as one fit with n_estimators=resource (warm_start keeps the seeds)
+        n_trees, truncated = 0, False
+        while n_trees < trial['resource'] and not truncated:
+            n_trees = min(n_trees + RF_BLOCK, trial['resource'])
+            model.set_params(n_estimators=n_trees).fit(model_input(model, data['X_fit']), data['y_fit'],
+                                                       **data['fit_kwargs'])
+            truncated = n_trees < trial['resource'] and time.time() >= trial['deadline']
+
+    out['truncated'] = truncated
+    if not truncated:
+        preds = model.predict(model_input(model, data['X_valid']))
+        out['score'] = float(METRICS[trial['metric']](data['y_valid'], preds))
+    else:
+        out['score'] = None
+    out['seconds'] = time.perf_counter() - start
+    return out
+
+
+class HyperparameterSearch:
+    """
+    Successive halving over SEARCH_SPACES within budget_seconds.
+
+    on_trial(trial, outcome) is called in the parent for every finished
+    trial (MLflow logging).
+    """
+
+    def __init__(self, data_path, metric='accuracy', budget_seconds=600, n_trials=27, eta=3,
+                 max_parallel=None, cores=None, seed=42):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric '{metric}' (expected one of {tuple(METRICS)})")
+        self.data_path = data_path
+        self.metric = metric
+        self.budget_seconds = budget_seconds
+        self.n_trials = n_trials
+        self.eta = eta
+        self.max_parallel = max_parallel
+        self.cores = cores
+        self.seed = seed
+
+    def _evaluate(self, trials, deadline, pool, threads, on_trial):
+        if pool is None:
+            outcomes = [(trial, run_trial(trial, threads)) for trial in trials if time.time() < deadline]
+        else:
+            futures = [pool.submit(run_trial, trial, threads) for trial in trials]
+            _, not_done = wait(futures, timeout=max(0.0, deadline - time.time()))
+            # Trials that haven't started are dropped; running ones stop at the deadline themselves
+            for future in not_done:
+                future.cancel()
+            outcomes = [(trial, future.result()) for trial, future in zip(trials, futures) if not future.cancelled()]
+        for trial, outcome in outcomes:
+            if on_trial is not None:
+                on_trial(trial, outcome)
+        return [(trial, outcome) for trial, outcome in outcomes if outcome['score'] is not None]
+
+    def _search(self, name, deadline, pool, threads, on_trial):
+        rng = np.random.default_rng(self.seed)
+        candidates = [{'id': i, 'params': sample_params(SEARCH_SPACES[name], rng)} for i in range(self.n_trials)]
+        best = None
+        for rung, resource in enumerate(rung_resources(MAX_RESOURCE[name], self.n_trials, self.eta)):
+            if not candidates or time.time() >= deadline:
+                break
+            trials = [{**c, 'model': name, 'rung': rung, 'resource': resource, 'data_path': self.data_path,
+                       'metric': self.metric, 'deadline': deadline} for c in candidates]
+            scored = sorted(self._evaluate(trials, deadline, pool, threads, on_trial), key=lambda t: -t[1]['score'])
+            if not scored:
+                break
+            trial, outcome = scored[0]
+            best = {'params': trial['params'], 'score': outcome['score'], 'rung': rung,
+                    'n_estimators': resource if outcome['best_iteration'] is None else outcome['best_iteration'] + 1}
+            candidates = [t for t, _ in scored[:max(1, len(scored) // self.eta)]]
+        return best
+
+    def run(self, names=tuple(SEARCH_SPACES), on_trial=None):
+        """
+        Returns {model name: {'params', 'n_estimators', 'score', 'rung'}}
+        for every model with at least one finished trial.
+        """
+        end = time.time() + self.budget_seconds
+        cores = self.cores or os.cpu_count() or 1
+        n_parallel = min(self.n_trials, self.max_parallel or self.n_trials, cores)
+        threads = core_budget(n_parallel, cores)
+        pool = None
+        if n_parallel > 1:
+            # spawn: forking a process whose OpenMP runtime is already in use can deadlock
+            pool = ProcessPoolExecutor(max_workers=n_parallel, mp_context=multiprocessing.get_context('spawn'))
+        print(f"🔎 Tuning {', '.join(names)}: {self.n_trials} trials each, {self.budget_seconds:.0f}s budget, "
+              f"{n_parallel} at a time, {threads} threads each")
+        best = {}
+        try:
+            for i, name in enumerate(names):
+                # Equal share of the remaining budget per model
+                deadline = time.time() + (end - time.time()) / (len(names) - i)
+                found = self._search(name, deadline, pool, threads, on_trial)
+                if found is None:
+                    print(f"⚠️ {name}: no trial finished within the budget, keeping the default parameters")
+                    continue
+                best[name] = found
+                print(f"  {name} -> {self.metric}: {found['score']:.4f} (rung {found['rung']}), "
+                      f"n_estimators={found['n_estimators']}, {found['params']}")
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        return best
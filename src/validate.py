@@ -1,30 +1,72 @@
-import pandas as pd
-
-def validate_input_data(df):
-    """
-    MANDATORY REQUIREMENT (III.3): Monitoring & Statistical Checks.
-    Checks data quality using logic similar to Great Expectations.
-    Stops the pipeline in case of error.
-    """
-    print("🔍 Starting Data Validation...")
-    
-    # 1. Mandatory Column Check (Schema Check)
-    required_columns = ['Student_ID', 'Category', 'Course_Level', 'Completed']
-    missing_cols = [col for col in required_columns if col not in df.columns]
-    
-    if missing_cols:
-        raise ValueError(f"❌ ERROR: Missing columns: {missing_cols}")
-    
-    # 2. Null Value Check (Completeness Check)
-    # Critical columns must not contain null values
-    if df[required_columns].isnull().any().any():
-        null_counts = df[required_columns].isnull().sum()
-        raise ValueError(f"❌ ERROR: Null values (NaN) found in critical columns:\n{null_counts}")
-        
-    # 3. Cardinality/Size Check (Statistical Check)
-    # Example: Raise error if the dataset is empty
-    if len(df) == 0:
-        raise ValueError("❌ ERROR: Dataset is empty!")
-        
-    print("✅ Validation Successful: Data schema and quality are valid.")
-    return df
\ No newline at end of file
+import pandas as pd
+
+from src.validation import default_rules
+
+REQUIRED_COLUMNS = ['Student_ID', 'Category', 'Course_Level', 'Completed']
+
+
+class StreamingValidator:
+    """
+    validate_input_data for data that arrives in chunks: update() checks
+    each chunk and accumulates the statistics, finalize() raises once all
+    chunks were seen. Memory use does not depend on the number of rows.
+
+    The record rules of src/validation.py (ranges, categories, duplicates
+    within a chunk, cross-field rules) are evaluated per chunk too; their
+    violation counts are reported by finalize() but do not fail the run.
+    """
+
+    def __init__(self, required_columns=REQUIRED_COLUMNS, rules=None):
+        self.required_columns = list(required_columns)
+        self.rules = rules or default_rules()
+        self.null_counts = pd.Series(0, index=self.required_columns, dtype='int64')
+        self.violations = pd.Series(0, index=[r.name for r in self.rules.rules], dtype='int64')
+        self.invalid_rows = 0
+        self.n_rows = 0
+        self.n_chunks = 0
+
+    def update(self, df):
+        # 1. Mandatory Column Check (Schema Check) - every chunk has the same header
+        missing_cols = [col for col in self.required_columns if col not in df.columns]
+        if missing_cols:
+            raise ValueError(f"❌ ERROR: Missing columns: {missing_cols}")
+
+        # 2. Null Value Check (Completeness Check) - counted now, judged in finalize()
+        self.null_counts += df[self.required_columns].isnull().sum()
+
+        # 3. Record rules (types, ranges, categories, cross-field) - reported in finalize()
+        report = self.rules.validate_frame(df)
+        self.violations += report.counts
+        self.invalid_rows += report.n_invalid
+        self.n_rows += len(df)
+        self.n_chunks += 1
+        return df
+
+    def finalize(self):
+        # Critical columns must not contain null values
+        if self.null_counts.any():
+            raise ValueError(f"❌ ERROR: Null values (NaN) found in critical columns:\n{self.null_counts}")
+
+        # 4. Cardinality/Size Check (Statistical Check)
+        # Example: Raise error if the dataset is empty
+        if self.n_rows == 0:
+            raise ValueError("❌ ERROR: Dataset is empty!")
+
+        if self.invalid_rows:
+            violations = self.violations[self.violations > 0]
+            print(f"⚠️ {self.invalid_rows}/{self.n_rows} rows violate record rules:\n{violations.to_string()}")
+
+        print("✅ Validation Successful: Data schema and quality are valid.")
+
+
+def validate_input_data(df, rules=None):
+    """
+    MANDATORY REQUIREMENT (III.3): Monitoring & Statistical Checks.
+    Checks data quality using logic similar to Great Expectations.
+    Stops the pipeline in case of error.
+    """
+    print("🔍 Starting Data Validation...")
+    validator = StreamingValidator(rules=rules)
+    validator.update(df)
+    validator.finalize()
+    return df
@@ -0,0 +1,372 @@
+"""
+Declarative input validation.
+
+A RuleSet is built once from rule objects (required fields, numeric type,
+ranges, allowed categories, duplicate keys, cross-field rules) and then
+evaluated two ways with the same rules:
+
+- validate_frame(df): column-wise with pandas/NumPy over a whole frame or
+  chunk. Returns a ValidationReport: one boolean violation mask per rule
+  (rows x rules), the invalid rows and the count per rule.
+- check_record(record): the single-record path (validate_input), one
+  cheap check per rule on a dict, with readable messages.
+
+DEFAULT_RULES covers the columns the model and the fallback rely on.
+Categories of the training data profile (src/data_profile.py, complete
+frequency tables only) are added as allowed values when the profile
+exists. Invalid records seen by validate_input are appended to
+VAL_LOG_FILE.
+"""
+import os
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from src import data_profile
+from src.data_profile import load_profile
+
+VAL_LOG_FILE = os.getenv('VALIDATION_LOG_FILE', 'models/logs/validation_errors.jsonl')
+PROFILE_FILE = data_profile.PROFILE_PATH
+
+REQUIRED_FIELDS = ('Student_ID', 'Age', 'Progress_Percentage', 'Quiz_Score_Avg')
+# (low, high), None = unbounded
+RANGES = {
+    'Age': (10, 100),
+    'Progress_Percentage': (0, 100),
+    'Quiz_Score_Avg': (0, 100),
+    'Video_Completion_Rate': (0, 100),
+    'App_Usage_Percentage': (0, 100),
+    'Project_Grade': (0, 100),
+    'Instructor_Rating': (0, 5),
+    'Satisfaction_Rating': (0, 5),
+}
+NON_NEGATIVE = (
+    'Course_Duration_Days', 'Login_Frequency', 'Average_Session_Duration_Min', 'Discussion_Participation',
+    'Time_Spent_Hours', 'Days_Since_Last_Login', 'Notifications_Checked', 'Peer_Interaction_Score',
+    'Assignments_Submitted', 'Assignments_Missed', 'Quiz_Attempts', 'Rewatch_Count', 'Payment_Amount',
+    'Reminder_Emails_Clicked', 'Support_Tickets_Raised',
+)
+CATEGORIES = {
+    'Course_Level': ('Beginner', 'Intermediate', 'Advanced'),
+    'Fee_Paid': ('Yes', 'No'),
+    'Discount_Used': ('Yes', 'No'),
+}
+# Duplicates are repeated (Student_ID, Course_ID) enrollments, not repeated
+# Student_IDs: a student legitimately has one row per course taken
+UNIQUE_KEY = ('Student_ID', 'Course_ID')
+
+
+def _missing(value):
+    return value is None or value == '' or (isinstance(value, float) and value != value)
+
+
+def _number(value):
+    """
+    float(value), or None if it isn't a number (bools aren't).
+    """
+    if isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+class _Columns:
+    """
+    Per-frame cache of the columns rules share (numeric casts, presence).
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self._numbers = {}
+
+    def __contains__(self, col):
+        return col in self.df.columns
+
+    def present(self, col):
+        s = self.df[col]
+        mask = s.notna().to_numpy()
+        if not pd.api.types.is_numeric_dtype(s):
+            mask = mask & (s != '').to_numpy(dtype=bool, na_value=False)
+        return mask
+
+    def numbers(self, col):
+        if col not in self._numbers:
+            s = self.df[col]
+            if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+                values = s.to_numpy(dtype=float, na_value=np.nan)
+            else:
+                values = pd.to_numeric(s, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+            self._numbers[col] = values
+        return self._numbers[col]
+
+
+class Rule:
+    """
+    One check. frame(cols) returns the violation mask of a frame,
+    record(record) the message for a violating record (None: valid).
+    """
+    name = None
+
+    def frame(self, cols):
+        raise NotImplementedError
+
+    def record(self, record):
+        return None
+
+
+class Required(Rule):
+    def __init__(self, col):
+        self.col = col
+        self.name = f"{col}:required"
+
+    def frame(self, cols):
+        if self.col not in cols:
+            return np.ones(len(cols.df), dtype=bool)
+        return ~cols.present(self.col)
+
+    def record(self, record):
+        if _missing(record.get(self.col)):
+            return f"Missing required field: {self.col}"
+
+
+class IsNumber(Rule):
+    def __init__(self, col):
+        self.col = col
+        self.name = f"{col}:type"
+
+    def frame(self, cols):
+        if self.col not in cols:
+            return np.zeros(len(cols.df), dtype=bool)
+        return cols.present(self.col) & np.isnan(cols.numbers(self.col))
+
+    def record(self, record):
+        value = record.get(self.col)
+        if not _missing(value) and _number(value) is None:
+            return f"Invalid {self.col} format: {value!r}"
+
+
+class InRange(Rule):
+    def __init__(self, col, low=None, high=None):
+        self.col, self.low, self.high = col, low, high
+        self.name = f"{col}:range"
+        self._low = -np.inf if low is None else float(low)
+        self._high = np.inf if high is None else float(high)
+
+    def _bounds(self):
+        return f"[{'-inf' if self.low is None else self.low}, {'inf' if self.high is None else self.high}]"
+
+    def frame(self, cols):
+        if self.col not in cols:
+            return np.zeros(len(cols.df), dtype=bool)
+        values = cols.numbers(self.col)
+        # NaN compares False: missing/unparsable values are other rules' business
+        return (values < self._low) | (values > self._high)
+
+    def record(self, record):
+        value = _number(record.get(self.col))
+        if value is not None and not self._low <= value <= self._high:
+            return f"{self.col} {value} out of range {self._bounds()}"
+
+
+class Allowed(Rule):
+    def __init__(self, col, values):
+        self.col = col
+        self.values = frozenset(str(v) for v in values)
+        self.name = f"{col}:category"
+
+    def frame(self, cols):
+        if self.col not in cols:
+            return np.zeros(len(cols.df), dtype=bool)
+        s = cols.df[self.col]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            # one check per category instead of per row
+            bad = [c for c in s.cat.categories if str(c) not in self.values]
+            return s.isin(bad).to_numpy()
+        return cols.present(self.col) & ~s.astype(str).isin(self.values).to_numpy()
+
+    def record(self, record):
+        value = record.get(self.col)
+        if not _missing(value) and str(value) not in self.values:
+            return f"{self.col} '{value}' is not an allowed value"
+
+
+class Unique(Rule):
+    """
+    Rows whose key repeats an earlier row of the same frame/chunk (frame only).
+    """
+
+    def __init__(self, cols):
+        self.cols = tuple(cols)
+        self.name = f"{'+'.join(self.cols)}:duplicate"
+
+    def frame(self, cols):
+        if not all(c in cols for c in self.cols):
+            return np.zeros(len(cols.df), dtype=bool)
+        # One int64 key from the factorized columns: much cheaper than
+        # DataFrame.duplicated over several string columns
+        key = None
+        for col in self.cols:
+            codes, uniques = pd.factorize(cols.df[col])  # missing -> -1
+            codes = codes.astype(np.int64) + 1
+            if key is None:
+                key = codes
+            else:
+                if key.max(initial=0) >= (1 << 62) // (len(uniques) + 1):
+                    key = pd.factorize(key)[0].astype(np.int64)
+                key = key * (len(uniques) + 1) + codes
+        return pd.Index(key).duplicated(keep='first')
+
+
+class CrossField(Rule):
+    """
+    A rule over several fields: frame_fn(cols) -> violation mask,
+    record_fn(record) -> True if the record violates it.
+    """
+
+    def __init__(self, name, fields, frame_fn, record_fn, message):
+        self.name, self.fields = name, tuple(fields)
+        self.frame_fn, self.record_fn, self.message = frame_fn, record_fn, message
+
+    def frame(self, cols):
+        if not all(c in cols for c in self.fields):
+            return np.zeros(len(cols.df), dtype=bool)
+        return self.frame_fn(cols)
+
+    def record(self, record):
+        if self.record_fn(record):
+            return self.message
+
+
+def _quiz_without_attempts(record):
+    score, attempts = _number(record.get('Quiz_Score_Avg')), _number(record.get('Quiz_Attempts'))
+    return score is not None and attempts is not None and score > 0 and attempts == 0
+
+
+DEFAULT_RULES = (
+    [Required(col) for col in REQUIRED_FIELDS]
+    + [IsNumber(col) for col in list(RANGES) + list(NON_NEGATIVE)]
+    + [InRange(col, low, high) for col, (low, high) in RANGES.items()]
+    + [InRange(col, 0) for col in NON_NEGATIVE]
+    + [Allowed(col, values) for col, values in CATEGORIES.items()]
+    + [Unique(UNIQUE_KEY)]  # composite key, see UNIQUE_KEY
+    + [CrossField(
+        'quiz_score_without_attempts', ('Quiz_Score_Avg', 'Quiz_Attempts'),
+        lambda cols: (cols.numbers('Quiz_Score_Avg') > 0) & (cols.numbers('Quiz_Attempts') == 0),
+        _quiz_without_attempts, "Quiz_Score_Avg > 0 with no Quiz_Attempts",
+    )]
+)
+
+
+def rules_from_profile(profile, exclude=tuple(CATEGORIES)):
+    """
+    Allowed-value rules for the categorical columns of a training data
+    profile whose frequency table lists every value seen in training.
+    Identifiers (*_ID) are skipped: new ones are expected.
+    """
+    rules = []
+    for col, ref in (profile or {}).get('columns', {}).items():
+        if col in exclude or col.endswith('_ID'):
+            continue
+        if ref.get('kind') == 'category' and ref['frequencies'] \
+                and ref['distinct'] <= len(ref['frequencies']):
+            rules.append(Allowed(col, ref['frequencies']))
+    return rules
+
+
+class ValidationReport:
+    """
+    masks: DataFrame (rows x rule names) of violations.
+    """
+
+    def __init__(self, masks):
+        self.masks = masks
+
+    @property
+    def invalid(self):
+        return self.masks.to_numpy().any(axis=1)
+
+    @property
+    def counts(self):
+        return self.masks.sum()
+
+    @property
+    def n_invalid(self):
+        return int(self.invalid.sum())
+
+    def summary(self):
+        counts = self.counts
+        return {'rows': len(self.masks), 'invalid_rows': self.n_invalid,
+                'violations': {name: int(n) for name, n in counts[counts > 0].items()}}
+
+
+class RuleSet:
+    def __init__(self, rules):
+        self.rules = list(rules)
+        names = [r.name for r in self.rules]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate rule names: {sorted({n for n in names if names.count(n) > 1})}")
+        self._record_rules = [r for r in self.rules if type(r).record is not Rule.record]
+
+    def validate_frame(self, df):
+        cols = _Columns(df)
+        masks = {rule.name: rule.frame(cols) for rule in self.rules}
+        return ValidationReport(pd.DataFrame(masks, index=df.index))
+
+    def check_record(self, record):
+        messages = []
+        for rule in self._record_rules:
+            message = rule.record(record)
+            if message is not None:
+                messages.append(message)
+        return messages
+
+
+# path -> (profile object id, RuleSet), so the default rules are compiled once per profile version
+_default_rule_sets = {}
+
+
+def default_rules(profile_path=None):
+    """
+    DEFAULT_RULES plus the categories of the training profile at
+    profile_path (default PROFILE_FILE), if there is one.
+    """
+    path = profile_path or PROFILE_FILE
+    profile = load_profile(path)
+    cached = _default_rule_sets.get(path)
+    if cached is None or cached[0] != id(profile):
+        cached = _default_rule_sets[path] = (id(profile), RuleSet(DEFAULT_RULES + rules_from_profile(profile)))
+    return cached[1]
+
+
+def _log_invalid(record, messages):
+    try:
+        os.makedirs(os.path.dirname(VAL_LOG_FILE) or '.', exist_ok=True)
+        with open(VAL_LOG_FILE, 'a') as f:
+            f.write(json.dumps({'ts': time.time(), 'record': record, 'errors': messages}, default=str) + '\n')
+    except OSError as e:
+        print(f"⚠️ Could not write validation log {VAL_LOG_FILE}: {e}")
+
+
+def validate_input(data, rules=None):
+    """
+    Validates one record (dict). Returns (is_valid, messages); invalid
+    records are appended to VAL_LOG_FILE.
+    """
+    if not isinstance(data, dict):
+        messages = ["Record must be a JSON object"]
+    else:
+        messages = (rules or default_rules()).check_record(data)
+    if messages:
+        _log_invalid(data, messages)
+    return not messages, messages
+
+
+def validate_frame(df, rules=None):
+    """
+    Column-wise validation of a whole frame/chunk (ValidationReport).
+    """
+    return (rules or default_rules()).validate_frame(df)
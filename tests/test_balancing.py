@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.utils import resample
+from xgboost import XGBClassifier
+
+import src.train_model as train_model
+from src.preprocess import balance_data, balance_index, balance_weights, balanced_batches
+
+
+@pytest.fixture(scope="module")
+def imbalanced():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(3000, 5)), columns=[f"f{i}" for i in range(5)])
+    logits = 1.5 * X["f0"] - X["f1"] - 1.5
+    y = (rng.random(3000) < 1 / (1 + np.exp(-logits))).astype(int)
+    return X, pd.Series(y, name="target")
+
+
+def legacy_balance_data(train_df):
+    majority = train_df[train_df.target == 0]
+    minority = train_df[train_df.target == 1]
+    if len(minority) < len(majority):
+        minority = resample(minority, replace=True, n_samples=len(majority), random_state=42)
+        return pd.concat([majority, minority])
+    return train_df
+
+
+def test_upsampling_unchanged(imbalanced):
+    X, y = imbalanced
+    df = pd.concat([X, y], axis=1)
+    pd.testing.assert_frame_equal(balance_data(df), legacy_balance_data(df))
+    idx = balance_index(y)
+    pd.testing.assert_frame_equal(df.iloc[idx], legacy_balance_data(df))
+
+
+def test_weights_match_upsampled_class_totals(imbalanced):
+    _, y = imbalanced
+    w = balance_weights(y)
+    upsampled = y.iloc[balance_index(y)]
+    assert w[y.to_numpy() == 1].sum() == pytest.approx((upsampled == 1).sum(), rel=1e-4)
+    assert w[y.to_numpy() == 0].sum() == (upsampled == 0).sum()
+    # already balanced / single class -> no-op
+    assert (balance_weights([0, 1, 0, 1]) == 1).all()
+    assert (balance_index([0, 0, 0]) == np.arange(3)).all()
+
+
+def test_balanced_batches(imbalanced):
+    _, y = imbalanced
+    y = y.to_numpy()
+    batches = list(balanced_batches(y, batch_size=256))
+    assert all(abs(y[b].mean() - 0.5) < 1e-9 for b in batches)
+    majority_seen = np.concatenate([b[y[b] == 0] for b in batches])
+    assert sorted(majority_seen) == list(np.flatnonzero(y == 0))
+
+
+def test_strategies_agree_statistically(imbalanced):
+    """Weighted, index-resampled and upsampled fits predict the same positive rate."""
+    X, y = imbalanced
+    params = dict(n_estimators=50, max_depth=3, random_state=0)
+    idx = balance_index(y)
+    rates = {
+        "none": XGBClassifier(**params).fit(X, y).predict_proba(X)[:, 1].mean(),
+        "upsample": XGBClassifier(**params).fit(X.iloc[idx], y.iloc[idx]).predict_proba(X)[:, 1].mean(),
+        "weights": XGBClassifier(**params).fit(X, y, sample_weight=balance_weights(y)).predict_proba(X)[:, 1].mean(),
+    }
+    assert rates["upsample"] > rates["none"] + 0.1
+    assert rates["weights"] == pytest.approx(rates["upsample"], abs=0.03)
+
+
+def test_index_counts_reproduce_upsampled_model(imbalanced):
+    """Repeat counts as weights == duplicated rows (exact with an exact quantile sketch)."""
+    X, y = imbalanced
+    params = dict(n_estimators=30, max_depth=3, random_state=0, max_bin=4096)
+    idx = balance_index(y)
+    upsampled = XGBClassifier(**params).fit(X.iloc[idx], y.iloc[idx]).predict_proba(X)[:, 1]
+    counts = np.bincount(idx, minlength=len(y))
+    weighted = XGBClassifier(**params).fit(X, y, sample_weight=counts).predict_proba(X)[:, 1]
+    np.testing.assert_allclose(weighted, upsampled, atol=1e-5)
+
+
+@pytest.mark.parametrize("balance", ["weights", "index"])
+def test_pipeline_balance_strategies(imbalanced, balance, tmp_path, monkeypatch):
+    monkeypatch.setattr(train_model, "CHECKPOINT_DIR", str(tmp_path))
+    X, y = imbalanced
+    df = pd.concat([X, y, pd.Series(np.linspace(0, 100, len(y)), name="Progress_Percentage")], axis=1)
+    pipeline = train_model.MLEngineerPipeline(df, balance=balance)
+    pipeline.run_classification_experiments()
+    pipeline.run_reframing_experiment()
+    assert len(pipeline.results) == 3
+    assert (tmp_path / "XGBoost_Boosting.pkl").exists()
+
+
+def test_unknown_balance_strategy(imbalanced):
+    with pytest.raises(ValueError, match="balance strategy"):
+        train_model.MLEngineerPipeline(pd.concat(imbalanced, axis=1), balance="smote")
@@ -0,0 +1,97 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.main import app, _align_payload_to_df, _align_records_to_df
+
+client = TestClient(app)
+
+RECORDS = [
+    {"Student_ID": "S1", "Age": 20, "Progress_Percentage": 95, "Quiz_Score_Avg": 80, "City": "Delhi"},
+    {"Student_ID": "S2", "Age": "21", "Progress_Percentage": 10, "Quiz_Score_Avg": 40},
+    {"Student_ID": "S3", "Age": "n/a", "Progress_Percentage": 60, "Quiz_Score_Avg": 70, "Extra": 1},
+]
+
+
+class DummyModel:
+    """Scores Progress_Percentage / 100 so results are easy to check."""
+    classes_ = np.array([0, 1])
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict_proba(self, df):
+        self.calls += 1
+        p = df["Progress_Percentage"].fillna(0).to_numpy(dtype=float) / 100
+        return np.column_stack([1 - p, p])
+
+
+@pytest.fixture
+def dummy_model(monkeypatch):
+    model = DummyModel()
+    monkeypatch.setattr(main.registry, "_versions", {})
+    main.registry.register("default", model)
+    return model
+
+
+def test_batch_alignment_matches_single_row():
+    """Column-wise alignment must give the same values as the per-record path."""
+    batch = _align_records_to_df(RECORDS)
+    for i, record in enumerate(RECORDS):
+        single = _align_payload_to_df(record)
+        for col in main.EXPECTED_COLS:
+            a, b = single[col].iloc[0], batch[col].iloc[i]
+            assert (pd.isna(a) and pd.isna(b)) or a == b, col
+
+
+def test_batch_uses_one_model_call(dummy_model):
+    response = client.post("/predict/batch", json=RECORDS)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 3
+    assert dummy_model.calls == 1
+    assert [r["prediction"] for r in data["results"]] == [1, 0, 1]
+    assert data["results"][0]["probability"] == pytest.approx(0.95)
+
+
+def test_batch_invalid_record_falls_back(dummy_model):
+    records = [RECORDS[0], "not a dict", {"Student_ID": "A" * 6000}]
+    data = client.post("/predict/batch", json=records).json()
+    assert data["results"][0]["meta"]["mode"] == "model"
+    assert data["results"][1]["meta"]["reason"] == "invalid_record"
+    assert data["results"][2]["meta"]["reason"] == "invalid_record"
+
+
+def test_batch_without_model_uses_fallback(monkeypatch):
+    monkeypatch.setattr(main.registry, "_versions", {})
+    data = client.post("/predict/batch", json=RECORDS).json()
+    assert all(r["meta"]["reason"] == "model_not_loaded" for r in data["results"])
+    assert data["results"][0]["prediction"] == 1
+    # One vectorized heuristic call, same answers as the per-record fallback
+    coerced = [main.record_schema.coerce(r) for r in RECORDS]
+    expected = [main._fallback_result(r, "model_not_loaded", "fallback_no_model") for r in coerced]
+    assert data["results"] == expected
+
+
+def test_batch_ndjson(dummy_model):
+    body = "\n".join(json.dumps(r) for r in RECORDS) + "\n"
+    response = client.post(
+        "/predict/batch", content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    assert response.json()["count"] == 3
+
+
+def test_batch_too_large(monkeypatch):
+    monkeypatch.setattr(main, "MAX_BATCH_SIZE", 2)
+    response = client.post("/predict/batch", json=RECORDS)
+    assert response.status_code == 413
+
+
+def test_batch_rejects_non_list():
+    response = client.post("/predict/batch", json={"Student_ID": "S1"})
+    assert response.status_code == 422
@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+from prometheus_client import CollectorRegistry, Gauge, Histogram
+
+from app.batching import MicroBatcher
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_concurrent_submits_share_one_flush():
+    """Requests arriving together are scored in a single call, each gets its own row."""
+    calls = []
+
+    def score(payloads):
+        calls.append(len(payloads))
+        return [{"prediction": p["x"] * 2} for p in payloads]
+
+    batcher = MicroBatcher(score, max_batch_size=16, max_wait_ms=20)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit({"x": i}) for i in range(10)))
+
+    results = run(main())
+    assert [r["prediction"] for r in results] == [i * 2 for i in range(10)]
+    assert calls == [10]
+
+
+def test_flush_when_batch_is_full():
+    calls = []
+
+    def score(payloads):
+        calls.append(len(payloads))
+        return payloads
+
+    batcher = MicroBatcher(score, max_batch_size=4, max_wait_ms=1000)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+
+    assert run(main()) == list(range(10))
+    assert calls == [4, 4, 2]
+
+
+def test_flush_after_max_wait():
+    batcher = MicroBatcher(lambda p: p, max_batch_size=100, max_wait_ms=5)
+
+    async def main():
+        return await asyncio.wait_for(batcher.submit("only"), timeout=1)
+
+    assert run(main()) == "only"
+
+
+def test_score_error_propagates_to_callers():
+    def score(payloads):
+        raise RuntimeError("model down")
+
+    batcher = MicroBatcher(score, max_batch_size=8, max_wait_ms=1)
+
+    async def main():
+        await batcher.submit({})
+
+    with pytest.raises(RuntimeError):
+        run(main())
+
+
+def test_metrics_are_recorded():
+    registry = CollectorRegistry()
+    depth = Gauge("q", "q", registry=registry)
+    size = Histogram("s", "s", registry=registry)
+    wait = Histogram("w", "w", registry=registry)
+    batcher = MicroBatcher(lambda p: p, max_batch_size=8, max_wait_ms=5,
+                           queue_depth=depth, batch_size=size, wait_time=wait)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(3)))
+
+    run(main())
+    assert registry.get_sample_value("s_count") == 1
+    assert registry.get_sample_value("s_sum") == 3
+    assert registry.get_sample_value("w_count") == 3
+
+
+def test_predict_endpoint_with_micro_batching(monkeypatch):
+    """/predict keeps its response contract when routed through the batcher."""
+    from fastapi.testclient import TestClient
+    import app.main as main
+
+    monkeypatch.setattr(main.registry, "_versions", {})
+    monkeypatch.setattr(main, "MICROBATCH_ENABLED", True)
+    monkeypatch.setattr(main, "MICROBATCH_MAX_WAIT_MS", 1)
+    monkeypatch.setattr(main, "micro_batchers", {})
+    client = TestClient(main.app)
+
+    data = client.post("/predict", json={"Progress_Percentage": 95, "Quiz_Score_Avg": 80}).json()
+    assert data["prediction"] == 1
+    assert data["meta"] == {"mode": "fallback", "reason": "model_not_loaded"}
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from benchmarks.synthetic_data import make_raw_frame
+from src.data_profile import build_profile, drift_baseline, load_profile, save_profile
+from src.preprocess import clean_data
+
+
+@pytest.fixture(scope="module")
+def frame():
+    df = clean_data(make_raw_frame(3000, seed=0))
+    df.loc[df.index[:300], "Age"] = np.nan
+    return df
+
+
+def test_profile_matches_pandas(frame):
+    profile = build_profile(frame, probabilities=np.linspace(0, 1, 101))
+    age = profile["columns"]["Age"]
+    assert age["null_rate"] == pytest.approx(0.1)
+    assert (age["min"], age["max"]) == (frame["Age"].min(), frame["Age"].max())
+    assert age["mean"] == pytest.approx(frame["Age"].mean())
+    assert age["std"] == pytest.approx(frame["Age"].std())
+    np.testing.assert_allclose(age["edges"], np.unique(frame["Age"].dropna().quantile(np.linspace(0, 1, 11)[1:-1])))
+    assert sum(age["shares"]) == pytest.approx(1.0)
+
+    city = profile["columns"]["City"]
+    assert city["kind"] == "category" and city["distinct"] == frame["City"].nunique()
+    assert city["frequencies"] == pytest.approx(frame["City"].astype(str).value_counts(normalize=True).to_dict())
+    assert "target" not in profile["columns"]
+    assert profile["probability"]["mean"] == pytest.approx(0.5)
+    assert set(drift_baseline(profile)) >= {"Age", "Quiz_Score_Avg", "probability"}
+    assert "City" not in drift_baseline(profile)
+
+
+def test_load_profile_is_cached_until_replaced(frame, tmp_path):
+    path = str(tmp_path / "data_profile.json")
+    assert load_profile(path) is None
+    save_profile(build_profile(frame), path)
+    first = load_profile(path)
+    assert load_profile(path) is first
+    save_profile(build_profile(frame.iloc[:100]), path)
+    assert load_profile(path)["rows"] == 100
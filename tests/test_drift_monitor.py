@@ -0,0 +1,92 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from prometheus_client import CollectorRegistry, Gauge
+
+from src.data_profile import build_profile, save_profile
+from src.monitoring import DriftMonitor, PredictionLogger, RunningStats
+
+
+@pytest.fixture
+def baseline(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"Age": rng.normal(30, 5, 5000), "Quiz_Score_Avg": rng.uniform(0, 100, 5000)})
+    path = tmp_path / "data_profile.json"
+    save_profile(build_profile(df, rng.uniform(0, 1, 1000)), str(path))
+    return path
+
+
+def log(logger, n, age_mean=30.0, seed=1):
+    rng = np.random.default_rng(seed)
+    for _ in range(n):
+        logger.log({"Age": float(rng.normal(age_mean, 5)), "Quiz_Score_Avg": float(rng.uniform(0, 100))},
+                   {"prediction": 1, "probability": float(rng.uniform())})
+    logger.flush()
+
+
+def test_running_stats_merge_matches_numpy():
+    values = np.random.default_rng(0).normal(3, 2, 1001)
+    edges = np.array([1.0, 3.0, 5.0])
+    parts = [RunningStats(edges) for _ in range(3)]
+    for i, v in enumerate(values):
+        parts[i % 3].update(v)
+    total = RunningStats(edges)
+    for part in parts:
+        total.merge(part)
+    assert total.count == 1001
+    assert total.mean == pytest.approx(values.mean())
+    assert total.std == pytest.approx(values.std(ddof=1))
+    assert total.hist.tolist() == np.bincount(np.searchsorted(edges, values, side="right"), minlength=4).tolist()
+
+
+def test_updates_only_read_new_lines_across_rotation(tmp_path, baseline):
+    path = str(tmp_path / "p.jsonl")
+    logger = PredictionLogger(path, max_bytes=30_000, backups=100)
+    monitor = DriftMonitor(path, str(baseline))
+
+    log(logger, 150)
+    assert monitor.update() == 150
+    assert monitor.update() == 0
+
+    # partial last line is left for the next update
+    with open(path, "ab") as f:
+        f.write(b'{"probability": 0.5')
+    log(logger, 400, seed=2)     # rotates the live file (with the half line) away
+    assert monitor.update() == 400
+    assert monitor.result("Age")["samples"] == 550
+
+
+def test_training_baseline_detects_shift(tmp_path, baseline):
+    path = str(tmp_path / "p.jsonl")
+    logger = PredictionLogger(path)
+    registry = CollectorRegistry()
+    gauges = {field: Gauge(f"test_{field}", "", ["feature"], registry=registry)
+              for field in ("psi", "drift_detected")}
+    monitor = DriftMonitor(path, str(baseline), gauges=gauges)
+
+    log(logger, 500)
+    results = monitor.check()
+    assert not any(r["drift_detected"] for r in results.values())
+    assert results["Age"]["psi"] < 0.1 and 0 <= results["Age"]["ks"] < 0.1
+
+    log(logger, 1500, age_mean=40.0, seed=3)
+    results = monitor.check()
+    assert results["Age"]["drift_detected"] and results["Age"]["psi"] > 0.2
+    assert not results["Quiz_Score_Avg"]["drift_detected"]
+    assert registry.get_sample_value("test_drift_detected", {"feature": "Age"}) == 1.0
+    assert registry.get_sample_value("test_drift_detected", {"feature": "Quiz_Score_Avg"}) == 0.0
+
+
+def test_new_profile_rereads_retained_log(tmp_path, baseline):
+    path = str(tmp_path / "p.jsonl")
+    log(PredictionLogger(path), 200, age_mean=40.0)
+    monitor = DriftMonitor(path, str(baseline))
+    assert monitor.check()["Age"]["drift_detected"]
+
+    profile = json.loads(baseline.read_text())
+    profile["columns"]["Age"] = build_profile(pd.DataFrame({"Age": np.random.default_rng(5).normal(40, 5, 5000)}))["columns"]["Age"]
+    baseline.write_text(json.dumps(profile))
+    result = monitor.check()["Age"]
+    assert not result["drift_detected"] and result["samples"] == 200
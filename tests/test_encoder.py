@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from xgboost import XGBClassifier
+
+import app.main as main
+from app.encoder import FeatureEncoder, _month_of, booster_predict
+from src.preprocess import clean_data
+
+FEATURES = ["Age", "Progress_Percentage", "Quiz_Score_Avg"]
+
+
+@pytest.fixture(scope="module")
+def numeric_model():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.uniform(0, 100, size=(300, 3)), columns=FEATURES)
+    y = (X["Progress_Percentage"] + rng.normal(0, 10, 300) > 50).astype(int)
+    return XGBClassifier(n_estimators=20, max_depth=3).fit(X, y)
+
+
+def test_encoder_follows_alignment_rules():
+    encoder = FeatureEncoder(FEATURES, main.NUMERIC_COLS)
+    X = encoder.encode([
+        {"Age": "21", "Progress_Percentage": 50, "Quiz_Score_Avg": ""},
+        {"Age": "n/a", "Quiz_Score_Avg": None, "Other": "x"},
+    ])
+    assert X.dtype == np.float32
+    assert X[0, 0] == 21 and X[0, 1] == 50 and np.isnan(X[0, 2])
+    assert np.isnan(X[1]).all()
+
+
+@pytest.mark.parametrize("dates", [["05-03-2023", "20-11-2023", "1-2-2024"], ["05/03/2023", "20/11/2023"]])
+def test_month_matches_clean_data(dates):
+    expected = clean_data(pd.DataFrame({"Enrollment_Date": dates}))["Enrollment_Month"].tolist()
+    assert [_month_of(d) for d in dates] == expected
+    assert np.isnan(_month_of("not a date"))
+
+
+def test_encoder_reuses_thread_buffer():
+    encoder = FeatureEncoder(FEATURES, main.NUMERIC_COLS)
+    a = encoder.encode([{"Age": 1}] * 4)
+    b = encoder.encode([{"Age": 2}])
+    assert np.shares_memory(a, b)
+
+
+def test_encoder_only_for_numeric_xgboost_schema(numeric_model):
+    assert FeatureEncoder.from_model(numeric_model, main.NUMERIC_COLS) is not None
+    # Categorical features have no encoding rule -> pandas path
+    assert FeatureEncoder.from_model(numeric_model, {"Age"}) is None
+    assert FeatureEncoder.from_model(object(), main.NUMERIC_COLS) is None
+
+
+def test_booster_predict_matches_sklearn_api(numeric_model):
+    records = [{"Age": 20 + i, "Progress_Percentage": 10 * i, "Quiz_Score_Avg": 70} for i in range(10)]
+    encoder = FeatureEncoder.from_model(numeric_model, main.NUMERIC_COLS)
+    preds, probas = booster_predict(numeric_model, encoder.encode(records))
+
+    df = pd.DataFrame(records, columns=FEATURES).astype("float32")
+    np.testing.assert_array_equal(preds, numeric_model.predict(df))
+    np.testing.assert_allclose(probas, numeric_model.predict_proba(df)[:, 1], rtol=1e-6)
+
+
+def test_predict_endpoints_use_encoder(numeric_model, monkeypatch):
+    monkeypatch.setattr(main.registry, "_versions", {})
+    assert main.registry.register("default", numeric_model).encoder is not None
+    client = TestClient(main.app)
+
+    record = {"Age": 30, "Progress_Percentage": 95, "Quiz_Score_Avg": 80}
+    single = client.post("/predict", json=record).json()
+    batch = client.post("/predict/batch", json=[record]).json()["results"][0]
+    assert single["meta"]["mode"] == "model"
+    assert batch["meta"]["mode"] == "model"
+    assert single["prediction"] == batch["prediction"]
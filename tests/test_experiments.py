@@ -0,0 +1,136 @@
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.train_model as train_model
+from src.experiments import ExperimentScheduler, core_budget
+
+MODELS = ["RandomForest_Bagging", "XGBoost_Boosting", "XGBoost_Reframed_Regressor"]
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame(rng.normal(size=(1500, 4)), columns=["a", "b", "c", "d"])
+    df["Progress_Percentage"] = np.clip(50 + 30 * df["a"] + rng.normal(0, 10, len(df)), 0, 100)
+    df["target"] = (df["Progress_Percentage"] > 60).astype(int)
+    return df
+
+
+@pytest.fixture
+def checkpoint_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(train_model, "CHECKPOINT_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_core_budget():
+    assert core_budget(3, cores=8) == 2
+    assert core_budget(1, cores=8) == 8
+    assert core_budget(16, cores=8) == 1
+
+
+def test_parallel_run_with_core_budget(data, checkpoint_dir, monkeypatch):
+    monkeypatch.setattr(train_model, "TRAIN_CORES", 4)
+    pipeline = train_model.MLEngineerPipeline(data)
+    outcomes = pipeline.run_experiments()
+
+    assert [o["result"]["Model"] for o in outcomes] == MODELS
+    assert not any(o["skipped"] for o in outcomes)
+    table = pipeline.get_results_table()
+    assert set(table["Model"]) == set(MODELS)
+    assert table["Accuracy"].between(0.5, 1).all()
+    for name in MODELS:
+        # 3 jobs on 4 cores -> 1 thread each
+        assert joblib.load(checkpoint_dir / f"{name}.pkl").get_params()["n_jobs"] == 1
+        assert (checkpoint_dir / "runs" / f"{name}.json").exists()
+    # the memory-mapped splits are removed afterwards
+    assert not [f for f in os.listdir(checkpoint_dir / "runs") if f.endswith(".joblib")]
+
+
+def test_retry_skips_finished_runs(data, checkpoint_dir, monkeypatch):
+    monkeypatch.setattr(train_model, "TRAIN_CORES", 1)
+    train_model.MLEngineerPipeline(data).run_experiments()
+
+    # the XGBoost run "failed" last time
+    os.remove(checkpoint_dir / "runs" / "XGBoost_Boosting.json")
+    logged = []
+    retry = train_model.MLEngineerPipeline(data)
+    monkeypatch.setattr(retry, "_log_run", lambda job, outcome: logged.append(job["name"]))
+    outcomes = retry.run_experiments()
+
+    assert [o["skipped"] for o in outcomes] == [True, False, True]
+    assert logged == ["XGBoost_Boosting"]
+    assert len(retry.get_results_table()) == 3
+
+    # different data -> nothing is reused
+    changed = train_model.MLEngineerPipeline(data.iloc[:-10])
+    assert not any(o["skipped"] for o in changed.run_experiments(("reframing",)))
+
+
+def test_staged_models_are_published_together(data, checkpoint_dir, monkeypatch):
+    monkeypatch.setattr(train_model, "TRAIN_CORES", 1)
+    staging = checkpoint_dir / train_model.STAGING_DIR
+    pipeline = train_model.MLEngineerPipeline(data)
+    pipeline.run_experiments(("classification",), out_dir=str(staging))
+    joblib.dump({"pipeline": 1}, staging / train_model.FEATURE_PIPELINE_FILE)
+    assert not (checkpoint_dir / "XGBoost_Boosting.pkl").exists()
+
+    train_model.publish_models(pipeline, str(staging))
+    for fname in os.listdir(staging):
+        assert (checkpoint_dir / fname).read_bytes() == (staging / fname).read_bytes()
+    assert (checkpoint_dir / "model.pkl").exists()
+    assert not (checkpoint_dir / ".publishing").exists()
+
+
+def test_corrupt_checkpoint_is_retrained(data, checkpoint_dir):
+    scheduler = ExperimentScheduler(str(checkpoint_dir), cores=1)
+    job = {"name": "XGBoost_Boosting", "out_dir": str(checkpoint_dir), "fingerprint": "x"}
+    os.makedirs(checkpoint_dir / "runs")
+    (checkpoint_dir / "runs" / "XGBoost_Boosting.json").write_text("{not json")
+    (checkpoint_dir / "XGBoost_Boosting.pkl").write_bytes(b"")
+    assert scheduler.completed(job) is None
+
+
+def test_shared_split_matches_per_experiment_splits(data):
+    from sklearn.model_selection import train_test_split
+    from src.experiments import shared_split
+
+    X = data.drop(columns=["target", "Progress_Percentage"])
+    split = shared_split(X, data["target"], data["Progress_Percentage"])
+    X_train, X_test, y_train, y_test = train_test_split(X, data["target"], test_size=0.2, random_state=42)
+    _, _, p_train, _ = train_test_split(X, data["Progress_Percentage"], test_size=0.2, random_state=42)
+
+    assert split["X_train"].dtype == np.float32 and split["X_train"].flags["C_CONTIGUOUS"]
+    np.testing.assert_array_equal(split["X_train"], X_train.to_numpy(np.float32))
+    np.testing.assert_array_equal(split["X_test"], X_test.to_numpy(np.float32))
+    np.testing.assert_array_equal(split["y_train"], y_train)
+    np.testing.assert_array_equal(split["y_test"], y_test)
+    np.testing.assert_array_equal(split["progress_train"], p_train.to_numpy(np.float32))
+    assert split["names"] == list(X.columns)
+
+
+def test_prebuilt_dmatrix_reproduces_sklearn_fit(data):
+    from xgboost import XGBClassifier, XGBRegressor
+    from src.experiments import fit_xgboost, shared_split, train_matrix
+
+    X = data.drop(columns=["target", "Progress_Percentage"])
+    split = shared_split(X, data["target"], data["Progress_Percentage"])
+    frame = pd.DataFrame(split["X_train"], columns=split["names"])
+    weights = np.where(split["y_train"] == 1, 2.0, 1.0)
+    split["fit_kwargs"] = {"sample_weight": weights}
+    dtrain = train_matrix("split", split, max_bin=256)
+
+    clf = XGBClassifier(n_estimators=20, max_depth=4, random_state=42)
+    fit_xgboost(clf, dtrain, split["y_train"])
+    ref = XGBClassifier(n_estimators=20, max_depth=4, random_state=42).fit(frame, split["y_train"], sample_weight=weights)
+    np.testing.assert_array_equal(clf.predict_proba(frame), ref.predict_proba(frame))
+    assert list(clf.feature_names_in_) == split["names"]
+
+    # same matrix, other label
+    assert train_matrix("split", split, max_bin=256) is dtrain
+    reg = fit_xgboost(XGBRegressor(n_estimators=20, random_state=42), dtrain, split["progress_train"])
+    ref = XGBRegressor(n_estimators=20, random_state=42).fit(frame, split["progress_train"], sample_weight=weights)
+    np.testing.assert_array_equal(reg.predict(frame), ref.predict(frame))
@@ -1,3 +1,5 @@
+import numpy as np
+import pandas as pd
 import pytest
 from src.fallback import HeuristicModel
 
@@ -24,3 +26,45 @@ def test_heuristic_missing_data():
     result = model.predict(data)
     assert result["status"] == "fallback_heuristic"
     assert result["prediction"] == 0
+
+
+def _scalar(model, records):
+    results = [model.predict(r) for r in records]
+    return [r["prediction"] for r in results], [r["probability"] for r in results]
+
+
+def test_batch_parity_with_scalar():
+    """Vectorized fallback gives exactly the scalar answers, boundaries and missing values included."""
+    model = HeuristicModel()
+    rng = np.random.default_rng(0)
+    records = [{"Progress_Percentage": float(p), "Quiz_Score_Avg": float(q)}
+               for p, q in zip(rng.uniform(0, 100, 500), rng.uniform(0, 100, 500))]
+    records += [
+        {"Progress_Percentage": 90, "Quiz_Score_Avg": 70}, {"Progress_Percentage": 90, "Quiz_Score_Avg": 69.9},
+        {"Progress_Percentage": 30, "Quiz_Score_Avg": 100}, {"Progress_Percentage": 30.1, "Quiz_Score_Avg": 0},
+        {"Progress_Percentage": 95}, {"Quiz_Score_Avg": 80}, {"Age": 25}, {},
+        {"Progress_Percentage": 60, "Quiz_Score_Avg": float("nan")},
+        {"Progress_Percentage": 60, "Quiz_Score_Avg": None},
+        {"Progress_Percentage": float("nan"), "Quiz_Score_Avg": 80},
+        {"Progress_Percentage": None, "Quiz_Score_Avg": None}, {"Age": float("nan")},
+    ]
+    expected_pred, expected_proba = _scalar(model, records)
+
+    pred, proba = model.predict_records(records)
+    assert pred.tolist() == expected_pred
+    np.testing.assert_array_equal(proba, expected_proba)
+
+    # Columns of a frame built from the same records: absent keys become NaN cells
+    frame = pd.DataFrame(records)
+    pred, proba = model.predict_batch(frame["Progress_Percentage"], frame["Quiz_Score_Avg"],
+                                      empty=frame.isna().all(axis=1))
+    assert pred.tolist() == expected_pred
+    np.testing.assert_array_equal(proba, expected_proba)
+
+
+def test_missing_values_match_absent_keys():
+    model = HeuristicModel()
+    for record in ({"Progress_Percentage": None, "Quiz_Score_Avg": 80},
+                   {"Progress_Percentage": float("nan"), "Quiz_Score_Avg": 80}):
+        assert model.predict(record) == model.predict({"Quiz_Score_Avg": 80})
+    assert model.predict({"Progress_Percentage": None})["status"] == "fallback_heuristic"
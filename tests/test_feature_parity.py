@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.preprocessing import LabelEncoder
+from xgboost import XGBClassifier
+
+import app.main as main
+from benchmarks.synthetic_data import make_raw_frame
+from src.features import apply_feature_cross, apply_hashing
+from src.pipeline_transformers import FeaturePipeline
+from src.preprocess import clean_data
+
+N_FEATURES = 16
+
+
+@pytest.fixture(scope="module")
+def raw_df():
+    return make_raw_frame(400, seed=7)
+
+
+@pytest.fixture(scope="module")
+def trained(raw_df):
+    """Offline: the train_model.py feature steps + an XGBoost model."""
+    pipeline = FeaturePipeline(n_features=N_FEATURES)
+    final_df = pipeline.fit_transform(clean_data(raw_df))
+    X = final_df.drop(columns=['target', 'Progress_Percentage'])
+    model = XGBClassifier(n_estimators=30, max_depth=4).fit(X, final_df['target'])
+    return pipeline, model, X
+
+
+def test_matches_previous_label_encoding_and_hashing(raw_df):
+    """Lookup tables reproduce the old per-column LabelEncoder + apply_hashing output."""
+    clean = clean_data(raw_df)
+    legacy = apply_hashing(apply_feature_cross(clean.copy()), 'Student_ID', n_features=N_FEATURES)
+    for col in legacy.select_dtypes(exclude='number').columns:
+        legacy[col] = LabelEncoder().fit_transform(legacy[col].astype(str))
+
+    new = FeaturePipeline(n_features=N_FEATURES).fit_transform(clean)
+    assert list(new.columns) == list(legacy.columns)
+    pd.testing.assert_frame_equal(new, legacy, check_dtype=False)
+
+
+def test_unseen_category_is_missing(trained):
+    pipeline, _, _ = trained
+    df = clean_data(make_raw_frame(3, seed=1).drop(columns=['Completed']))
+    df['City'] = 'Atlantis'
+    assert pipeline.transform(df)['City'].isna().all()
+
+
+def test_offline_online_parity(trained, raw_df, monkeypatch):
+    """The API scores raw records exactly like the offline pipeline."""
+    pipeline, model, X = trained
+    offline_proba = model.predict_proba(X)[:, 1]
+    offline_pred = model.predict(X)
+
+    records = raw_df.drop(columns=['Completed']).to_dict(orient='records')
+    monkeypatch.setattr(main.registry, "_versions", {})
+    mv = main.registry.register("default", model, pipeline)
+    encoder = mv.encoder
+    assert encoder is not None
+    client = TestClient(main.app)
+
+    for use_encoder in (encoder, None):  # numpy fast path, then pandas path
+        monkeypatch.setattr(mv, "encoder", use_encoder)
+        results = client.post("/predict/batch", json=records).json()["results"]
+        assert all(r["meta"]["mode"] == "model" for r in results)
+        np.testing.assert_array_equal([r["prediction"] for r in results], offline_pred)
+        np.testing.assert_allclose([r["probability"] for r in results], offline_proba, rtol=1e-5)
+
+    single = client.post("/predict", json=records[0]).json()
+    assert single["prediction"] == offline_pred[0]
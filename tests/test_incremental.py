@@ -0,0 +1,114 @@
+import json
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost
+from sklearn.ensemble import RandomForestClassifier
+from xgboost import XGBClassifier
+
+import src.train_model as train_model
+from app.registry import ModelRegistry
+from benchmarks.synthetic_data import make_raw_frame
+from src.features import apply_feature_cross
+from src.incremental import MANIFEST_FILE, PartitionTracker, continue_model, drifted_columns, reference_profile
+from src.preprocess import clean_data
+from src.storage import partition_paths, write_partition
+
+
+def features_part(seed, n=400, shift=0.0):
+    df = apply_feature_cross(clean_data(make_raw_frame(n, seed=seed)))
+    df["Age"] = df["Age"] + shift
+    return df
+
+
+@pytest.fixture
+def dataset(tmp_path, monkeypatch):
+    monkeypatch.setattr(train_model, "CHECKPOINT_DIR", str(tmp_path / "models"))
+    monkeypatch.setattr(train_model, "TRAIN_CORES", 1)
+    directory = tmp_path / "3_features"
+    for part in range(3):
+        write_partition(features_part(seed=part), str(directory), part)
+    return directory
+
+
+def manifest(tmp_path):
+    return json.loads((tmp_path / "models" / MANIFEST_FILE).read_text())
+
+
+def test_full_then_incremental_update(dataset, tmp_path):
+    assert train_model.train_incremental(str(dataset)) == "full"
+    assert len(manifest(tmp_path)["partitions"]) == 3
+
+    write_partition(features_part(seed=10), str(dataset), 3)
+    assert train_model.train_incremental(str(dataset)) == "incremental"
+    models = tmp_path / "models"
+    assert joblib.load(models / "XGBoost_Boosting.pkl").get_booster().num_boosted_rounds() == 100 + train_model.INCREMENTAL_ROUNDS
+    assert len(joblib.load(models / "RandomForest_Bagging.pkl").estimators_) == 100 + train_model.INCREMENTAL_TREES
+    assert joblib.load(models / "XGBoost_Reframed_Regressor.pkl").get_booster().num_boosted_rounds() == 120
+    assert len(manifest(tmp_path)["partitions"]) == 4
+    assert (models / "model.pkl").exists() and (models / "data_profile.json").exists()
+    # the manifest and the data profile are not served as models
+    assert not {"incremental", "data_profile"} & set(ModelRegistry(str(models / "model.pkl")).discover())
+
+    # nothing new -> nothing to do
+    assert train_model.train_incremental(str(dataset)) is None
+
+
+def test_guard_falls_back_to_full_retrain(dataset, tmp_path):
+    train_model.train_incremental(str(dataset))
+
+    # drifted new partition
+    write_partition(features_part(seed=11, shift=30), str(dataset), 3)
+    tracker = PartitionTracker(str(tmp_path / "models"))
+    new_df = clean_data(features_part(seed=11, shift=30))
+    pipeline = joblib.load(tmp_path / "models" / "feature_pipeline.pkl")
+    reasons = tracker.retrain_reasons(partition_paths(str(dataset)), new_df, pipeline, [])
+    assert any("drift" in r and "Age" in r for r in reasons)
+    assert train_model.train_incremental(str(dataset)) == "full"
+
+    # history rewritten
+    write_partition(features_part(seed=12), str(dataset), 0)
+    assert train_model.train_incremental(str(dataset)) == "full"
+
+
+def test_schema_and_category_guards(dataset, tmp_path):
+    train_model.train_incremental(str(dataset))
+    tracker = PartitionTracker(str(tmp_path / "models"))
+    pipeline = joblib.load(tmp_path / "models" / "feature_pipeline.pkl")
+    paths = partition_paths(str(dataset))
+
+    new_df = clean_data(features_part(seed=20))
+    assert tracker.retrain_reasons(paths, new_df, pipeline, []) == []
+    assert "schema changed" in tracker.retrain_reasons(paths, new_df.drop(columns=["Age"]), pipeline, [])[0]
+    unseen = new_df.assign(City=new_df["City"].cat.add_categories(["Atlantis"]))
+    unseen.loc[0, "City"] = "Atlantis"
+    assert any("Atlantis" in r for r in tracker.retrain_reasons(paths, unseen, pipeline, []))
+    assert any("missing" in r for r in tracker.retrain_reasons(paths, new_df, pipeline, [str(tmp_path / "nope.pkl")]))
+
+
+def test_continue_model_keeps_previous_trees():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(600, 4))
+    y = (X[:, 0] + rng.normal(0, 0.5, 600) > 0).astype(int)
+
+    xgb = XGBClassifier(n_estimators=30, max_depth=3).fit(X[:400], y[:400])
+    before = xgb.get_booster()[:30].predict(xgboost.DMatrix(X), output_margin=True)
+    continue_model(xgb, X[400:], y[400:], rounds=10)
+    assert xgb.get_booster().num_boosted_rounds() == 40 and xgb.n_estimators == 40
+    after = xgb.get_booster()[:30].predict(xgboost.DMatrix(X), output_margin=True)
+    np.testing.assert_array_equal(before, after)
+
+    rf = RandomForestClassifier(n_estimators=20, random_state=0).fit(X[:400], y[:400])
+    old_trees = list(rf.estimators_)
+    continue_model(rf, X[400:], y[400:], trees=5)
+    assert len(rf.estimators_) == 25 and rf.estimators_[:20] == old_trees and not rf.warm_start
+
+
+def test_drift_profile():
+    rng = np.random.default_rng(0)
+    ref = pd.DataFrame({"a": rng.normal(size=5000)})
+    profile = reference_profile(ref, ["a"])
+    assert drifted_columns(profile, pd.DataFrame({"a": rng.normal(size=2000)})) == {}
+    assert "a" in drifted_columns(profile, pd.DataFrame({"a": rng.normal(1.0, 1, 2000)}))
@@ -0,0 +1,108 @@
+import asyncio
+import time
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.inference import InferenceExecutor, ExecutorSaturated, limit_model_threads, predict_frame
+
+
+class SlowModel:
+    classes_ = np.array([0, 1])
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+
+    def predict_proba(self, df):
+        time.sleep(self.delay)
+        return np.tile([0.2, 0.8], (len(df), 1))
+
+
+def test_predict_frame_with_and_without_proba():
+    class Regressor:
+        def predict(self, df):
+            return np.asarray(df) * 2
+
+    preds, probas = predict_frame(SlowModel(0), [[1], [2]])
+    assert list(preds) == [1, 1]
+    assert list(probas) == [0.8, 0.8]
+
+    preds, probas = predict_frame(Regressor(), [1, 2])
+    assert list(preds) == [2, 4]
+    assert probas is None
+
+
+def test_event_loop_stays_responsive():
+    """A slow model call must not block other coroutines on the loop."""
+    executor = InferenceExecutor(kind="thread", workers=1, max_queue=4)
+
+    async def main_():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        t = asyncio.create_task(ticker())
+        await executor.predict(SlowModel(0.1), [[0]])
+        t.cancel()
+        return ticks
+
+    assert asyncio.run(main_()) > 5
+    executor.shutdown()
+
+
+def test_admission_control_rejects_when_full():
+    executor = InferenceExecutor(kind="thread", workers=1, max_queue=1)
+
+    async def main_():
+        return await asyncio.gather(
+            *(executor.predict(SlowModel(0.05), [[0]]) for _ in range(4)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(main_())
+    rejected = [r for r in results if isinstance(r, ExecutorSaturated)]
+    assert len(rejected) == 2
+    assert executor.pending == 0
+    executor.shutdown()
+
+
+def test_limit_model_threads():
+    from xgboost import XGBClassifier
+
+    model = limit_model_threads(XGBClassifier(n_jobs=16), 2)
+    assert model.get_params()["n_jobs"] == 2
+
+
+class SaturatedExecutor:
+    async def predict(self, model, df, source=None):
+        raise ExecutorSaturated("full")
+
+    async def predict_records(self, model, encoder, records, source=None):
+        raise ExecutorSaturated("full")
+
+
+@pytest.fixture
+def saturated(monkeypatch):
+    monkeypatch.setattr(main.registry, "_versions", {})
+    main.registry.register("default", SlowModel(0))
+    monkeypatch.setattr(main, "inference", SaturatedExecutor())
+
+
+def test_saturated_predict_falls_back(saturated, monkeypatch):
+    monkeypatch.setattr(main, "INFERENCE_SATURATION", "fallback")
+    data = TestClient(main.app).post("/predict", json={"Progress_Percentage": 95, "Quiz_Score_Avg": 80}).json()
+    assert data["meta"]["reason"] == "saturated"
+    assert data["prediction"] == 1
+
+
+def test_saturated_predict_rejects_with_503(saturated, monkeypatch):
+    monkeypatch.setattr(main, "INFERENCE_SATURATION", "reject")
+    client = TestClient(main.app)
+    assert client.post("/predict", json={"Age": 20}).status_code == 503
+    assert client.post("/predict/batch", json=[{"Age": 20}]).status_code == 503
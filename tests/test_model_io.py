@@ -0,0 +1,41 @@
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from xgboost import XGBClassifier, XGBRegressor
+
+from src.model_io import export_native, load_model, native_path
+
+rng = np.random.default_rng(0)
+X = rng.normal(size=(200, 5)).astype(np.float32)
+y = (X[:, 0] > 0).astype(int)
+
+
+def test_native_path():
+    assert native_path("data/models/model.pkl") == "data/models/model.ubj"
+
+
+@pytest.mark.parametrize("estimator, target", [
+    (XGBClassifier(n_estimators=10), y),
+    (XGBRegressor(n_estimators=10), X[:, 1]),
+])
+def test_native_roundtrip(tmp_path, estimator, target):
+    model = estimator.fit(X, target)
+    path = export_native(model, str(tmp_path / "model.ubj"))
+
+    loaded = load_model(path)
+    assert type(loaded) is type(model)
+    np.testing.assert_allclose(loaded.predict(X), model.predict(X))
+
+
+def test_non_xgboost_has_no_native_format(tmp_path):
+    model = RandomForestClassifier(n_estimators=3).fit(X, y)
+    assert export_native(model, str(tmp_path / "rf.ubj")) is None
+
+
+def test_joblib_mmap_load(tmp_path):
+    model = RandomForestClassifier(n_estimators=3, random_state=0).fit(X, y)
+    path = str(tmp_path / "rf.pkl")
+    joblib.dump(model, path)
+    loaded = load_model(path, mmap_mode="r")
+    np.testing.assert_array_equal(loaded.predict(X), model.predict(X))
@@ -0,0 +1,127 @@
+import threading
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import CollectorRegistry, Counter, Gauge
+
+import app.main as main
+from app.cache import PredictionCache
+
+
+class CountingModel:
+    classes_ = np.array([0, 1])
+
+    def __init__(self):
+        self.rows = 0
+
+    def predict_proba(self, df):
+        self.rows += len(df)
+        p = df["Progress_Percentage"].fillna(0).to_numpy(dtype=float) / 100
+        return np.column_stack([1 - p, p])
+
+
+def test_lru_eviction_and_metrics():
+    registry = CollectorRegistry()
+    cache = PredictionCache(
+        max_size=2, ttl=0,
+        hits=Counter("h", "h", registry=registry),
+        misses=Counter("m", "m", registry=registry),
+        evictions=Counter("e", "e", ["reason"], registry=registry),
+        size=Gauge("s", "s", registry=registry),
+    )
+    cache.put("a", {"prediction": 1})
+    cache.put("b", {"prediction": 0})
+    assert cache.get("a") == {"prediction": 1}  # "a" is now most recent
+    cache.put("c", {"prediction": 1})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert registry.get_sample_value("h_total") == 3
+    assert registry.get_sample_value("m_total") == 1
+    assert registry.get_sample_value("e_total", {"reason": "size"}) == 1
+    assert registry.get_sample_value("s") == 2
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.cache.time.monotonic", lambda: now[0])
+    cache = PredictionCache(max_size=10, ttl=5)
+    cache.put("a", {"prediction": 1})
+    now[0] += 4
+    assert cache.get("a") is not None
+    now[0] += 2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_invalidate_drops_only_that_model():
+    cache = PredictionCache(max_size=10)
+    cache.put(("default", "v1", b"x"), {"prediction": 1})
+    cache.put(("other", "v1", b"x"), {"prediction": 0})
+    cache.invalidate("default")
+    assert cache.get(("default", "v1", b"x")) is None
+    assert cache.get(("other", "v1", b"x")) is not None
+
+
+def test_concurrent_access_stays_bounded():
+    cache = PredictionCache(max_size=50)
+
+    def work(t):
+        for i in range(2000):
+            cache.put((t, i % 80), {"prediction": i})
+            cache.get((t, (i * 7) % 80))
+
+    threads = [threading.Thread(target=work, args=(t,)) for t in range(8)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    assert len(cache) == 50
+
+
+def test_key_ignores_formatting_and_extra_fields(monkeypatch):
+    monkeypatch.setattr(main.registry, "_versions", {})
+    mv = main.registry.register("default", CountingModel())
+    key = main._cache_key({"Age": 20, "City": "Delhi"}, mv)
+    assert main._cache_key({"Age": "20", "City": "Delhi", "Unknown": 1}, mv) == key
+    assert main._cache_key({"Age": 20.0, "City": "Delhi"}, mv) == key
+    assert main._cache_key({"Age": 21, "City": "Delhi"}, mv) != key
+
+
+@pytest.fixture
+def cached_api(monkeypatch):
+    model = CountingModel()
+    monkeypatch.setattr(main.registry, "_versions", {})
+    monkeypatch.setattr(main, "prediction_cache", PredictionCache(max_size=100))
+    main.registry.register("default", model)
+    return model, TestClient(main.app)
+
+
+def test_repeated_requests_skip_the_model(cached_api):
+    model, client = cached_api
+    record = {"Student_ID": "S1", "Progress_Percentage": 90, "Quiz_Score_Avg": 80}
+
+    first = client.post("/predict", json=record).json()
+    second = client.post("/predict", json=record).json()
+    assert first == second
+    assert "probability" not in second
+    assert model.rows == 1
+
+    batch = client.post("/predict/batch", json=[record, {**record, "Progress_Percentage": 10}]).json()
+    assert [r["prediction"] for r in batch["results"]] == [1, 0]
+    assert batch["results"][0]["probability"] == pytest.approx(0.9)
+    assert model.rows == 2  # only the new record was scored
+
+
+def test_model_swap_invalidates(cached_api):
+    model, client = cached_api
+    record = {"Progress_Percentage": 90}
+    client.post("/predict", json=record)
+    assert len(main.prediction_cache) == 1
+
+    new_model = CountingModel()
+    main.registry.register("default", new_model)
+    assert len(main.prediction_cache) == 0
+    client.post("/predict", json=record)
+    assert new_model.rows == 1
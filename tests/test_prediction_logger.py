@@ -0,0 +1,110 @@
+import json
+import multiprocessing
+import os
+import time
+
+from fastapi.testclient import TestClient
+
+import app.main as main
+from src.monitoring import PredictionLogger, log_segments
+
+
+def read_lines(path):
+    return [json.loads(line) for p in log_segments(str(path)) for line in open(p)]
+
+
+def test_log_is_buffered_until_flush(tmp_path):
+    path = tmp_path / "logs" / "predictions.jsonl"
+    logger = PredictionLogger(str(path), buffer_size=100)
+    for i in range(3):
+        logger.log({"Age": 20.0 + i}, {"prediction": 1, "probability": 0.7}, "default", "abc")
+    assert not log_segments(str(path)) and len(logger) == 3
+
+    assert logger.flush() == 3 and len(logger) == 0
+    lines = read_lines(path)
+    assert [l["input"]["Age"] for l in lines] == [20.0, 21.0, 22.0]
+    assert lines[0]["prediction"] == 1 and lines[0]["probability"] == 0.7 and lines[0]["version"] == "abc"
+
+
+def test_overflow_drops_oldest_and_counts(tmp_path):
+    logger = PredictionLogger(str(tmp_path / "p.jsonl"), buffer_size=5)
+    for i in range(8):
+        logger.log({"Age": float(i)}, {"prediction": 0})
+    assert logger.dropped == 3
+    logger.flush()
+    assert [l["input"]["Age"] for l in read_lines(tmp_path / "p.jsonl")] == [3.0, 4.0, 5.0, 6.0, 7.0]
+
+
+def test_sampling_and_disabled(tmp_path):
+    off = PredictionLogger(str(tmp_path / "a.jsonl"), buffer_size=0)
+    none = PredictionLogger(str(tmp_path / "b.jsonl"), sample_rate=0)
+    for logger in (off, none):
+        logger.log({}, {"prediction": 1})
+        assert len(logger) == 0 and logger.flush() == 0
+
+
+def test_size_rotation_keeps_backups(tmp_path):
+    path = tmp_path / "p.jsonl"
+    logger = PredictionLogger(str(path), max_bytes=500, backups=2)
+    for batch in range(6):
+        for i in range(3):
+            logger.log({"Age": float(batch)}, {"prediction": 1, "probability": 0.5})
+        logger.flush()
+    segments = log_segments(str(path))
+    assert len(segments) == 3 and segments[-1] == logger.live_path
+    assert all(os.path.getsize(p) <= 500 for p in segments)
+    # newest records survive, in order
+    ages = [l["input"]["Age"] for l in read_lines(path)]
+    assert ages == sorted(ages) and ages[-1] == 5.0
+
+
+def test_background_writer_and_predict_endpoint(tmp_path, monkeypatch):
+    logger = PredictionLogger(str(tmp_path / "p.jsonl"), flush_interval=0.05)
+    monkeypatch.setattr(main, "prediction_logger", logger)
+    with TestClient(main.app) as client:
+        assert client.post("/predict", json={"Student_ID": "S1", "Age": 30, "Progress_Percentage": 80}).status_code == 200
+        deadline = time.time() + 5
+        while not log_segments(str(tmp_path / "p.jsonl")) and time.time() < deadline:
+            time.sleep(0.02)
+    lines = read_lines(tmp_path / "p.jsonl")
+    assert len(lines) == 1
+    assert lines[0]["input"]["Age"] == 30.0 and "probability" in lines[0]
+
+
+def _write_from_worker(path, worker):
+    logger = PredictionLogger(path, max_bytes=400, backups=1000)
+    for i in range(200):
+        logger.log({"Age": float(i), "worker": worker}, {"prediction": 1, "probability": 0.5})
+        if i % 7 == 0:
+            logger.flush()
+    logger.flush()
+
+
+def test_concurrent_workers_lose_no_lines(tmp_path):
+    """gunicorn workers log to the same LOG_FILE: each writes and rotates its own file."""
+    path = str(tmp_path / "p.jsonl")
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=_write_from_worker, args=(path, w)) for w in range(3)]
+    for p in workers:
+        p.start()
+    for p in workers:
+        p.join(30)
+    lines = read_lines(path)
+    assert len(lines) == 600
+    for w in range(3):
+        assert [l["input"]["Age"] for l in lines if l["input"]["worker"] == w] == [float(i) for i in range(200)]
+
+
+def test_stray_files_and_orphans(tmp_path):
+    path = tmp_path / "p.jsonl"
+    (tmp_path / "p.jsonl.tmp").write_text("not a segment\n")
+    orphan = tmp_path / "p.jsonl.live-999999999"  # live file of an exited worker
+    orphan.write_text(json.dumps({"input": {"Age": 1.0}}) + "\n")
+    assert log_segments(str(path)) == [str(orphan)]
+
+    logger = PredictionLogger(str(path))
+    logger.log({"Age": 2.0}, {"prediction": 1})
+    logger.flush()
+    logger.rotate()
+    assert not orphan.exists()
+    assert sorted(l["input"]["Age"] for l in read_lines(path)) == [1.0, 2.0]
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic_data import make_raw_frame
+from src.features import apply_feature_cross
+from src.preprocess import clean_data
+
+
+def legacy_clean_data(df):
+    """The original row-by-row implementation, kept as the reference."""
+    df = df.copy()
+    df['target'] = df['Completed'].apply(lambda x: 1 if x == 'Completed' else 0)
+    df = df.drop(columns=['Completed'])
+    df['Enrollment_Date'] = pd.to_datetime(df['Enrollment_Date'], dayfirst=True)
+    df['Enrollment_Month'] = df['Enrollment_Date'].dt.month
+    return df.drop(columns=['Enrollment_Date'])
+
+
+@pytest.fixture
+def raw_df():
+    df = make_raw_frame(300, seed=11)
+    df.loc[[3, 50], 'Completed'] = None
+    return df
+
+
+def test_matches_legacy_values(raw_df):
+    out = clean_data(raw_df)
+    expected = legacy_clean_data(raw_df)
+    assert list(out.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(out, expected, check_dtype=False, check_categorical=False)
+    assert out['target'].tolist() == expected['target'].tolist()
+
+
+def test_downcast_dtypes(raw_df):
+    out = clean_data(raw_df)
+    assert out['target'].dtype == np.int8
+    assert out['Enrollment_Month'].dtype == np.int8
+    assert isinstance(out['Category'].dtype, pd.CategoricalDtype)
+    assert out['Instructor_Rating'].dtype == np.float32
+    assert out['Age'].dtype.itemsize < 8
+    # near-unique ids stay plain strings
+    assert not isinstance(out['Student_ID'].dtype, pd.CategoricalDtype)
+    assert out.memory_usage(deep=True).sum() < raw_df.memory_usage(deep=True).sum() / 2
+
+    kept = clean_data(raw_df, downcast=False)
+    assert kept['Instructor_Rating'].dtype == np.float64
+    assert kept['target'].dtype == np.int64
+
+
+def test_copy_and_inplace(raw_df):
+    before = raw_df.copy()
+    out = clean_data(raw_df)
+    assert out is not raw_df
+    pd.testing.assert_frame_equal(raw_df, before)
+
+    same = clean_data(raw_df, inplace=True)
+    assert same is raw_df
+    assert 'Completed' not in raw_df.columns and 'Enrollment_Month' in raw_df.columns
+
+
+def test_date_fallback_to_inference():
+    df = pd.DataFrame({'Enrollment_Date': ['05/03/2023', '20/11/2023']})
+    assert clean_data(df)['Enrollment_Month'].tolist() == [3, 11]
+
+
+def test_feature_cross_on_categoricals(raw_df):
+    out = apply_feature_cross(clean_data(raw_df))
+    expected = raw_df['Category'] + '_' + raw_df['Course_Level']
+    assert out['Category_Level_Cross'].tolist() == expected.tolist()
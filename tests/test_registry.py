@@ -0,0 +1,162 @@
+import os
+from types import SimpleNamespace
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from xgboost import XGBClassifier
+
+import app.main as main
+from app import inference
+from app.registry import ModelRegistry, UnknownModelError
+from src.data_profile import PROFILE_FILE, build_profile, save_profile
+from src.model_io import atomic_dump, export_native, publishing
+
+FEATURES = ["Age", "Progress_Percentage", "Quiz_Score_Avg"]
+RECORD = {"Age": 30, "Progress_Percentage": 95, "Quiz_Score_Avg": 80}
+
+
+def fit(flip=False):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.uniform(0, 100, size=(300, 3)), columns=FEATURES)
+    y = (X["Progress_Percentage"] > 50).astype(int)
+    return XGBClassifier(n_estimators=5, max_depth=2).fit(X, 1 - y if flip else y)
+
+
+@pytest.fixture
+def models_dir(tmp_path):
+    atomic_dump(fit(), str(tmp_path / "model.pkl"))
+    export_native(fit(flip=True), str(tmp_path / "Flipped.ubj"))
+    joblib.dump(fit(), str(tmp_path / "Flipped.pkl"))
+    (tmp_path / ".model-123.pkl").write_bytes(b"partial")
+    (tmp_path / "feature_pipeline.pkl").write_bytes(b"")
+    save_profile(build_profile(pd.DataFrame({"Age": [20.0, 30.0]})), str(tmp_path / PROFILE_FILE))
+    return tmp_path
+
+
+def make_registry(models_dir, **kwargs):
+    return ModelRegistry(default_path=str(models_dir / "model.pkl"),
+                         numeric_cols=main.NUMERIC_COLS, **kwargs)
+
+
+def test_discovery(models_dir):
+    found = make_registry(models_dir).discover()
+    assert found == {
+        "default": str(models_dir / "model.pkl"),
+        "Flipped": str(models_dir / "Flipped.ubj"),  # native preferred
+    }  # the data profile next to the models is not one of them
+
+
+def test_unknown_model_raises(models_dir):
+    with pytest.raises(UnknownModelError):
+        make_registry(models_dir).load("missing")
+
+
+def test_refresh_swaps_only_changed_models(models_dir):
+    registry = make_registry(models_dir)
+    # other models in the directory wait for a request
+    assert registry.refresh() == ["default"]
+    assert registry.get("Flipped") is None
+    old = registry.get()
+    assert registry.refresh() == []
+
+    atomic_dump(fit(flip=True), str(models_dir / "model.pkl"))
+    os.utime(models_dir / "model.pkl", ns=(1, 1))  # mtime alone must not be trusted to tick
+    assert registry.refresh() == ["default"]
+    assert registry.get() is not old
+    assert registry.get().version != old.version
+
+
+def test_refresh_keeps_requested_and_preload_models_current(models_dir):
+    registry = make_registry(models_dir, preload=["Flipped"])
+    assert sorted(registry.refresh()) == ["Flipped", "default"]
+
+    lazy = make_registry(models_dir)
+    lazy.refresh()
+    lazy.load("Flipped")
+    export_native(fit(), str(models_dir / "Flipped.ubj"))
+    os.utime(models_dir / "Flipped.ubj", ns=(1, 1))
+    assert lazy.refresh() == ["Flipped"]
+
+
+def test_refresh_waits_for_publish(models_dir):
+    registry = make_registry(models_dir)
+    registry.load()
+    with publishing(str(models_dir)):
+        atomic_dump(fit(flip=True), str(models_dir / "model.pkl"))
+        assert registry.refresh() == []
+    assert "default" in registry.refresh()
+
+
+def pipeline(tag):
+    """Stand-in for a fitted FeaturePipeline (no encoded columns)."""
+    return SimpleNamespace(tag=tag, vocabularies={}, cross=None, hashed_cols=(), month_col=None, numeric_cols=())
+
+
+def test_pipeline_change_alone_changes_version(models_dir, monkeypatch):
+    """A retrain that only rewrites feature_pipeline.pkl must reach process workers."""
+    monkeypatch.setattr(inference, "_worker_numeric_cols", set(main.NUMERIC_COLS))
+    monkeypatch.setattr(inference, "_worker_models", {})
+    pipeline_path = models_dir / "feature_pipeline.pkl"
+    joblib.dump(pipeline("old"), str(pipeline_path))
+    registry = make_registry(models_dir, pipeline_path=str(pipeline_path))
+    old = registry.load()
+    assert inference._worker_get(old.source)[1].pipeline.tag == "old"
+
+    joblib.dump(pipeline("new"), str(pipeline_path))
+    assert "default" in registry.refresh()
+    new = registry.get()
+    assert new.version != old.version
+    assert inference._worker_get(new.source)[1].pipeline.tag == "new"
+
+
+def test_failed_warmup_keeps_previous_version(models_dir):
+    calls = []
+
+    def warmup(mv):
+        calls.append(mv.version)
+        if len(calls) > 1:
+            raise ValueError("broken model")
+
+    registry = make_registry(models_dir, warmup=warmup)
+    old = registry.load()
+    atomic_dump(fit(flip=True), str(models_dir / "model.pkl"))
+    with pytest.raises(ValueError):
+        registry.load()
+    assert registry.get() is old
+
+
+@pytest.fixture
+def client(models_dir, monkeypatch):
+    registry = make_registry(models_dir)
+    registry.load()
+    monkeypatch.setattr(main, "registry", registry)
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "secret")
+    return TestClient(main.app)
+
+
+def test_predict_selects_model_per_request(client):
+    default = client.post("/predict", json=RECORD).json()
+    flipped = client.post("/predict?model=Flipped", json=RECORD).json()
+    assert default["prediction"] == 1 and default["meta"]["model"] == "default"
+    assert flipped["prediction"] == 0 and flipped["meta"]["model"] == "Flipped"
+
+    batch = client.post("/predict/batch?model=Flipped", json=[RECORD]).json()
+    assert batch["results"][0]["prediction"] == 0
+    assert client.post("/predict?model=nope", json=RECORD).status_code == 404
+    assert client.post("/predict/batch?model=nope", json=[RECORD]).status_code == 404
+
+
+def test_admin_reload(client, models_dir):
+    assert client.post("/admin/models/reload").status_code == 403
+
+    atomic_dump(fit(flip=True), str(models_dir / "model.pkl"))
+    response = client.post("/admin/models/reload?model=default", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
+    assert response.json()["reloaded"] == ["default"]
+    assert client.post("/predict", json=RECORD).json()["prediction"] == 0
+
+    models = client.get("/models").json()
+    assert models["default"]["version"] == main.registry.get().version
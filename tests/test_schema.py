@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+import app.main as main
+import app.schema as schema
+from app.schema import RecordSchema
+
+record_schema = RecordSchema(main.EXPECTED_COLS, main.NUMERIC_COLS)
+
+PAYLOADS = [
+    {},
+    {"Age": 20, "Progress_Percentage": "95", "Quiz_Score_Avg": 80.5, "City": "Delhi"},
+    {"Age": "n/a", "Progress_Percentage": "", "Quiz_Score_Avg": None, "Gender": 1, "Extra": [1]},
+    {"Age": True, "Course_ID": 101, "Enrollment_Date": "01-02-2024", "Payment_Amount": [3]},
+    {"Student_ID": None, "Rewatch_Count": "1e3", "Fee_Paid": False},
+]
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_typed_record_aligns_like_raw_payload(payload):
+    record = record_schema.coerce(payload)
+    assert set(record) <= set(main.EXPECTED_COLS)
+    assert main._align_row(record) == main._align_row(payload)
+
+
+def test_numeric_fields_are_floats():
+    record = record_schema.coerce({"Age": "21", "Progress_Percentage": 90, "City": 7})
+    assert record == {"Age": 21.0, "Progress_Percentage": 90.0, "City": "7"}
+
+
+@pytest.mark.parametrize("payload, message", [
+    ([1, 2], "JSON object"),
+    ({f"k{i}": i for i in range(201)}, "too many fields"),
+    ({"Unknown": "x" * 5001}, "too large"),
+])
+def test_guard_errors(payload, message):
+    with pytest.raises(ValueError, match=message):
+        record_schema.coerce(payload)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_loads_dumps_roundtrip(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(schema, "orjson", None)
+    elif schema.orjson is None:
+        pytest.skip("orjson not installed")
+    obj = {"results": [{"prediction": 1, "probability": 0.25, "meta": {"mode": "model"}}], "count": 1}
+    assert json.loads(schema.dumps(obj)) == obj
+    assert schema.loads(json.dumps(obj).encode()) == obj
+    with pytest.raises(ValueError):
+        schema.loads(b"{not json")
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from xgboost import XGBClassifier
+
+import app.main as main
+from benchmarks.synthetic_data import make_raw_frame
+from src.features import apply_hashing, hashed_names, hashing_matrix, sparse_design_matrix
+from src.pipeline_transformers import FeaturePipeline
+from src.preprocess import clean_data
+
+HASH_COLS = ['Student_ID', 'Course_ID', 'City']
+N_FEATURES = 8
+
+
+@pytest.fixture(scope="module")
+def raw_df():
+    return make_raw_frame(300, seed=5)
+
+
+def test_matrix_matches_dense_hashing(raw_df):
+    X = hashing_matrix(raw_df, HASH_COLS, N_FEATURES)
+    assert X.shape == (len(raw_df), len(HASH_COLS) * N_FEATURES)
+    assert X.nnz == len(raw_df) * len(HASH_COLS)
+
+    dense = raw_df[HASH_COLS]
+    for col in HASH_COLS:
+        dense = apply_hashing(dense, col, n_features=N_FEATURES)
+    assert list(dense.columns) == hashed_names(HASH_COLS, N_FEATURES)
+    np.testing.assert_array_equal(X.toarray(), dense.to_numpy())
+
+
+def test_design_matrix_keeps_zeros_and_missing():
+    frame = pd.DataFrame({'a': [0.0, 1.0], 'b': [np.nan, 2.0]})
+    hashed = hashing_matrix(pd.DataFrame({'id': ['x', 'y']}), ['id'], 4)
+    X = sparse_design_matrix(frame, hashed)
+    assert X.shape == (2, 6)
+    # every frame cell is stored (0 stays 0, NaN stays missing), plus one bucket per row
+    assert X.nnz == 2 * 2 + 2
+    assert np.isnan(X[0, 1])
+
+
+def test_sparse_transform_matches_dense(raw_df):
+    clean = clean_data(raw_df)
+    pipeline = FeaturePipeline(hash_col=HASH_COLS, n_features=N_FEATURES).fit(clean)
+    assert pipeline.hashed_cols == hashed_names(HASH_COLS, N_FEATURES)
+    assert 'City' not in pipeline.vocabularies
+
+    dense = pipeline.transform(clean)
+    frame, hashed = pipeline.transform_sparse(clean)
+    assert list(frame.columns) + pipeline.hashed_cols == list(dense.columns)
+    np.testing.assert_array_equal(sparse_design_matrix(frame, hashed).toarray(),
+                                  dense.to_numpy(dtype=np.float32))
+
+
+def test_sparse_trained_model_serving_parity(raw_df, monkeypatch):
+    """A model trained on the CSR matrix scores raw records the same through the API."""
+    clean = clean_data(raw_df)
+    pipeline = FeaturePipeline(hash_col=HASH_COLS, n_features=N_FEATURES, sparse_hashing=True)
+    frame, hashed = pipeline.fit_transform_sparse(clean)
+    frame = frame.drop(columns=['target', 'Progress_Percentage'])
+    X = sparse_design_matrix(frame, hashed)
+    model = XGBClassifier(n_estimators=30, max_depth=4).fit(X, clean['target'])
+    model.get_booster().feature_names = list(frame.columns) + pipeline.hashed_cols
+    offline_proba = model.predict_proba(X)[:, 1]
+
+    # dense transform writes NaN for unset buckets, like the CSR matrix
+    assert pipeline.transform(clean)[pipeline.hashed_cols].isna().to_numpy().sum() == \
+        len(clean) * len(HASH_COLS) * (N_FEATURES - 1)
+
+    records = raw_df.drop(columns=['Completed']).to_dict(orient='records')
+    monkeypatch.setattr(main.registry, "_versions", {})
+    mv = main.registry.register("default", model, pipeline)
+    assert mv.encoder is not None
+    client = TestClient(main.app)
+    for use_encoder in (mv.encoder, None):
+        monkeypatch.setattr(mv, "encoder", use_encoder)
+        results = client.post("/predict/batch", json=records).json()["results"]
+        assert all(r["meta"]["mode"] == "model" for r in results)
+        np.testing.assert_allclose([r["probability"] for r in results], offline_proba, rtol=1e-5)
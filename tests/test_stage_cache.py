@@ -0,0 +1,83 @@
+import os
+import shutil
+import importlib.util
+
+import pytest
+
+import run_pipeline
+from benchmarks.synthetic_data import make_raw_frame
+from src import stages
+from src.stage_cache import StageCache
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    raw = tmp_path / "data" / "raw"
+    raw.mkdir(parents=True)
+    make_raw_frame(2000, seed=0).to_csv(raw / "Course_Completion_Prediction.csv", index=False)
+    return tmp_path / "data"
+
+
+def module(path):
+    spec = importlib.util.spec_from_file_location("stage_module", path)
+    return importlib.util.module_from_spec(spec)
+
+
+def test_cache_hit_and_invalidation(tmp_path):
+    src, out, code_file = tmp_path / "in.csv", tmp_path / "out.csv", tmp_path / "stage_module.py"
+    src.write_text("a\n1\n")
+    code_file.write_text("X = 1\n")
+    code = module(code_file)
+    calls = []
+
+    def stage():
+        calls.append(1)
+        out.write_text(src.read_text() + "2\n")
+
+    def run(params=None):
+        return StageCache(tmp_path).run("s", stage, [src], [out], params or {"n": 1}, [code])
+
+    assert run() and not run()
+    assert run({"n": 2}) and not run({"n": 2})                    # parameters
+    src.write_text("a\n5\n")
+    assert run({"n": 2})                                          # input content
+    code_file.write_text("X = 2\n")
+    assert run({"n": 2}) and not run({"n": 2})                    # code
+    out.write_text("tampered")
+    assert run({"n": 2})                                          # modified output
+    out.unlink()
+    assert run({"n": 2}) and out.exists()                         # missing output
+    assert StageCache(tmp_path, enabled=False).run("s", stage, [src], [out], {"n": 2}, [code])
+    assert len(calls) == 7
+
+
+def test_pipeline_rerun_is_skipped_and_shared(data_dir, tmp_path, capsys):
+    run_pipeline.main(str(data_dir))
+    paths = stages.StagePaths(str(data_dir))
+    assert os.path.exists(paths.train) and os.path.exists(paths.test)
+    assert sorted(os.listdir(data_dir / ".stage_cache")) == [
+        "1_ingest_validate.json", "2_clean.json", "3_feature_engineering.json", "4_split_balance_save.json"]
+    capsys.readouterr()
+
+    # same volume under another mount point (the DAG's /opt/airflow/data)
+    moved = tmp_path / "mounted"
+    shutil.copytree(data_dir, moved)
+    run_pipeline.main(str(moved))
+    assert capsys.readouterr().out.count("⏭️") == 4
+
+    # a changed raw file re-runs every stage
+    make_raw_frame(2000, seed=1).to_csv(moved / "raw" / "Course_Completion_Prediction.csv", index=False)
+    run_pipeline.main(str(moved))
+    assert "⏭️" not in capsys.readouterr().out
+
+
+def test_stage_code_change_misses_cache(data_dir, tmp_path, monkeypatch, capsys):
+    """Editing src/stages.py (the stage bodies) re-runs the stages."""
+    run_pipeline.main(str(data_dir))
+    capsys.readouterr()
+
+    edited = tmp_path / "stages.py"
+    edited.write_text(open(stages.__file__).read() + "\n# edited\n")
+    monkeypatch.setattr(stages, "__file__", str(edited))
+    run_pipeline.main(str(data_dir))
+    assert "⏭️" not in capsys.readouterr().out
@@ -0,0 +1,45 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.storage import FORMATS, read_frame, stage_path, write_frame
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        'Student_ID': ['S1', 'S2', 'S3'],
+        'Category': pd.Categorical(['Design', 'Business', 'Design']),
+        'Age': [20, 31, 45],
+        'Quiz_Score_Avg': [80.5, None, 60.0],
+        'Enrollment_Date': pd.to_datetime(['2024-01-02', '2024-02-03', '2024-03-04']),
+    }, index=[5, 7, 9])
+
+
+def test_stage_path():
+    assert stage_path('data/interim', '2_cleaned', 'parquet') == os.path.join('data/interim', '2_cleaned.parquet')
+    assert stage_path('data/interim', '2_cleaned', 'csv').endswith('2_cleaned.csv')
+    with pytest.raises(ValueError):
+        stage_path('data/interim', '2_cleaned', 'xlsx')
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'feather'])
+def test_columnar_roundtrip_keeps_dtypes(tmp_path, df, fmt):
+    path = write_frame(df, stage_path(str(tmp_path), 'stage', fmt))
+    back = read_frame(path)
+    pd.testing.assert_frame_equal(back, df.reset_index(drop=True))
+    assert isinstance(back['Category'].dtype, pd.CategoricalDtype)
+
+
+@pytest.mark.parametrize('fmt', list(FORMATS))
+def test_column_pruning(tmp_path, df, fmt):
+    path = write_frame(df, stage_path(str(tmp_path), 'stage', fmt))
+    back = read_frame(path, columns=['Age', 'Student_ID'])
+    assert sorted(back.columns) == ['Age', 'Student_ID']
+    assert back['Age'].tolist() == [20, 31, 45]
+
+
+def test_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        read_frame(str(tmp_path / 'nope.parquet'))
@@ -0,0 +1,63 @@
+import os
+import re
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic_data import make_raw_frame
+from src.ingest import RAW_DTYPES, iter_data, stream_to_dataset
+from src.preprocess import clean_data
+from src.storage import partition_paths, read_frame
+from src.validate import StreamingValidator, validate_input_data
+
+
+@pytest.fixture
+def raw_csv(tmp_path):
+    df = make_raw_frame(250, seed=3)
+    path = tmp_path / "raw.csv"
+    df.to_csv(path, index=False)
+    return str(path), df
+
+
+def test_chunks_have_explicit_dtypes(raw_csv):
+    path, df = raw_csv
+    chunks = list(iter_data(path, chunksize=100))
+    assert [len(c) for c in chunks] == [100, 100, 50]
+    for chunk in chunks:
+        assert chunk['Age'].dtype == 'float64'
+        assert chunk['Student_ID'].dtype == pd.Series(['x'], dtype=RAW_DTYPES['Student_ID']).dtype
+
+
+def test_streamed_clean_matches_in_memory(raw_csv, tmp_path):
+    path, df = raw_csv
+    out = str(tmp_path / "2_cleaned")
+    n = stream_to_dataset(iter_data(path, chunksize=100), out, steps=[clean_data],
+                          validator=StreamingValidator())
+    assert n == 250
+    assert len(partition_paths(out)) == 3
+
+    streamed = read_frame(out)
+    expected = clean_data(validate_input_data(pd.read_csv(path)))
+    pd.testing.assert_frame_equal(streamed, expected, check_dtype=False)
+
+
+def test_validation_accumulates_across_chunks(raw_csv, tmp_path):
+    path, df = raw_csv
+    df.loc[[10, 120, 230], 'Category'] = None
+    df.to_csv(path, index=False)
+    out = str(tmp_path / "1_validated")
+
+    with pytest.raises(ValueError, match="Null values") as err:
+        stream_to_dataset(iter_data(path, chunksize=100), out, validator=StreamingValidator())
+    assert re.search(r"Category\s+3\b", str(err.value))
+    # nothing half-written is left behind
+    assert not os.path.exists(out)
+    assert os.listdir(tmp_path) == ["raw.csv"]
+
+
+def test_missing_column_and_empty_input():
+    validator = StreamingValidator()
+    with pytest.raises(ValueError, match="Missing columns"):
+        validator.update(pd.DataFrame({'Student_ID': ['S1']}))
+    with pytest.raises(ValueError, match="empty"):
+        StreamingValidator().finalize()
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY, CollectorRegistry, Histogram
+
+import app.main as main
+from app.timing import NULL_TIMER, StageTimer, stage_timer
+
+
+class FixedModel:
+    classes_ = np.array([0, 1])
+
+    def predict_proba(self, df):
+        return np.tile([0.3, 0.7], (len(df), 1))
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_stage_timer_accumulates_per_stage():
+    registry = CollectorRegistry()
+    hist = Histogram("stage", "stage", ["route", "stage"], registry=registry)
+    timer = StageTimer("/x")
+    timer.mark("parse")
+    timer.mark("inference")
+    timer.mark("parse")
+    timer.observe(hist)
+    assert set(timer.durations) == {"parse", "inference"}
+    assert registry.get_sample_value("stage_count", {"route": "/x", "stage": "parse"}) == 1
+
+
+def test_sampling():
+    assert stage_timer("/x", 0.0) is NULL_TIMER
+    assert isinstance(stage_timer("/x", 1.0), StageTimer)
+    NULL_TIMER.mark("parse")
+    assert NULL_TIMER.durations == {}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main.registry, "_versions", {})
+    monkeypatch.setattr(main, "METRICS_STAGE_SAMPLE_RATE", 1.0)
+    main.registry.register("default", FixedModel())
+    return TestClient(main.app)
+
+
+def test_request_counted_once_with_route_and_status(client):
+    before = sample("request_count_total", route="/predict", status="200")
+    client.post("/predict", json={"Progress_Percentage": 50})
+    assert sample("request_count_total", route="/predict", status="200") == before + 1
+
+    before = sample("request_count_total", route="unmatched", status="404")
+    client.get("/no/such/route")
+    assert sample("request_count_total", route="unmatched", status="404") == before + 1
+
+
+def test_predict_records_stage_breakdown(client):
+    stages = ("parse", "guard", "align", "transform", "inference", "fallback", "serialize")
+    before = {s: sample("request_stage_seconds_count", route="/predict", stage=s) for s in stages}
+    assert client.post("/predict", json={"Progress_Percentage": 50}).json()["meta"]["mode"] == "model"
+    for s in stages:
+        expected = before[s] + (0 if s == "fallback" else 1)
+        assert sample("request_stage_seconds_count", route="/predict", stage=s) == expected, s
+
+
+def test_unsampled_requests_record_no_stages(client, monkeypatch):
+    monkeypatch.setattr(main, "METRICS_STAGE_SAMPLE_RATE", 0.0)
+    before = sample("request_stage_seconds_count", route="/predict/batch", stage="parse")
+    client.post("/predict/batch", json=[{"Progress_Percentage": 50}])
+    assert sample("request_stage_seconds_count", route="/predict/batch", stage="parse") == before
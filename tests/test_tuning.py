@@ -0,0 +1,94 @@
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.train_model as train_model
+from src.tuning import SEARCH_SPACES, HyperparameterSearch, rung_resources, run_trial, sample_params
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame(rng.normal(size=(2000, 5)), columns=[f"f{i}" for i in range(5)])
+    df["Progress_Percentage"] = np.clip(50 + 25 * df["f0"] - 10 * df["f1"] + rng.normal(0, 10, len(df)), 0, 100)
+    df["target"] = (df["Progress_Percentage"] > 55).astype(int)
+    return df
+
+
+@pytest.fixture
+def tuning_file(data, tmp_path):
+    X = data[[f"f{i}" for i in range(5)]].to_numpy(np.float32)
+    y = data["target"].to_numpy()
+    path = tmp_path / "tuning.joblib"
+    joblib.dump({"X_fit": X[:1500], "y_fit": y[:1500], "X_valid": X[1500:], "y_valid": y[1500:],
+                 "fit_kwargs": {}}, path)
+    return str(path)
+
+
+def test_rungs_and_sampling():
+    assert rung_resources(400, 27, 3) == [15, 44, 133, 400]
+    assert rung_resources(200, 1, 3) == [200]
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        params = sample_params(SEARCH_SPACES["XGBoost_Boosting"], rng)
+        assert 3 <= params["max_depth"] <= 10 and 0.01 <= params["learning_rate"] <= 0.3
+        assert sample_params(SEARCH_SPACES["RandomForest_Bagging"], rng)["max_features"] in ("sqrt", "log2", 0.5)
+
+
+def test_successive_halving_in_pool(tuning_file):
+    trials = []
+    search = HyperparameterSearch(tuning_file, metric="f1", budget_seconds=120, n_trials=9, cores=2)
+    best = search.run(on_trial=lambda trial, outcome: trials.append((trial, outcome)))
+
+    assert set(best) == set(SEARCH_SPACES)
+    for name in SEARCH_SPACES:
+        rungs = [t["rung"] for t, _ in trials if t["model"] == name]
+        # 9 trials -> 3 -> 1
+        assert [rungs.count(r) for r in range(3)] == [9, 3, 1]
+        assert best[name]["rung"] == 2 and 0.5 < best[name]["score"] <= 1
+    # early stopping picks the number of rounds
+    assert 1 <= best["XGBoost_Boosting"]["n_estimators"] <= 400
+    assert best["RandomForest_Bagging"]["n_estimators"] == 200
+
+
+def test_search_respects_budget(tuning_file):
+    start = time.time()
+    assert HyperparameterSearch(tuning_file, budget_seconds=0, n_trials=27, cores=1).run() == {}
+    assert time.time() - start < 1
+
+    start = time.time()
+    HyperparameterSearch(tuning_file, budget_seconds=2, n_trials=81, cores=1).run()
+    # running trials stop at the deadline (one boosting round / block of trees late at most)
+    assert time.time() - start < 3
+    with pytest.raises(ValueError, match="metric"):
+        HyperparameterSearch(tuning_file, metric="auc")
+
+
+@pytest.mark.parametrize("model", list(SEARCH_SPACES))
+def test_trial_cut_at_deadline_is_not_scored(tuning_file, model):
+    trial = {"model": model, "params": {}, "resource": 100, "data_path": tuning_file,
+             "metric": "accuracy", "deadline": time.time() - 1}
+    outcome = run_trial(trial)
+    assert outcome["truncated"] and outcome["score"] is None
+
+
+def test_pipeline_uses_tuned_parameters(data, tmp_path, monkeypatch):
+    monkeypatch.setattr(train_model, "CHECKPOINT_DIR", str(tmp_path))
+    monkeypatch.setattr(train_model, "TRAIN_CORES", 1)
+    pipeline = train_model.MLEngineerPipeline(data)
+    tuned = pipeline.tune(n_trials=3, budget_seconds=120, metric="accuracy")
+    assert not (tmp_path / "runs" / "tuning.joblib").exists()
+
+    pipeline.run_experiments()
+    rf = joblib.load(tmp_path / "RandomForest_Bagging.pkl")
+    assert rf.get_params()["max_depth"] == tuned["RandomForest_Bagging"]["params"]["max_depth"]
+    xgb = joblib.load(tmp_path / "XGBoost_Boosting.pkl")
+    assert xgb.get_params()["n_estimators"] == tuned["XGBoost_Boosting"]["n_estimators"]
+
+    table = pipeline.get_results_table()
+    clf = table[table["Task"] == "Classification"]
+    assert pipeline.best_model("f1") == clf.sort_values("F1", ascending=False)["Model"].iloc[0]
+    assert pipeline.best_model("accuracy") in ("RandomForest_Bagging", "XGBoost_Boosting")
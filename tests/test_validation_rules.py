@@ -0,0 +1,117 @@
+import os
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic_data import make_raw_frame
+from src import model_io, stages, validation
+from src.data_profile import PROFILE_FILE, build_profile, save_profile
+from src.validate import StreamingValidator
+from src.validation import DEFAULT_RULES, RuleSet, rules_from_profile
+
+
+@pytest.fixture(scope="module")
+def rules():
+    return RuleSet(DEFAULT_RULES)
+
+
+@pytest.fixture(scope="module")
+def frame():
+    df = make_raw_frame(2000, seed=1)
+    df.loc[0, "Age"] = 200
+    df.loc[1, "Progress_Percentage"] = -5
+    df["Age"] = df["Age"].astype(object)
+    df.loc[2, "Age"] = "twenty"
+    df.loc[3, "Student_ID"] = None
+    df.loc[4, "Fee_Paid"] = "Maybe"
+    df.loc[5, ["Quiz_Score_Avg", "Quiz_Attempts"]] = [80.0, 0]
+    df.loc[6, ["Student_ID", "Course_ID"]] = df.loc[7, ["Student_ID", "Course_ID"]].to_numpy()
+    return df
+
+
+def test_frame_masks(rules, frame):
+    report = rules.validate_frame(frame)
+    masks = report.masks
+    assert masks.shape == (len(frame), len(DEFAULT_RULES))
+    assert masks.loc[0, "Age:range"] and masks.loc[1, "Progress_Percentage:range"]
+    assert masks.loc[2, "Age:type"] and not masks.loc[2, "Age:range"]
+    assert masks.loc[3, "Student_ID:required"]
+    assert masks.loc[4, "Fee_Paid:category"]
+    assert masks.loc[5, "quiz_score_without_attempts"]
+    assert masks.loc[7, "Student_ID+Course_ID:duplicate"] != masks.loc[6, "Student_ID+Course_ID:duplicate"]
+    assert report.counts.sum() == masks.to_numpy().sum()
+    assert report.n_invalid == report.invalid.sum()
+    assert report.summary()["violations"]["Age:range"] == 1
+
+
+def test_frame_and_record_paths_agree(rules, frame):
+    """Every record rule flags the same rows on both paths."""
+    masks = rules.validate_frame(frame).masks
+    record_rules = [r for r in rules.rules if r.name in {rr.name for rr in rules._record_rules}]
+    for i, record in enumerate(frame.head(300).to_dict("records")):
+        for rule in record_rules:
+            assert (rule.record(record) is not None) == masks[rule.name].iloc[i], (i, rule.name)
+
+
+def test_record_messages(rules):
+    messages = rules.check_record({"Student_ID": "1", "Age": "abc", "Progress_Percentage": 150,
+                                   "Quiz_Score_Avg": 50, "Quiz_Attempts": 0, "Course_Level": "Expert"})
+    assert "Invalid Age format: 'abc'" in messages
+    assert "Progress_Percentage 150.0 out of range [0, 100]" in messages
+    assert "Quiz_Score_Avg > 0 with no Quiz_Attempts" in messages
+    assert "Course_Level 'Expert' is not an allowed value" in messages
+
+
+def test_profile_categories():
+    df = make_raw_frame(1000, seed=2)
+    rules = RuleSet(DEFAULT_RULES + rules_from_profile(build_profile(df)))
+    names = {r.name for r in rules.rules}
+    assert "Gender:category" in names
+    assert "Course_ID:category" not in names and "Student_ID:category" not in names
+    assert any("Gender" in m for m in rules.check_record({"Gender": "Unknown"}))
+    messages = rules.check_record({"City": "Atlantis", "Student_ID": "NEW_ID"})
+    assert any("Atlantis" in m for m in messages) and not any("NEW_ID" in m for m in messages)
+
+
+def test_streaming_validator_counts(rules, frame):
+    validator = StreamingValidator(required_columns=["Student_ID"], rules=rules)
+    for start in range(0, len(frame), 500):
+        validator.update(frame.iloc[start:start + 500])
+    expected = rules.validate_frame(frame).counts
+    # duplicates are only detected within a chunk
+    dup = "Student_ID+Course_ID:duplicate"
+    assert 1 <= validator.violations[dup] <= expected[dup]
+    pd.testing.assert_series_equal(validator.violations.drop(dup), expected.drop(dup), check_names=False)
+    with pytest.raises(ValueError, match="Null values"):
+        validator.finalize()
+
+
+def test_profile_follows_checkpoint_dir(tmp_path, capsys):
+    """The pipeline's validation reads the profile train_model.py wrote to its models dir."""
+    import app.main as main
+    from src import monitoring
+    if "DATA_PROFILE_FILE" not in os.environ:
+        assert validation.PROFILE_FILE == os.path.join(model_io.CHECKPOINT_DIR, PROFILE_FILE)
+    # validation, drift monitoring and the API read the same profile
+    assert validation.PROFILE_FILE == monitoring.BASELINE_FILE == main.DATA_PROFILE_PATH
+
+    df = make_raw_frame(500, seed=3)
+    paths = stages.StagePaths(str(tmp_path / "data"))
+    (tmp_path / "data" / "raw").mkdir(parents=True)
+    df.to_csv(paths.raw, index=False)
+    save_profile(build_profile(df[df["Gender"] != "Other"]), f"{paths.models_dir}/{PROFILE_FILE}")
+    stages.ingest_validate(paths)
+    assert "Gender:category" in capsys.readouterr().out
+
+
+def test_new_profile_reruns_validation(tmp_path):
+    df = make_raw_frame(500, seed=4)
+    paths = stages.StagePaths(str(tmp_path / "data"))
+    (tmp_path / "data" / "raw").mkdir(parents=True)
+    df.to_csv(paths.raw, index=False)
+    profile_path = f"{paths.models_dir}/{PROFILE_FILE}"
+    save_profile(build_profile(df), profile_path)
+    assert stages.ingest_validate(paths)
+    assert not stages.ingest_validate(paths)
+    save_profile(build_profile(df[df["Gender"] != "Other"]), profile_path)
+    assert stages.ingest_validate(paths)